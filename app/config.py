@@ -1,8 +1,9 @@
 """Main configuration parameters for FastAPI and Lambda powertools"""
 import logging
-from distutils.util import strtobool
+import socket
 from os import getenv
 from pathlib import Path
+from typing import List
 
 from starlette.config import Config
 from starlette.datastructures import Secret
@@ -16,6 +17,20 @@ logger.info(f"Loading Django configs environment variables from {ENV_PATH}")
 
 config = Config(env_file=ENV_PATH)
 
+
+def strtobool(value: str) -> int:
+    """
+    Converts a string representation of truth to 1 or 0, as distutils.util does,
+    without importing distutils which is deprecated and slow to import.
+    """
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return 1
+    if value in ("n", "no", "f", "false", "off", "0"):
+        return 0
+    raise ValueError(f"invalid truth value {value!r}")
+
+
 # ======================= SETTINGS.PY =========================
 
 # General settings
@@ -38,6 +53,22 @@ POSTGRES_PORT: int = getenv(
 POSTGRES_USER: str = getenv(
     "POSTGRES_USER", config("POSTGRES_USER", default="postgres")
 )
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 to close them at the
+# end of each request) and checked before being reused. When DB_POOL_SIZE is set,
+# connections are instead returned to a per-process pool after each request.
+# A pool opens up to 2 * DB_POOL_SIZE connections, past which requests wait up
+# to DB_POOL_TIMEOUT seconds for one, hence DB_POOL_SIZE >= GUNICORN_THREADS / 2
+DB_CONN_MAX_AGE: int = int(getenv("DB_CONN_MAX_AGE", "60"))
+DB_CONN_HEALTH_CHECKS: bool = bool(strtobool(getenv("DB_CONN_HEALTH_CHECKS", "True")))
+DB_POOL_SIZE: int = int(getenv("DB_POOL_SIZE", "0"))
+DB_POOL_TIMEOUT: float = float(getenv("DB_POOL_TIMEOUT", "10"))
+# Optional read replica, serving the reads of the public pages. Clients are
+# pinned to the primary for DB_REPLICA_LAG_WINDOW seconds after a write, and
+# evicted pages are not cached again during that window (see main.page_cache)
+POSTGRES_REPLICA_HOST: str = getenv(
+    "POSTGRES_REPLICA_HOST", config("POSTGRES_REPLICA_HOST", default="")
+)
+DB_REPLICA_LAG_WINDOW: int = int(getenv("DB_REPLICA_LAG_WINDOW", "10"))
 
 # Redis Cache
 # Get from environment variable, for example if ElastiCache is used,
@@ -45,7 +76,45 @@ POSTGRES_USER: str = getenv(
 REDIS_ENDPOINT: str = getenv(
     "REDIS_ENDPOINT", config("REDIS_ENDPOINT", default="localhost:6379")
 )
-CACHE_TTL: int = int(getenv("CACHE_TTL", "60"))
+# Cached item and category pages are evicted when edited (see main.page_cache),
+# so the TTL only bounds how long unused pages are kept
+CACHE_TTL: int = int(getenv("CACHE_TTL", "3600"))
+# Template fragments (navbar, footers, category cards) are cached in the memory of
+# each worker, and invalidated by a content version bumped on edits
+FRAGMENT_CACHE_TTL: int = int(getenv("FRAGMENT_CACHE_TTL", "3600"))
+
+# Sessions storage: "cache" (Redis only), "cached_db" (Redis, written through to
+# Postgres so that sessions survive a Redis flush), or "db" (Postgres only)
+SESSION_BACKEND: str = getenv("SESSION_BACKEND", "cache")
+# Users of the authenticated requests are cached in Redis, and evicted when saved
+USER_CACHE_TTL: int = int(getenv("USER_CACHE_TTL", "3600"))
+
+# Item views counter
+# Page hits are buffered ("redis" shared by all workers, or per-process "memory")
+# and flushed to the database every VIEW_COUNT_FLUSH_INTERVAL seconds, by
+# python manage.py flush_item_views --loop, or by a thread of each gunicorn worker
+VIEW_COUNT_BACKEND: str = getenv("VIEW_COUNT_BACKEND", "redis")
+VIEW_COUNT_FLUSH_INTERVAL: int = int(getenv("VIEW_COUNT_FLUSH_INTERVAL", "30"))
+
+# Background tasks
+# When enabled, slow work such as image processing is pushed to a Redis queue and
+# executed by a separate worker: python manage.py run_task_worker
+# Otherwise, tasks run inline at the end of the request transaction
+TASK_QUEUE_ENABLED: bool = bool(strtobool(getenv("TASK_QUEUE_ENABLED", "False")))
+# Name of the worker, which must be the same across its restarts, so that the
+# tasks it was executing when it stopped are executed again
+TASK_WORKER_NAME: str = getenv("TASK_WORKER_NAME", socket.gethostname())
+
+# Responsive images
+# Each uploaded image is resized to the following widths (in pixels, never upscaled)
+# and encoded in each format, so that browsers download the smallest suitable file
+IMAGE_VARIANT_WIDTHS: List[int] = [
+    int(width)
+    for width in getenv("IMAGE_VARIANT_WIDTHS", "320,640,1024,1600").split(",")
+]
+IMAGE_VARIANT_FORMATS: List[str] = getenv("IMAGE_VARIANT_FORMATS", "webp,jpeg").split(
+    ","
+)
 
 # Static files served from AWS S3 Bucket
 STATICFILES_BUCKET: str = getenv("STATICFILES_BUCKET")
@@ -57,7 +126,49 @@ AWS_S3_CUSTOM_DOMAIN: str = getenv(
 # Forward ContactForm emails to AWS SNS Topic
 SNS_TOPIC_ARN: str = getenv("SNS_TOPIC_ARN", config("SNS_TOPIC_ARN", default=None))
 
+# Outbox of the messages published to SNS by the background dispatcher
+# "sns" publishes to AWS, "local" logs the messages instead (no AWS account needed)
+# Failed publications are retried with an exponential backoff, starting from
+# OUTBOX_RETRY_BACKOFF seconds, up to OUTBOX_MAX_ATTEMPTS times
+OUTBOX_PUBLISHER: str = getenv("OUTBOX_PUBLISHER", "sns")
+OUTBOX_MAX_ATTEMPTS: int = int(getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BACKOFF: int = int(getenv("OUTBOX_RETRY_BACKOFF", "30"))
+
 # SES identity for email notifications
 SES_IDENTITY_ARN: str = getenv(
     "SES_IDENTITY_ARN", config("SES_IDENTITY_ARN", default=None)
 )
+
+# Item notifications are sent to the registered users in chunks of at most 50
+# destinations (SES limit), from NOTIFICATION_WORKERS threads, without exceeding
+# the SES maximum send rate (emails per second). Failed chunks are retried every
+# NOTIFICATION_RETRY_INTERVAL seconds, up to NOTIFICATION_MAX_ATTEMPTS times, as
+# are the chunks still pending NOTIFICATION_PENDING_TIMEOUT seconds after their
+# creation (worker stopped before sending them)
+NOTIFICATION_WORKERS: int = int(getenv("NOTIFICATION_WORKERS", "4"))
+SES_MAX_SEND_RATE: float = float(getenv("SES_MAX_SEND_RATE", "14"))
+NOTIFICATION_MAX_ATTEMPTS: int = int(getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+NOTIFICATION_RETRY_INTERVAL: int = int(getenv("NOTIFICATION_RETRY_INTERVAL", "300"))
+NOTIFICATION_PENDING_TIMEOUT: int = int(getenv("NOTIFICATION_PENDING_TIMEOUT", "3600"))
+
+# The category statistics are aggregated in a materialized view, refreshed every
+# CATEGORY_STATS_REFRESH_INTERVAL seconds by the refresh_category_stats command
+CATEGORY_STATS_REFRESH_INTERVAL: int = int(
+    getenv("CATEGORY_STATS_REFRESH_INTERVAL", "300")
+)
+
+# Gunicorn server (see portfolio/gunicorn_conf.py)
+# GUNICORN_WORKERS=0 sizes the workers from the number of CPUs
+# "gthread" workers serve GUNICORN_THREADS requests concurrently, "sync" one,
+# and "uvicorn" workers serve the ASGI application (portfolio/asgi.py)
+# Keep-alive must exceed the idle timeout of the load balancer (60s)
+# Workers are restarted after GUNICORN_MAX_REQUESTS requests (+ random jitter)
+# to cap their memory creep, 0 disables it
+GUNICORN_WORKERS: int = int(getenv("GUNICORN_WORKERS", "0"))
+GUNICORN_WORKER_CLASS: str = getenv("GUNICORN_WORKER_CLASS", "gthread")
+GUNICORN_THREADS: int = int(getenv("GUNICORN_THREADS", "4"))
+GUNICORN_KEEPALIVE: int = int(getenv("GUNICORN_KEEPALIVE", "65"))
+GUNICORN_TIMEOUT: int = int(getenv("GUNICORN_TIMEOUT", "30"))
+GUNICORN_PRELOAD: bool = bool(strtobool(getenv("GUNICORN_PRELOAD", "True")))
+GUNICORN_MAX_REQUESTS: int = int(getenv("GUNICORN_MAX_REQUESTS", "1000"))
+GUNICORN_MAX_REQUESTS_JITTER: int = int(getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
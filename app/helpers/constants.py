@@ -10,6 +10,13 @@ CROP_SIZE = DIMS(300, 300)
 THUMBNAIL_SIZE = DIMS(500, 500)
 IMG_EXT = ".jpg"
 THUMBNAIL_SUFFIX = "_thumbnail"
+# Encoding quality of the responsive image variants, in order of preference
+# for the <picture> sources. JPEG is used as the <img> fallback
+IMAGE_VARIANT_QUALITY = {"avif": 60, "webp": 80, "jpeg": 85}
+
+# Response header set by the item page, so that views are counted even when
+# the page is served from cache. Stripped by main.middleware before reaching clients
+ITEM_ID_HEADER = "X-Item-Id"
 
 
 class TemplateNames(Enum):
@@ -22,3 +29,4 @@ class TemplateNames(Enum):
     ITEMS = f"{TEMPLATE_DIR}/items.html"
     CONTACT_US = f"{TEMPLATE_DIR}/contact_us.html"
     GO_BACK_HOME = f"{TEMPLATE_DIR}/go_back_home.html"
+    SEARCH = f"{TEMPLATE_DIR}/search.html"
@@ -14,6 +14,7 @@ INVALID_FORM = "Email form is invalid."
 CONTACTUS_FORM = "Success! Thank you for your message."
 
 SNS_SERVICE_RESPONSE = "SNS service response: {response}"
+SNS_MESSAGE_QUEUED = "ContactForm email queued for SNS: {message}"
 SNS_TOPIC_NOT_CONFIGURED_USER_FRIENDLY = "Oops, your email could not be sent."
 SNS_TOPIC_NOT_CONFIGURED = (
     "ContactForm email not forward to Slack because the SNS_TOPIC_ARN "
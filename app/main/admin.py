@@ -2,25 +2,30 @@
 This module defines Admin models to map our Category and Item models so that
 they can be managed via the Django admin page /admin
 """
-import json
 import logging
 from typing import NoReturn
 
-import boto3
 from django.contrib import admin
-from django.contrib.auth.models import User
+from django.contrib.admin.views.main import ChangeList
 from django.db import models
 from django.forms import ModelForm
 from django.http import HttpRequest
 from tinymce.widgets import TinyMCE
 
-from app.config import AWS_REGION, AWS_S3_CUSTOM_DOMAIN, SES_IDENTITY_ARN
-
-from .models import Category, Item
+from .models import Category, CategoryStats, Item, NotificationChunk, OutboxMessage
+from .page_cache import API_STATS_GROUP, evict_page_groups
+from .tasks import enqueue
 
 logger = logging.getLogger(__name__)
 
 
+class ItemChangeList(ChangeList):
+    """Lists the items without loading their HTML content"""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).cards()
+
+
 class ItemAdmin(admin.ModelAdmin):
     """
     Class to add an Item from the Django admin page with the TinyMCE
@@ -39,6 +44,12 @@ class ItemAdmin(admin.ModelAdmin):
 
     # To have the number of item views from the admin panel
     readonly_fields = ("views",)
+    list_display = ("item_name", "category_name", "image_status")
+    list_select_related = ("category_name",)
+
+    # pylint: disable=no-self-use,unused-argument
+    def get_changelist(self, request: HttpRequest, **kwargs):
+        return ItemChangeList
 
     def save_model(
         self, request: HttpRequest, item: Item, form: ModelForm, change: bool
@@ -49,66 +60,108 @@ class ItemAdmin(admin.ModelAdmin):
     @staticmethod
     def notify_registered_users(item: Item, is_modified: bool) -> NoReturn:
         """
-        Notify users via AWS SES.
-        Registered emails must be manually added as SES verified identifies from
-        within the AWS Console, because of the limited / sandbox environment.
-        For a production use case, raise a ticket with AWS.
+        Notify users via AWS SES, from a task executed by the background worker
+        (see main.notifications) so that the admin page does not wait for the
+        emails to be sent, even when TASK_QUEUE_ENABLED is False.
         """
         if is_modified:
             logger.info("Item {item} was modified, not created. Skipping SES email")
             return
-
-        ses_client = boto3.client("ses", region_name=AWS_REGION)
-
-        destinations = [
-            {
-                "Destination": {"ToAddresses": [user.email],},
-                "ReplacementTemplateData": json.dumps(
-                    {
-                        "base_url": f"https://{AWS_S3_CUSTOM_DOMAIN}",
-                        "item_name": item.item_name,
-                        "item_page_url": f"https://{AWS_S3_CUSTOM_DOMAIN}/items/{item.category_name.category_slug}/{item.item_slug}",
-                        "item_image_url": item.image_thumbnail.url,
-                        "action": "modifiée" if is_modified else "ajoutée",
-                        "subject": "🍚 Tari-Recette mise à jour!"
-                        if is_modified
-                        else "🍚 Nouvelle Tari-Recette disponible!",
-                        "username": user.username.title(),
-                        "email": user.email,
-                    }
-                ),
-            }
-            for user in User.objects.all()
-            if user.username and user.email
-        ]
-
-        if not SES_IDENTITY_ARN:
-            logger.info("SES_IDENTITY_ARN not set. Skipping SES email.")
-            return
-
-        try:
-            response = ses_client.send_bulk_templated_email(
-                Source="tari-alerts@tari.kitchen",
-                SourceArn=SES_IDENTITY_ARN,
-                ReplyToAddresses=[],
-                DefaultTags=[],
-                Template="ItemCreatedOrModifiedNotification",  # TODO: remove hardcoded TemplateName. Could use TemplateArn from Cfn
-                DefaultTemplateData=json.dumps(
-                    {"base_url": f"https://{AWS_S3_CUSTOM_DOMAIN}"}
-                ),
-                Destinations=destinations,
-            )
-            logger.info(f"SES notification was successful. response: {response}")
-        except Exception as ses_err:
-            logger.error(f"Failed to send SES email notification: {repr(ses_err)}")
+        enqueue("notify_registered_users", pk=item.pk)
 
 
 class CategoryAdmin(admin.ModelAdmin):
     """Class to add a Category from the Django admin page."""
 
     fields = ("category_name", "image")
+    list_display = ("category_name", "image_status", "item_count", "total_views")
+    # Statistics are read from the materialized view, see CategoryStats
+    list_select_related = ("stats",)
+
+    @admin.display(description="Recettes")
+    def item_count(self, category: Category):
+        """Number of items of the category, as of the last statistics refresh"""
+        return category.stats.item_count if hasattr(category, "stats") else None
+
+    @admin.display(description="Vues")
+    def total_views(self, category: Category):
+        """Views of the items of the category, as of the last statistics refresh"""
+        return category.stats.total_views if hasattr(category, "stats") else None
+
+
+class CategoryStatsAdmin(admin.ModelAdmin):
+    """Class to browse and refresh the category statistics from the admin page"""
+
+    list_display = (
+        "category",
+        "item_count",
+        "total_views",
+        "newest_item",
+        "refreshed_at",
+    )
+    list_select_related = ("category", "newest_item")
+    actions = ("refresh_stats",)
+
+    @admin.action(description="Mettre à jour les statistiques")
+    def refresh_stats(self, request: HttpRequest, queryset) -> None:
+        """Aggregates the statistics of all the categories again"""
+        CategoryStats.refresh()
+        evict_page_groups([API_STATS_GROUP])
+        self.message_user(request, "Statistiques mises à jour")
+
+    # The statistics are aggregated by PostgreSQL, hence read-only
+    # pylint: disable=no-self-use,unused-argument
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    # pylint: disable=no-self-use,unused-argument
+    def has_change_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
+
+    # pylint: disable=no-self-use,unused-argument
+    def has_delete_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Class to monitor the messages published to AWS SNS from the admin page"""
+
+    list_display = ("id", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    readonly_fields = ("topic_arn", "message", "created_at", "sent_at", "last_error")
+
+
+class NotificationChunkAdmin(admin.ModelAdmin):
+    """Class to monitor and retry the SES notifications from the admin page"""
+
+    list_display = ("id", "item", "status", "attempts", "created_at", "sent_at")
+    list_select_related = ("item",)
+    list_filter = ("status",)
+    readonly_fields = ("item", "recipients", "pending_recipients", "last_error")
+    actions = ("retry_notifications",)
+
+    def get_queryset(self, request: HttpRequest):
+        """The items of the chunks are listed by name, without their content"""
+        return (
+            super().get_queryset(request).defer("item__content", "item__search_vector")
+        )
+
+    @admin.action(description="Renvoyer les notifications en échec")
+    # pylint: disable=no-self-use
+    def retry_notifications(self, request: HttpRequest, queryset) -> None:
+        """Sends the selected chunks which failed again, from a background task"""
+        chunk_ids = list(
+            queryset.filter(status=NotificationChunk.Status.FAILED).values_list(
+                "id", flat=True
+            )
+        )
+        enqueue("retry_notifications", chunk_ids=chunk_ids)
+        self.message_user(request, f"{len(chunk_ids)} lots de notifications renvoyés")
 
 
 # Register models
 admin.site.register(Item, ItemAdmin)
 admin.site.register(Category, CategoryAdmin)
+admin.site.register(CategoryStats, CategoryStatsAdmin)
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
+admin.site.register(NotificationChunk, NotificationChunkAdmin)
@@ -1,200 +1,111 @@
-# from django.core.cache import cache
-# from django_filters.rest_framework import DjangoFilterBackend
-# from rest_framework import status
-# from rest_framework.filters import SearchFilter
-# from rest_framework.generics import (
-#     CreateAPIView,
-#     GenericAPIView,
-#     ListAPIView,
-#     RetrieveUpdateDestroyAPIView,
-# )
-# from rest_framework.pagination import LimitOffsetPagination
-# from rest_framework.permissions import AllowAny, IsAuthenticated
-# from rest_framework.response import Response
-
-# from .models import Category, Item
-# from .serializers import CategorySerializer, ItemSerializer, StatSerializer
-
-
-# class Pagination(LimitOffsetPagination):
-#     default_limit = 10
-#     max_limit = 100
-
-
-# class CategoryList(ListAPIView):
-#     permission_classes = [AllowAny]
-
-#     # QuerySet
-#     queryset = Category.objects.all().order_by("id")
-
-#     # Serializer
-#     serializer_class = CategorySerializer
-
-#     # Filtering
-#     filter_backends = (DjangoFilterBackend, SearchFilter)
-#     filter_fields = ("id",)
-#     search_fields = ("category_name", "summary")
-
-#     # Pagination
-#     pagination_class = Pagination
-
-#     def get_queryset(self):
-#         """
-#         Override this method to add some custom filtering
-#         for e.g. based on a boolean field
-#         """
-#         return super().get_queryset()
-
-
-# class CategoryCreate(CreateAPIView):
-#     permission_classes = [IsAuthenticated]
-
-#     serializer_class = CategorySerializer
-
-#     def create(self, request, *args, **kwargs):
-#         """
-#         Overrides CREATE API method to validate user input,
-#         E.g: validation of a decimal value
-#         if request.data.get('price') <= 0.0:
-#             raise ValidationError({'err_type': 'Must be above £0.00'})
-#         """
-#         return super().create(request, *args, **kwargs)
-
-
-# class CategoryRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
-#     permission_classes = [IsAuthenticated]
-
-#     queryset = Category.objects.all()
-#     lookup_field = "id"
-#     serializer_class = CategorySerializer
-
-#     def delete(self, request, *args, **kwargs):
-#         """
-#         Overrides HTTP DELETE method to update cache
-#         """
-#         response = super().delete(request, *args, **kwargs)
-#         if response.status_code == status.HTTP_204_NO_CONTENT:
-#             category_id = request.data.get("id")
-#             cache.delete(f"category_data_{category_id}")
-#         return response
-
-#     def update(self, request, *args, **kwargs):
-#         """
-#         Overrides UPDATE API method to update cache
-#         """
-#         response = super().update(request, *args, **kwargs)
-#         if response.status_code == status.HTTP_200_OK:
-#             category = request.data
-#             cache.set(
-#                 f'category_data_{category["id"]}',
-#                 {
-#                     "category_name": category["category_name"],
-#                     "summary": category["summary"],
-#                     "image": category["image"],
-#                     "category_slug": category["category_slug"],
-#                 },
-#             )
-#         return response
-
-
-# class CategoryStats(GenericAPIView):
-#     """
-#     GenericAPIView class to generate category stats
-#     """
-
-#     permission_classes = [AllowAny]
-
-#     lookup_field = "id"
-#     serializer_class = StatSerializer
-#     queryset = Category.objects.all()
-
-#     def get(self, request, format=None, id=None):
-#         """
-#         Overrides the HTTP GET method to
-#         return a stats dictionary response which include
-#         the total number of items views for the selected category
-#         """
-#         category = self.get_object()
-#         items_in_category = Item.objects.filter(category_name=category)
-#         all_views_count = sum([item.views for item in items_in_category])
-#         serializer = StatSerializer({"stats": {"all_items_views": all_views_count}})
-#         return Response(serializer.data)
-
-
-# class ItemList(ListAPIView):
-#     permission_classes = [AllowAny]
-
-#     # QuerySet
-#     queryset = Item.objects.all().order_by("id")
-
-#     # Serializer
-#     serializer_class = ItemSerializer
-
-#     # Filtering
-#     filter_backends = (DjangoFilterBackend, SearchFilter)
-#     filter_fields = ("id",)
-#     search_fields = ("item_name", "summary")
-
-#     # Pagination
-#     pagination_class = Pagination
-
-#     def get_queryset(self):
-#         """
-#         Override this method to add some custom filtering
-#         for e.g. based on a boolean field
-#         """
-#         return super().get_queryset()
-
-
-# class ItemCreate(CreateAPIView):
-#     permission_classes = [IsAuthenticated]
-
-#     serializer_class = ItemSerializer
-
-#     def create(self, request, *args, **kwargs):
-#         """
-#         Overrides the CREATE API method to validate user input,
-#         E.g: validation of a decimal value
-#         if request.data.get('price') <= 0.0:
-#             raise ValidationError({'err_type': 'Must be above £0.00'})
-#         """
-#         return super().create(request, *args, **kwargs)
-
-
-# class ItemRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
-#     permission_classes = [IsAuthenticated]
-
-#     queryset = Item.objects.all()
-#     lookup_field = "id"
-#     serializer_class = ItemSerializer
-
-#     def delete(self, request, *args, **kwargs):
-#         """
-#         Overrides method to update cache
-#         """
-#         response = super().delete(request, *args, **kwargs)
-#         if response.status_code == status.HTTP_204_NO_CONTENT:
-#             item_id = request.data.get("id")
-#             cache.delete(f"item_data_{item_id}")
-#         return response
-
-#     def update(self, request, *args, **kwargs):
-#         """
-#         Overrides UPDATE API method to update cache
-#         """
-#         response = super().update(request, *args, **kwargs)
-#         if response.status_code == status.HTTP_200_OK:
-#             item = request.data
-#             cache.set(
-#                 f'item_data_{item["id"]}',
-#                 {
-#                     "item_name": item["item_name"],
-#                     "summary": item["summary"],
-#                     "content": item["content"],
-#                     "summary": item["summary"],
-#                     "item_slug": item["item_slug"],
-#                     "category_name": item["category_name"],
-#                     "views": item["views"],
-#                 },
-#             )
-#         return response
+"""
+This module defines the read-only views of the django rest framework api,
+/api/v1/. Lists are paginated with a cursor rather than an offset, so that
+a page is read with an index scan whatever its position, and items are
+fetched along with their categories with a constant number of queries.
+"""
+
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import AllowAny
+
+from .models import Category, CategoryStats, Item
+from .serializers import CategorySerializer, CategoryStatsSerializer, ItemSerializer
+
+
+class Pagination(CursorPagination):
+    """Pages of 10 objects by default, in the order they were created"""
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "id"
+
+
+class PublicAPIMixin:
+    """
+    Views readable by anonymous users. Requests are not authenticated, so that
+    responses do not vary on the session cookie and are shared in the cache.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+
+class StatsPagination(Pagination):
+    """Pages of category statistics, in the order categories were created"""
+
+    ordering = "category_id"
+
+
+def categories_with_items():
+    """Returns the categories, with their items fetched by a second query"""
+    return Category.objects.prefetch_related(
+        Prefetch("item_set", queryset=Item.objects.order_by("item_name"))
+    )
+
+
+class CategoryList(PublicAPIMixin, ListAPIView):
+    """Lists the categories and their items, /api/v1/categories/"""
+
+    queryset = categories_with_items()
+    serializer_class = CategorySerializer
+    pagination_class = Pagination
+
+
+class CategoryRetrieve(PublicAPIMixin, RetrieveAPIView):
+    """Retrieves a category and its items, /api/v1/categories/<id>/"""
+
+    queryset = categories_with_items()
+    lookup_field = "id"
+    serializer_class = CategorySerializer
+
+
+class ItemList(PublicAPIMixin, ListAPIView):
+    """Lists the items, optionally of a category, /api/v1/items/?category_name=<id>"""
+
+    queryset = Item.objects.all()
+    serializer_class = ItemSerializer
+    pagination_class = Pagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_fields = ("category_name",)
+
+
+class ItemRetrieve(PublicAPIMixin, RetrieveAPIView):
+    """Retrieves an item, /api/v1/items/<id>/"""
+
+    queryset = Item.objects.all()
+    lookup_field = "id"
+    serializer_class = ItemSerializer
+
+
+def category_stats():
+    """
+    Returns the statistics of the categories, read from the materialized view
+    along with the names of their category and newest item
+    """
+    return CategoryStats.objects.select_related("category", "newest_item").only(
+        *[field.name for field in CategoryStats._meta.concrete_fields],
+        "category__category_name",
+        "newest_item__item_name",
+        "newest_item__item_slug",
+    )
+
+
+class CategoryStatsList(PublicAPIMixin, ListAPIView):
+    """Lists the statistics of the categories, /api/v1/categories/stats/"""
+
+    queryset = category_stats()
+    serializer_class = CategoryStatsSerializer
+    pagination_class = StatsPagination
+
+
+class CategoryStatsRetrieve(PublicAPIMixin, RetrieveAPIView):
+    """Retrieves the statistics of a category, /api/v1/categories/<id>/stats/"""
+
+    queryset = category_stats()
+    lookup_field = "category_id"
+    lookup_url_kwarg = "id"
+    serializer_class = CategoryStatsSerializer
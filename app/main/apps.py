@@ -15,3 +15,8 @@ class MainConfig(AppConfig):
 
     name = "main"
     verbose_name = "Gestion des Recettes"
+
+    def ready(self):
+        """Connects the signal receivers evicting the cached pages and users"""
+        # pylint: disable=import-outside-toplevel,unused-import
+        from . import signals  # noqa
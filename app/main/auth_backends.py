@@ -0,0 +1,29 @@
+"""
+This module defines an authentication backend caching in Redis the users of
+the authenticated requests, so that request.user is not read from the
+database on every request. Cached users are evicted when they are saved or
+deleted (see main.signals).
+"""
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = "main:user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend reading the logged in users from the cache first"""
+
+    def get_user(self, user_id):
+        """Returns the active user of a session, from the cache if possible"""
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        if (user := cache.get(key)) is None:
+            if (user := super().get_user(user_id)) is not None:
+                cache.set(key, user, settings.USER_CACHE_TTL)
+        return user
+
+
+def evict_user(user_id: int) -> None:
+    """Deletes a cached user, to be read again from the database"""
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
@@ -0,0 +1,91 @@
+"""
+This module defines a registry of AWS clients, so that boto3 clients are created
+once per worker process on first use, instead of on import or on every request.
+boto3 itself is imported on first use, as it is slow to import.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from app.config import AWS_REGION
+
+if TYPE_CHECKING:
+    from boto3.resources.base import ServiceResource
+    from botocore.client import BaseClient
+
+_clients: Dict[Tuple[str, str], "BaseClient"] = {}
+_clients_lock = threading.Lock()
+# boto3 resources and sessions are not thread-safe, hence kept per thread
+_thread_local = threading.local()
+
+
+def get_client(service_name: str, region_name: str = AWS_REGION) -> "BaseClient":
+    """
+    Returns the boto3 client of an AWS service, created on first use and then
+    shared by all the threads of the process, as boto3 clients are thread-safe.
+    Usage: get_client("ses").send_email(...)
+    """
+    key = (service_name, region_name)
+    if (client := _clients.get(key)) is None:
+        with _clients_lock:
+            # Double-checked, so that concurrent first calls create one client
+            if (client := _clients.get(key)) is None:
+                # pylint: disable=import-outside-toplevel
+                import boto3
+
+                client = boto3.client(service_name, region_name=region_name)
+                _clients[key] = client
+    return client
+
+
+async def call_client(service_name: str, operation: str, **kwargs) -> Any:
+    """
+    Calls an operation of an AWS client from a coroutine. The blocking call
+    runs in a thread of its own, so that concurrent calls do not wait for
+    each other. Usage: await call_client("ses", "verify_email_identity", ...)
+    """
+
+    def call():
+        return getattr(get_client(service_name), operation)(**kwargs)
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+def get_resource(
+    service_name: str,
+    region_name: Optional[str] = AWS_REGION,
+    endpoint_url: Optional[str] = None,
+    **resource_kwargs,
+) -> "ServiceResource":
+    """
+    Returns the boto3 resource of an AWS service for the current thread,
+    created with its own session on first use. Resources are shared by the
+    callers using the same region and endpoint, e.g. the S3 storages.
+    """
+    if not hasattr(_thread_local, "resources"):
+        _thread_local.resources = {}
+    key = (service_name, region_name, endpoint_url)
+    if (resource := _thread_local.resources.get(key)) is None:
+        # pylint: disable=import-outside-toplevel
+        import boto3
+
+        resource = boto3.session.Session().resource(
+            service_name,
+            region_name=region_name,
+            endpoint_url=endpoint_url,
+            **resource_kwargs,
+        )
+        _thread_local.resources[key] = resource
+    return resource
+
+
+def reset_clients() -> None:
+    """
+    Drops the clients and resources created so far, to be called in forked
+    worker processes which must not share the connections of their parent.
+    """
+    with _clients_lock:
+        _clients.clear()
+    _thread_local.resources = {}
@@ -0,0 +1,299 @@
+"""
+This module defines the rendering of the item content written with TinyMCE,
+into the HTML served on the item pages (see Item.content_rendered). The HTML
+is rendered once on save rather than on every request:
+- tags and attributes outside of an allowlist are removed, as are scripts,
+  event handlers and javascript: URLs
+- inline style declarations which are inherited from a parent element by an
+  element without default styling, or which only affect the editor, are
+  removed, and spans left without any attribute are unwrapped
+- images and embedded frames are loaded lazily
+- comments and consecutive whitespaces are removed
+"""
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# Tags kept in the rendered content. Other tags are removed, but not their text
+ALLOWED_TAGS = {
+    "a",
+    "b",
+    "blockquote",
+    "br",
+    "code",
+    "div",
+    "em",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "i",
+    "iframe",
+    "img",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "s",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "tfoot",
+    "th",
+    "thead",
+    "tr",
+    "u",
+    "ul",
+}
+# Tags removed along with their content
+DROPPED_TAGS = {"script", "style", "noscript", "object", "embed", "template"}
+VOID_TAGS = {"br", "hr", "img"}
+# Attributes kept on any allowed tag, and on some tags only
+GLOBAL_ATTRIBUTES = {"style", "title"}
+TAG_ATTRIBUTES = {
+    "a": {"href", "target"},
+    "img": {"src", "alt", "width", "height"},
+    "iframe": {"src", "width", "height", "allowfullscreen"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+    "ol": {"start"},
+}
+URL_ATTRIBUTES = {"href", "src"}
+ALLOWED_URL_SCHEMES = {"http", "https", "mailto"}
+URL_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*):", re.IGNORECASE)
+# Browsers ignore the control characters and spaces of an URL scheme
+URL_IGNORED_CHARACTERS = re.compile(r"[\x00-\x20]+")
+# Tags whose whitespace-only text is not displayed, hence removed
+NO_TEXT_TAGS = {"ol", "ul", "table", "thead", "tbody", "tfoot", "tr"}
+# Attributes added to the media, so that they are loaded once scrolled to
+LAZY_ATTRIBUTES = {
+    "img": [("loading", "lazy"), ("decoding", "async")],
+    "iframe": [("loading", "lazy")],
+}
+
+# CSS properties inherited by the child elements, hence redundant when a
+# child declares the same value as its parent
+INHERITED_PROPERTIES = {
+    "color",
+    "font-family",
+    "font-size",
+    "font-stretch",
+    "font-style",
+    "font-weight",
+    "letter-spacing",
+    "line-height",
+    "text-align",
+}
+# Properties set by the font shorthand
+FONT_PROPERTIES = {
+    "font-family",
+    "font-size",
+    "font-stretch",
+    "font-style",
+    "font-weight",
+    "line-height",
+}
+# Inherited properties of the tags without default styling, whose declarations
+# are redundant when equal to their parent's. Other tags, e.g. links, headings
+# or strong, have default styles overriding the inherited values. The font of
+# paragraphs and divisions is kept, as the site stylesheet sets their line height
+COLLAPSED_PROPERTIES = {
+    "span": INHERITED_PROPERTIES,
+    "div": INHERITED_PROPERTIES - FONT_PROPERTIES,
+    "p": INHERITED_PROPERTIES - FONT_PROPERTIES,
+}
+# Declarations with no effect on the rendered page, copied over by the editor
+# when pasting content. None matches any value of the property
+IGNORED_DECLARATIONS = {
+    "box-sizing": None,
+    "caret-color": None,
+    "font-stretch": "normal",
+    "line-height": "normal",
+}
+# Values relative to the parent element, which are never redundant
+RELATIVE_VALUE = re.compile(r"%|\d(?:em|ex|ch)\b|larger|smaller")
+WHITESPACES = re.compile(r"[ \t\n\r\f]+")
+ZERO_LENGTH = re.compile(r"\b0(?:px|em|rem|pt|%)")
+
+
+def parse_style(style: str) -> Dict[str, str]:
+    """Returns the declarations of an inline style, by property"""
+    declarations = {}
+    for declaration in style.split(";"):
+        prop, _, value = declaration.partition(":")
+        prop, value = prop.strip().lower(), WHITESPACES.sub(" ", value.strip())
+        if prop and value:
+            declarations[prop] = ZERO_LENGTH.sub("0", value)
+    return declarations
+
+
+def is_safe_url(url: str) -> bool:
+    """
+    Returns whether a link or source URL can be kept in the content, that is
+    a relative URL or an URL with an allowed scheme
+    """
+    scheme = URL_SCHEME.match(URL_IGNORED_CHARACTERS.sub("", url))
+    return scheme is None or scheme.group(1).lower() in ALLOWED_URL_SCHEMES
+
+
+class ContentRenderer(HTMLParser):
+    """
+    Parses the HTML of an item content, and writes its rendered version.
+    Usage: ContentRenderer().render(html)
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output: List[str] = []
+        # Open allowed tags: (tag, written, inherited declarations)
+        self.open_tags: List[Tuple[str, bool, Dict[str, str]]] = []
+        self.dropped_depth = 0
+        self.pre_depth = 0
+
+    def render(self, html: str) -> str:
+        """Returns the rendered HTML"""
+        self.feed(html)
+        self.close()
+        for tag, written, _ in reversed(self.open_tags):
+            if written:
+                self.output.append(f"</{tag}>")
+        return "".join(self.output).strip()
+
+    @property
+    def inherited_style(self) -> Dict[str, str]:
+        """Returns the inherited declarations of the innermost open tag"""
+        return self.open_tags[-1][2] if self.open_tags else {}
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in DROPPED_TAGS:
+            self.dropped_depth += 1
+            return
+        if self.dropped_depth or tag not in ALLOWED_TAGS:
+            return
+
+        # Browsers only apply the first style attribute of a tag
+        style = next((value for name, value in attrs if name == "style"), None)
+        style, inherited = self.collapse_style(tag, style or "", self.inherited_style)
+        attributes = []
+        for name, value in attrs:
+            if name == "style":
+                if style:
+                    attributes.append(("style", style))
+                    style = ""
+            elif name in GLOBAL_ATTRIBUTES | TAG_ATTRIBUTES.get(tag, set()):
+                if name in URL_ATTRIBUTES and not is_safe_url(value or ""):
+                    continue
+                attributes.append((name, value))
+        if tag == "a" and ("target", "_blank") in attributes:
+            attributes.append(("rel", "noopener"))
+        attributes += LAZY_ATTRIBUTES.get(tag, [])
+
+        # Spans without attributes have no effect, hence are unwrapped
+        written = tag != "span" or bool(attributes)
+        if written:
+            self.output.append(self.format_starttag(tag, attributes))
+        if tag == "pre":
+            self.pre_depth += 1
+        if tag not in VOID_TAGS:
+            self.open_tags.append((tag, written, inherited))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        if tag in DROPPED_TAGS:
+            self.dropped_depth = max(self.dropped_depth - 1, 0)
+            return
+        if self.dropped_depth or tag not in ALLOWED_TAGS or tag in VOID_TAGS:
+            return
+        if tag not in (open_tag for open_tag, _, _ in self.open_tags):
+            # Stray end tag, without a matching start tag
+            return
+        # Tags left open within the closed tag are closed along with it
+        while self.open_tags:
+            open_tag, written, _ = self.open_tags.pop()
+            if written:
+                self.output.append(f"</{open_tag}>")
+            if open_tag == "pre":
+                self.pre_depth -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str):
+        if self.dropped_depth:
+            return
+        if not self.pre_depth:
+            data = WHITESPACES.sub(" ", data)
+            if data == " " and (
+                not self.open_tags or self.open_tags[-1][0] in NO_TEXT_TAGS
+            ):
+                return
+        self.output.append(escape(data, quote=False))
+
+    # pylint: disable=no-self-use
+    def collapse_style(
+        self, tag: str, style: str, inherited: Dict[str, str]
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Returns the declarations of the inline style of a tag which change the
+        rendered element, and the declarations inherited by its children
+        """
+        collapsed_properties = COLLAPSED_PROPERTIES.get(tag, set())
+        declarations = {}
+        for prop, value in parse_style(style).items():
+            if prop in IGNORED_DECLARATIONS and IGNORED_DECLARATIONS[prop] in (
+                None,
+                value,
+            ):
+                continue
+            if (
+                prop in collapsed_properties
+                and inherited.get(prop) == value
+                and not RELATIVE_VALUE.search(value)
+            ):
+                continue
+            declarations[prop] = value
+        # Values are only known to be inherited through the tags without
+        # default styling, and from the declarations of the tag itself
+        inherited = {
+            **{
+                prop: value
+                for prop, value in inherited.items()
+                if prop in collapsed_properties
+            },
+            **{
+                prop: value
+                for prop, value in declarations.items()
+                if prop in INHERITED_PROPERTIES
+            },
+        }
+        style = ";".join(f"{prop}:{value}" for prop, value in declarations.items())
+        return style, inherited
+
+    # pylint: disable=no-self-use
+    def format_starttag(
+        self, tag: str, attributes: List[Tuple[str, Optional[str]]]
+    ) -> str:
+        """Returns the start tag with its attributes, quoted when needed"""
+        formatted = [tag]
+        for name, value in attributes:
+            formatted.append(name if value is None else f'{name}="{escape(value)}"')
+        return f"<{' '.join(formatted)}>"
+
+
+def render_content(html: str) -> str:
+    """Returns the sanitised and minified version of some item content"""
+    return ContentRenderer().render(html)
@@ -0,0 +1,22 @@
+"""This module defines custom Django template context processors"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .fragment_cache import FRAGMENT_CACHE, get_content_version
+
+
+# pylint: disable=unused-argument
+def fragment_cache(request) -> Dict:
+    """
+    Exposes the settings of the {% cache %} fragments to the templates. The
+    content version is only read from Redis by the templates using it.
+    Usage: {% cache fragment_cache_ttl navbar content_version using=fragment_cache %}
+    """
+    return {
+        "fragment_cache": FRAGMENT_CACHE,
+        "fragment_cache_ttl": settings.FRAGMENT_CACHE_TTL,
+        "content_version": SimpleLazyObject(get_content_version),
+    }
@@ -0,0 +1,157 @@
+"""
+This module defines a PostgreSQL database backend adding, to the Django one:
+- Health checks: persistent connections (CONN_MAX_AGE) are checked once per
+  request before being reused, so that a connection dropped by the server
+  does not fail the request (backport of Django 4.1 CONN_HEALTH_CHECKS)
+- Pooling: when POOL_SIZE is set, closed connections are returned to a
+  per-process psycopg2 pool instead of being closed, and reused by the next
+  request of any thread without a new TCP/TLS/authentication handshake.
+  Threads needing a connection while all the connections of the pool are in
+  use wait for one to be returned, for up to POOL_TIMEOUT seconds
+"""
+
+import os
+import threading
+from typing import Dict, Tuple
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool whose getconn() waits up to `timeout` seconds for a
+    connection to be returned when maxconn connections are in use, instead of
+    raising PoolError straight away
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._available = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._available.acquire(timeout=self.timeout):
+            raise PoolError(
+                f"connection pool exhausted, no connection returned in {self.timeout}s"
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._available.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._available.release()
+
+
+_pools: Dict[Tuple[str, int], BlockingConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def close_pools() -> None:
+    """Closes all the pooled connections of the current process"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Connection to a PostgreSQL database, see module docstring"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def health_check_enabled(self) -> bool:
+        """Whether to check persistent connections before reusing them"""
+        return bool(self.settings_dict.get("CONN_HEALTH_CHECKS", False))
+
+    @property
+    def pool_size(self) -> int:
+        """Number of idle connections kept by the pool, 0 to disable pooling"""
+        return int(self.settings_dict.get("POOL_SIZE", 0))
+
+    @property
+    def pool_timeout(self) -> float:
+        """Seconds to wait for a connection when all the pooled ones are in use"""
+        return float(self.settings_dict.get("POOL_TIMEOUT", 10))
+
+    def _get_pool(self, conn_params: Dict) -> BlockingConnectionPool:
+        """
+        Returns the connection pool of the current process. Pools are never
+        shared across processes, e.g. with workers forked by gunicorn.
+        The pool keeps POOL_SIZE idle connections, and opens up to POOL_SIZE
+        extra connections under load, which are closed once returned. Past
+        2 * POOL_SIZE connections in use, threads wait for one to be returned.
+        """
+        key = (self.alias, os.getpid())
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = BlockingConnectionPool(
+                    self.pool_size,
+                    2 * self.pool_size,
+                    timeout=self.pool_timeout,
+                    **conn_params,
+                )
+            return _pools[key]
+
+    def get_new_connection(self, conn_params):
+        """Takes a connection from the pool when pooling is enabled"""
+        if not self.pool_size:
+            return super().get_new_connection(conn_params)
+        connection = self._get_pool(conn_params).getconn()
+        # Same connection setup as the parent method
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get(
+            "isolation_level", connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def connect(self):
+        """New connections are healthy, whereas pooled ones may be stale"""
+        super().connect()
+        self.health_check_done = not self.pool_size
+
+    def _close(self):
+        """Returns the connection to the pool when pooling is enabled"""
+        if self.connection is None or not self.pool_size:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool = self._get_pool(self.get_connection_params())
+            # Connections in error are discarded, and the other ones are
+            # rolled back by the pool if a transaction is still open
+            return pool.putconn(self.connection, close=self.errors_occurred)
+
+    def close_if_unusable_or_obsolete(self):
+        """Called at the start and end of requests, to schedule a health check"""
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Closes the connection if it is no longer usable, once per request"""
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+            or self.in_atomic_block
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -0,0 +1,95 @@
+"""
+This module defines a database router sending the reads of the public pages
+to the read replica, when one is configured. All the other reads, and every
+read following a write, go to the primary database.
+"""
+
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+PRIMARY_DB = "default"
+REPLICA_DB = "replica"
+# Cookie set after a write, to keep reading from the primary database until
+# the replica has caught up (see ReplicaPinningMiddleware)
+PIN_COOKIE = "db_pinned"
+
+
+class RoutingState:
+    """Routing decisions of the current request"""
+
+    def __init__(self, pinned: bool = False):
+        self.replica_reads = False
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    "db_routing_state", default=None
+)
+
+
+@contextmanager
+def routing_state(pinned: bool = False) -> Iterator[RoutingState]:
+    """Scopes the routing state to a request"""
+    state = RoutingState(pinned=pinned)
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+@contextmanager
+def replica_reads() -> Iterator[RoutingState]:
+    """Sends the reads of the enclosed code to the replica, unless pinned"""
+    with ExitStack() as stack:
+        if (state := _routing_state.get()) is None:
+            state = stack.enter_context(routing_state())
+        previous, state.replica_reads = state.replica_reads, True
+        try:
+            yield state
+        finally:
+            state.replica_reads = previous
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica within replica_reads() blocks. A write pins the
+    current request to the primary, so that it reads its own writes.
+    """
+
+    # pylint: disable=no-self-use,unused-argument
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        """Suggests the database to read from"""
+        state = _routing_state.get()
+        if (
+            state is not None
+            and state.replica_reads
+            and not state.pinned
+            and REPLICA_DB in settings.DATABASES
+        ):
+            return REPLICA_DB
+        return PRIMARY_DB
+
+    # pylint: disable=no-self-use,unused-argument
+    def db_for_write(self, model, **hints) -> str:
+        """Writes always go to the primary database"""
+        if (state := _routing_state.get()) is not None:
+            state.pinned = state.wrote = True
+        return PRIMARY_DB
+
+    # pylint: disable=no-self-use,unused-argument
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        """The replica holds the same rows as the primary database"""
+        databases = {PRIMARY_DB, REPLICA_DB}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    # pylint: disable=no-self-use,unused-argument
+    def allow_migrate(self, db, app_label, **hints) -> Optional[bool]:
+        """The replica is migrated through the replication of the primary"""
+        return False if db == REPLICA_DB else None
@@ -0,0 +1,32 @@
+"""
+This module defines the content version keying the template fragments cached
+with {% cache %}, so that all the fragments are invalidated at once when a
+Category changes (see main.signals). Fragments are cached in the memory of each
+worker, while the version is shared by all the workers through Redis.
+"""
+
+import time
+
+from django.core.cache import cache
+
+FRAGMENT_CACHE = "fragments"
+CONTENT_VERSION_KEY = "main:content_version"
+
+
+def get_content_version() -> int:
+    """Returns the current content version"""
+    return cache.get_or_set(CONTENT_VERSION_KEY, new_content_version, timeout=None)
+
+
+def bump_content_version() -> None:
+    """Changes the content version, so that the cached fragments are rendered again"""
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        # The version was evicted, it is reset to a value never used before
+        cache.set(CONTENT_VERSION_KEY, new_content_version(), timeout=None)
+
+
+def new_content_version() -> int:
+    """Returns a version greater than the versions previously incremented"""
+    return int(time.time() * 1000)
@@ -0,0 +1,19 @@
+"""Management command to publish the messages of the outbox to AWS SNS"""
+
+from main.management.loop_command import LoopCommand
+from main.outbox import outbox
+
+
+class Command(LoopCommand):
+    """
+    Publishes the due outbox messages, once or every `interval` seconds, so
+    that the messages which failed to be published are retried.
+    Usage: python manage.py dispatch_outbox [--loop] [--interval 10]
+    """
+
+    help = "Publish the messages of the outbox to AWS SNS"
+    success_message = "Outbox dispatched"
+
+    def run_once(self) -> None:
+        if published := outbox.dispatch():
+            self.stdout.write(f"Published {published} messages")
@@ -0,0 +1,137 @@
+"""Management command to print the query plans of the views"""
+
+import re
+from typing import Dict
+
+from django.contrib.postgres.search import SearchVector
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.test import RequestFactory
+from django.utils import timezone
+
+from main.api_views import categories_with_items
+from main.models import Category, Item, default_item_content
+from main.search import SEARCH_CONFIG
+from main.views import CategoriesView, ItemsView, RedirectToItemView, SearchView
+
+# Names and slugs of the seeded objects start with this prefix
+SEED_PREFIX = "explain-seed"
+# Plan node reading the whole item table, which no view should need
+ITEM_SEQ_SCAN = re.compile(r"Seq Scan on main_item\b")
+
+
+class Command(BaseCommand):
+    """
+    Seeds categories and items in a transaction which is rolled back, and
+    prints the EXPLAIN ANALYZE plan of the queries run by each view, so that
+    plan regressions show up. Views whose plan scans the whole item table are
+    reported, and fail the command with --strict.
+    Usage: python manage.py explain_views [--categories 20] [--items 500] [--strict]
+    """
+
+    help = "Print the query plans of the views against a seeded dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--categories", type=int, default=20, help="Categories to seed"
+        )
+        parser.add_argument(
+            "--items", type=int, default=500, help="Items to seed per category"
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Fail if a view scans the whole item table",
+        )
+
+    def handle(self, *args, **options):
+        seq_scans = []
+        with transaction.atomic():
+            self.seed(options["categories"], options["items"])
+            for view_name, queryset in self.view_querysets().items():
+                plan = queryset.explain(analyze=True, buffers=True)
+                self.stdout.write(self.style.MIGRATE_HEADING(view_name))
+                self.stdout.write(f"{plan}\n")
+                if ITEM_SEQ_SCAN.search(plan):
+                    seq_scans.append(view_name)
+            transaction.set_rollback(True)
+
+        if not seq_scans:
+            self.stdout.write(self.style.SUCCESS("No view scans the item table"))
+            return
+        message = f"Views scanning the item table: {', '.join(seq_scans)}"
+        if options["strict"]:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
+
+    # pylint: disable=no-self-use
+    def seed(self, categories: int, items: int) -> None:
+        """
+        Saves categories and items with bulk_create, bypassing the image
+        processing of save(), then updates the table statistics of the planner
+        """
+        seeded_categories = Category.objects.bulk_create(
+            Category(
+                category_name=f"{SEED_PREFIX} {category_idx}",
+                category_slug=f"{SEED_PREFIX}-{category_idx}",
+                summary=f"Catégorie {category_idx}",
+            )
+            for category_idx in range(categories)
+        )
+        content = default_item_content()
+        now = timezone.now()
+        Item.objects.bulk_create(
+            (
+                Item(
+                    item_name=f"{SEED_PREFIX} recette {category.id}-{item_idx}",
+                    item_slug=f"{SEED_PREFIX}-{category.id}-{item_idx}",
+                    summary=f"Recette {item_idx} de la catégorie {category.id}",
+                    content=content,
+                    category_name=category,
+                    date_published=now - timezone.timedelta(minutes=item_idx),
+                    views=item_idx,
+                )
+                for category in seeded_categories
+                for item_idx in range(items)
+            ),
+            batch_size=1000,
+        )
+        # The content is left out of the seeded vectors, as it is the same HTML
+        Item.objects.filter(item_slug__startswith=SEED_PREFIX).update(
+            search_vector=SearchVector(F("item_name"), config=SEARCH_CONFIG)
+            + SearchVector(F("summary"), config=SEARCH_CONFIG)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE main_category, main_item")
+
+    # pylint: disable=no-self-use
+    def view_querysets(self) -> Dict[str, QuerySet]:
+        """Returns the querysets run by the views, for a seeded category and item"""
+        category = Category.objects.filter(
+            category_slug__startswith=SEED_PREFIX
+        ).first()
+        items = Item.objects.filter(category_name=category).order_by("item_name")
+        item = items[items.count() // 2]
+        # A word of the summary of a single item per category
+        search_text = str(items.count() // 2)
+
+        items_view = ItemsView(
+            kwargs={
+                "category_slug": category.category_slug,
+                "item_slug": item.item_slug,
+            }
+        )
+        items_view.object = item
+        search_view = SearchView(
+            request=RequestFactory().get("/search/", {"q": search_text})
+        )
+        return {
+            "CategoriesView": CategoriesView().get_queryset(),
+            "ItemsView": items_view.get_queryset().filter(item_slug=item.item_slug),
+            "ItemsView sidebar": items_view.get_sidebar_queryset(),
+            "RedirectToItemView": RedirectToItemView().get_items_queryset(category)[:1],
+            "SearchView": search_view.get_queryset()[: SearchView.paginate_by],
+            "CategoryList api": categories_with_items().order_by("id")[:10],
+            "ItemList api": Item.objects.order_by("id")[:10],
+        }
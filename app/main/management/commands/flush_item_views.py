@@ -0,0 +1,34 @@
+"""Management command to write the buffered item views to the database"""
+
+from django.conf import settings
+
+from main.management.loop_command import LoopCommand
+from main.view_counter import view_counter
+
+
+class Command(LoopCommand):
+    """
+    Flushes the pending item views, once or every `interval` seconds, so that
+    no row is written by the requests recording the views. Runs with --loop on
+    each server, a single one of which flushes the shared buffer per interval.
+    Usage: python manage.py flush_item_views [--loop] [--interval 30]
+    """
+
+    help = "Write the buffered item views to the database"
+    success_message = "Item views flushed"
+    # Seconds during which the server which flushed the buffer holds the lock
+    interval = 1
+
+    @property
+    def default_interval(self) -> int:
+        return settings.VIEW_COUNT_FLUSH_INTERVAL
+
+    def handle(self, *args, **options):
+        self.interval = options["interval"]
+        super().handle(*args, **options)
+
+    def run_once(self) -> None:
+        if not view_counter.buffer.acquire_flush(self.interval):
+            return
+        flushed_views = view_counter.flush()
+        self.stdout.write(f"Flushed {flushed_views} item views")
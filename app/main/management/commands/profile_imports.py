@@ -0,0 +1,75 @@
+"""Management command to profile the import time of the application"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Line written by python -X importtime: self [us] | cumulative [us] | module
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class Command(BaseCommand):
+    """
+    Imports the application in a new interpreter with python -X importtime,
+    as a worker does when it boots, and prints the total import time and the
+    slowest modules, including the modules they import.
+    Usage: python manage.py profile_imports [--limit 20] [--app portfolio.wsgi]
+    """
+
+    help = "Profile the import time of the application"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--app", default="portfolio.wsgi", help="Module of the application"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of modules to print"
+        )
+
+    def handle(self, *args, **options):
+        # The URLconf is loaded by the first request, so it is imported as well
+        script = (
+            f"import {options['app']}; "
+            "from django.urls import get_resolver; get_resolver().url_patterns"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        if result.returncode:
+            raise CommandError(f"Failed to import {options['app']}:\n{result.stderr}")
+
+        imports = self.parse_import_times(result.stderr)
+        total = sum(self_us for _, self_us, _ in imports)
+        self.stdout.write(f"{'cumulative (ms)':>16}{'self (ms)':>12}  module")
+        for cumulative_us, self_us, module in sorted(imports, reverse=True)[
+            : options["limit"]
+        ]:
+            self.stdout.write(
+                f"{cumulative_us / 1000:>16.1f}{self_us / 1000:>12.1f}  {module}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(imports)} modules in {total / 1000:.1f} ms"
+            )
+        )
+
+    @staticmethod
+    def parse_import_times(output: str) -> List[Tuple[int, int, str]]:
+        """Returns the cumulative and self import times of each module, in us"""
+        imports = []
+        for line in output.splitlines():
+            if match := IMPORT_TIME_LINE.match(line):
+                self_us, cumulative_us, _, module = match.groups()
+                imports.append((int(cumulative_us), int(self_us), module))
+        return imports
@@ -0,0 +1,26 @@
+"""Management command to refresh the category statistics"""
+
+from django.conf import settings
+
+from main.management.loop_command import LoopCommand
+from main.models import CategoryStats
+from main.page_cache import API_STATS_GROUP, evict_page_groups
+
+
+class Command(LoopCommand):
+    """
+    Aggregates the category statistics again, once or every `interval` seconds,
+    and evicts the cached statistics responses of the api.
+    Usage: python manage.py refresh_category_stats [--loop] [--interval 300]
+    """
+
+    help = "Refresh the category statistics"
+    success_message = "Category statistics refreshed"
+
+    @property
+    def default_interval(self) -> int:
+        return settings.CATEGORY_STATS_REFRESH_INTERVAL
+
+    def run_once(self) -> None:
+        CategoryStats.refresh()
+        evict_page_groups([API_STATS_GROUP])
@@ -0,0 +1,28 @@
+"""Management command to schedule the retries of the failed notifications"""
+
+from django.conf import settings
+
+from main.management.loop_command import LoopCommand
+from main.notifications import retryable_chunks
+from main.tasks import enqueue
+
+
+class Command(LoopCommand):
+    """
+    Queues the retry of the failed or stale pending notification chunks (see
+    notifications.retryable_chunks), once or every `interval` seconds. The
+    chunks are sent again by the background task worker.
+    Usage: python manage.py retry_notifications [--loop] [--interval 300]
+    """
+
+    help = "Schedule the retries of the failed notifications"
+    success_message = "Notification retries scheduled"
+
+    @property
+    def default_interval(self) -> int:
+        return settings.NOTIFICATION_RETRY_INTERVAL
+
+    def run_once(self) -> None:
+        if retryable_chunks().exists():
+            enqueue("retry_notifications")
+            self.stdout.write("Scheduled the retry of the notification chunks")
@@ -0,0 +1,30 @@
+"""Management command to run the background task worker"""
+
+from main.management.loop_command import LoopCommand
+from main.tasks import run_worker
+
+
+class Command(LoopCommand):
+    """
+    Executes the tasks pushed to the Redis queue, i.e. all the tasks when
+    TASK_QUEUE_ENABLED is set, and the tasks registered with inline=False.
+    Exits once the queue is empty, unless run with --loop, in which case the
+    worker is restarted `interval` seconds after a failure, e.g. when Redis or
+    the database are unavailable.
+    Usage: python manage.py run_task_worker [--loop] [--interval 5]
+    """
+
+    help = "Run the background task worker"
+    default_interval = 5
+    success_message = "Task worker stopped"
+    # Whether the worker exits once the queue is empty, without --loop
+    burst = True
+
+    def handle(self, *args, **options):
+        self.burst = not options["loop"]
+        super().handle(*args, **options)
+
+    def run_once(self) -> None:
+        self.stdout.write("Waiting for background tasks...")
+        executed_tasks = run_worker(burst=self.burst)
+        self.stdout.write(f"Executed {executed_tasks} tasks")
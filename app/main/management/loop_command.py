@@ -0,0 +1,53 @@
+"""This module defines the base class of the management commands run in a loop"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class LoopCommand(BaseCommand):
+    """
+    Management command running once, or every `interval` seconds with --loop.
+    With --loop, failed runs, e.g. during a database failover, are logged and
+    retried by the next run. Subclasses define run_once() and success_message.
+    """
+
+    # Seconds between two runs, unless set with --interval
+    default_interval = 10
+    success_message = ""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running every interval, instead of exiting",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=self.default_interval,
+            help="Seconds between two runs",
+        )
+
+    def run_once(self) -> None:
+        """Runs the command once"""
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                self.run_once()
+            except Exception:  # pylint: disable=broad-except
+                if not options["loop"]:
+                    raise
+                logger.exception(f"Failed to run {self.__module__}")
+                # Broken connections are reopened by the next run
+                close_old_connections()
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(self.success_message))
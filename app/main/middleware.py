@@ -0,0 +1,95 @@
+"""This module defines custom Django middlewares"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from helpers.constants import ITEM_ID_HEADER
+
+from .db_routers import PIN_COOKIE, REPLICA_DB, RoutingState, routing_state
+from .view_counter import view_counter
+
+
+class AsyncCapableMiddleware:
+    """
+    Base class of the middlewares serving both WSGI and ASGI requests, so that
+    async views are not run in a thread because of a sync-only middleware.
+    Subclasses implement __call__ for sync requests, and __acall__ for async ones.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Marks the instance as a coroutine function, as MiddlewareMixin does
+            # pylint: disable=protected-access
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+
+class ItemViewCountMiddleware(AsyncCapableMiddleware):
+    """
+    Counts item page views from the item id header set by the ItemsView.
+    The header is cached along with the page by cache_page, so views are
+    recorded on cache hits too, while the view itself is not executed.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if item_id := self.pop_item_id(request, response):
+            view_counter.record(item_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if item_id := self.pop_item_id(request, response):
+            await sync_to_async(view_counter.record)(item_id)
+        return response
+
+    @staticmethod
+    def pop_item_id(request, response):
+        """Removes the item id header, and returns the id of a viewed item"""
+        if item_id := response.get(ITEM_ID_HEADER):
+            del response[ITEM_ID_HEADER]
+            if request.method == "GET":
+                return int(item_id)
+        return None
+
+
+class ReplicaPinningMiddleware(AsyncCapableMiddleware):
+    """
+    Scopes the database routing state to each request (see main.db_routers).
+    Once a request writes to the primary database, a cookie pins the next
+    requests of the client to the primary for DB_REPLICA_LAG_WINDOW seconds,
+    so that users read their own writes despite the replication lag.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with routing_state(pinned=PIN_COOKIE in request.COOKIES) as state:
+            response = self.get_response(request)
+        return self.pin_client(state, response)
+
+    async def __acall__(self, request):
+        with routing_state(pinned=PIN_COOKIE in request.COOKIES) as state:
+            response = await self.get_response(request)
+        return self.pin_client(state, response)
+
+    @staticmethod
+    def pin_client(state: RoutingState, response):
+        """Sets the pin cookie if the request wrote to the database"""
+        if state.wrote and REPLICA_DB in settings.DATABASES:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DB_REPLICA_LAG_WINDOW,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
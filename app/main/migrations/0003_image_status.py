@@ -0,0 +1,43 @@
+# Generated by Django 3.2.25 on 2026-10-17 23:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0002_item_image_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "En cours"),
+                    ("ready", "Prête"),
+                    ("failed", "Échec"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=10,
+                verbose_name="Traitement de la photo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "En cours"),
+                    ("ready", "Prête"),
+                    ("failed", "Échec"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=10,
+                verbose_name="Traitement de la photo",
+            ),
+        ),
+    ]
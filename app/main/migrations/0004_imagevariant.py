@@ -0,0 +1,44 @@
+# Generated by Django 3.2.25 on 2026-10-17 23:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("main", "0003_image_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageVariant",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("object_id", models.PositiveIntegerField()),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("avif", "AVIF"), ("webp", "WebP"), ("jpeg", "JPEG")],
+                        max_length=4,
+                    ),
+                ),
+                ("image", models.ImageField(upload_to="images/")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Variante de photo",
+                "verbose_name_plural": "Variantes de photo",
+                "unique_together": {("content_type", "object_id", "width", "format")},
+            },
+        ),
+    ]
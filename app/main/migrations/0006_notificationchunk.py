@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0005_outboxmessage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationChunk",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("recipients", models.JSONField(default=list)),
+                ("pending_recipients", models.JSONField(default=list)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "En attente"),
+                            ("sent", "Envoyé"),
+                            ("failed", "Échec"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True, default="")),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="main.item"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lot de notifications",
+                "verbose_name_plural": "Lots de notifications",
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:13
+
+from django.db import migrations, models
+import main.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0006_notificationchunk"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="item",
+            name="content",
+            field=models.TextField(
+                default=main.models.default_item_content, verbose_name="Contenu"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:21
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from main.search import item_search_vector
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Computes the search vector of the existing items"""
+    Item = apps.get_model("main", "Item")
+    items = Item.objects.only("item_name", "summary", "content").iterator()
+    for item in items:
+        Item.objects.filter(pk=item.pk).update(
+            search_vector=item_search_vector(item.item_name, item.summary, item.content)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0007_item_content_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="item_search_vector_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Statistics of each category, aggregated when the view is refreshed. The view
+# has a unique index, so that it can be refreshed concurrently with its reads
+CREATE_CATEGORY_STATS_VIEW = """
+CREATE MATERIALIZED VIEW main_categorystats AS
+SELECT
+    category.id AS category_id,
+    count(item.id) AS item_count,
+    coalesce(sum(item.views), 0) AS total_views,
+    (array_agg(item.id ORDER BY item.date_published DESC, item.id DESC))[1]
+        AS newest_item_id,
+    coalesce(
+        (
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'id', top.id,
+                    'item_name', top.item_name,
+                    'item_slug', top.item_slug,
+                    'views', top.views
+                )
+                ORDER BY top.views DESC, top.id
+            )
+            FROM (
+                SELECT id, item_name, item_slug, views
+                FROM main_item
+                WHERE category_name_id = category.id
+                ORDER BY views DESC, id
+                LIMIT 5
+            ) top
+        ),
+        '[]'::jsonb
+    ) AS top_items,
+    now() AS refreshed_at
+FROM main_category category
+LEFT JOIN main_item item ON item.category_name_id = category.id
+GROUP BY category.id;
+
+CREATE UNIQUE INDEX main_categorystats_category_id
+    ON main_categorystats (category_id);
+"""
+
+DROP_CATEGORY_STATS_VIEW = "DROP MATERIALIZED VIEW main_categorystats;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0008_item_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryStats",
+            fields=[
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="main.category",
+                        verbose_name="Catégorie",
+                    ),
+                ),
+                ("item_count", models.IntegerField(verbose_name="Recettes")),
+                ("total_views", models.BigIntegerField(verbose_name="Vues")),
+                (
+                    "newest_item",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="main.item",
+                        verbose_name="Dernière recette",
+                    ),
+                ),
+                ("top_items", models.JSONField(default=list)),
+                ("refreshed_at", models.DateTimeField(verbose_name="Mis à jour le")),
+            ],
+            options={
+                "verbose_name": "Statistiques de catégorie",
+                "verbose_name_plural": "Statistiques des catégories",
+                "db_table": "main_categorystats",
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(CREATE_CATEGORY_STATS_VIEW, DROP_CATEGORY_STATS_VIEW),
+    ]
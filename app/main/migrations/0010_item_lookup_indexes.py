@@ -0,0 +1,58 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:27
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built without locking main_item against writes
+    atomic = False
+
+    dependencies = [
+        ("main", "0009_categorystats"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="item",
+            index=models.Index(
+                fields=["category_name", "item_name"],
+                include=("item_slug",),
+                name="item_category_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="item",
+            index=models.Index(
+                fields=["-date_published"], name="item_date_published_idx"
+            ),
+        ),
+        # The foreign key index is replaced by item_category_name_idx. It is
+        # dropped concurrently, without altering the foreign key constraint
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "DROP INDEX CONCURRENTLY IF EXISTS "
+                    "main_item_category_name_id_0205f5c3;",
+                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                    "main_item_category_name_id_0205f5c3 "
+                    "ON main_item (category_name_id);",
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="item",
+                    name="category_name",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        default=1,
+                        on_delete=django.db.models.deletion.SET_DEFAULT,
+                        to="main.category",
+                        verbose_name="Catégorie",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+from main.content import render_content
+
+
+def backfill_content_rendered(apps, schema_editor):
+    """Renders the content of the existing items"""
+    Item = apps.get_model("main", "Item")
+    for item in Item.objects.only("content").iterator():
+        Item.objects.filter(pk=item.pk).update(
+            content_rendered=render_content(item.content)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0010_item_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="content_rendered",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_content_rendered, migrations.RunPython.noop),
+    ]
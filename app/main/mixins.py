@@ -2,17 +2,29 @@
 This module defines common functionalities across Django models and Views
 """
 
+import asyncio
 import logging
 import sys
 from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import models
 from django.db.models.fields.files import ImageFieldFile
 from PIL import Image
 
-from helpers.constants import CROP_SIZE, THUMBNAIL_SIZE
+from helpers.constants import CROP_SIZE, IMAGE_VARIANT_QUALITY, THUMBNAIL_SIZE
+
+from .db_routers import replica_reads
+from .fragment_cache import bump_content_version
+from .page_cache import evict_page_groups
+from .tasks import enqueue
 
 
 class RequireLoginMixin:
@@ -28,14 +40,231 @@ class RequireLoginMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
+class ReplicaReadMixin:
+    """
+    Add this Mixin in django class views to read from the database replica.
+    The response is rendered within the view, so that the queries run by the
+    template are routed to the replica as well.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Overrides the dispatch method, to route the view reads to the replica"""
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            if not getattr(response, "is_rendered", True):
+                response.render()
+        return response
+
+
+class AsyncViewMixin:
+    """
+    Add this Mixin in django class views whose handlers are coroutines, so that
+    under ASGI the view awaits external calls without holding a thread.
+    Django 3.2 only detects function views as async, hence the view returned by
+    as_view() is marked as a coroutine function.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Marks the view function as a coroutine function"""
+        view = super().as_view(**initkwargs)
+        # pylint: disable=protected-access
+        view._is_coroutine = asyncio.coroutines._is_coroutine
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Runs the dispatch of the parent classes in a thread, as it may query
+        the database (eg. RequireLoginMixin), then awaits the handler.
+        """
+        response = await sync_to_async(super().dispatch)(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+
+class ImageStatus(models.TextChoices):
+    """Processing state of the resized images of a Category or Item object"""
+
+    PENDING = "pending", "En cours"
+    READY = "ready", "Prête"
+    FAILED = "failed", "Échec"
+
+
 class BaseModelMixin:
     """Base Class providing helper functions for Django Models"""
 
     logger = logging.getLogger(__name__)
+    # Fields whose loaded values are kept, to tell which ones a save modifies
+    tracked_fields: Tuple[str, ...] = ()
+
+    def __init__(self):
+        """
+        Called by Model.__init__() once the field values are set, to keep track
+        of the image names and tracked field values loaded from the database.
+        """
+        super().__init__()
+        self.track_loaded_values()
+
+    def _get_image_names(self) -> Dict[str, Optional[str]]:
+        """
+        Returns the file name of each image field, read from the instance
+        __dict__ so that neither the storage nor deferred fields are accessed.
+        """
+        return {
+            field.attname: getattr(
+                value := self.__dict__.get(field.attname), "name", value
+            )
+            for field in self._meta.concrete_fields
+            if isinstance(field, models.ImageField)
+        }
+
+    def image_has_changed(self, field_name: str) -> bool:
+        """
+        Returns whether a new image was assigned to the given field since the
+        object was loaded or last saved. Used on save to skip image processing,
+        and the related storage round-trips, when only text fields were edited.
+        """
+        if self._state.adding:
+            return True
+        if field_name not in self.__dict__:
+            # Deferred field which was never loaded, hence never modified
+            return False
+        image = self.__dict__[field_name]
+        if isinstance(image, File) and not getattr(image, "_committed", True):
+            # Newly uploaded file, not yet written to the storage
+            return True
+        name = getattr(image, "name", image)
+        return name != self._loaded_image_names.get(field_name)
+
+    def has_changed(self, *attnames: str) -> bool:
+        """
+        Returns whether any of the given tracked fields was modified since the
+        object was loaded or last saved. Deferred fields are never modified.
+        """
+        return any(
+            attname in self.__dict__
+            and self.__dict__[attname] != self.loaded_values.get(attname)
+            for attname in attnames
+        )
+
+    def track_loaded_values(self) -> None:
+        """
+        Records the current image names and tracked field values, to be called
+        once an object is saved
+        """
+        self._loaded_image_names = self._get_image_names()
+        self.loaded_values = {
+            attname: self.__dict__[attname]
+            for attname in self.tracked_fields
+            if attname in self.__dict__
+        }
+
+    def image_derivatives(self) -> Dict[str, InMemoryUploadedFile]:
+        """Returns the resized images to generate, keyed by field name"""
+        raise NotImplementedError
+
+    def cached_page_groups(self) -> List[str]:
+        """Returns the groups of cached pages displaying the object"""
+        raise NotImplementedError
+
+    def process_images(self) -> None:
+        """
+        To be called on save when the image has changed. Generates the resized
+        images straight away, unless the task queue is enabled, in which case
+        they are flagged as pending and left to the background worker.
+        """
+        if settings.TASK_QUEUE_ENABLED:
+            self.image_status = ImageStatus.PENDING
+            return
+        for field_name, image in self.image_derivatives().items():
+            setattr(self, field_name, image)
+        self.image_status = ImageStatus.READY
+
+    def images_saved(self, images_changed: bool) -> None:
+        """
+        To be called once the object is saved. Queues the generation of the
+        pending resized images if any, followed by the responsive variants.
+        """
+        self.track_loaded_values()
+        if not images_changed:
+            return
+        if self.image_status == ImageStatus.PENDING:
+            task_name = "generate_image_derivatives"
+        else:
+            task_name = "generate_image_variants"
+        enqueue(task_name, model=self._meta.label_lower, pk=self.pk)
+
+    def apply_image_derivatives(self) -> None:
+        """
+        Generates and stores the resized images of a saved object, then
+        updates the database row without calling save(). The row is left
+        untouched if a new image was uploaded in the meantime.
+        """
+        model_class = type(self)
+        unchanged_rows = model_class.objects.filter(pk=self.pk, image=self.image.name)
+        try:
+            derivatives = self.image_derivatives()
+        except Exception:
+            unchanged_rows.update(image_status=ImageStatus.FAILED)
+            raise
+        stored_names = {
+            field_name: (field := self._meta.get_field(field_name)).storage.save(
+                field.generate_filename(self, image.name), image
+            )
+            for field_name, image in derivatives.items()
+        }
+        unchanged_rows.update(image_status=ImageStatus.READY, **stored_names)
+
+    def generate_image_variants(self) -> None:
+        """
+        Replaces the responsive variants of the image, resized to each of the
+        IMAGE_VARIANT_WIDTHS and encoded in each of the IMAGE_VARIANT_FORMATS.
+        Widths are capped to the image width, so that small images get a
+        single variant per format rather than upscaled copies. The cached pages
+        displaying the image are then evicted.
+        """
+        with self.image.open("rb"):
+            source = Image.open(self.image)
+            source.load()
+        source = source.convert("RGB")
+        Image.init()
+        image_formats = [
+            image_format
+            for image_format in settings.IMAGE_VARIANT_FORMATS
+            if image_format.upper() in Image.SAVE
+        ]
+        widths = {min(width, source.width) for width in settings.IMAGE_VARIANT_WIDTHS}
+        base_name = Path(self.image.name).stem
+
+        for variant in self.variants.all():
+            variant.image.delete(save=False)
+        self.variants.all().delete()
+
+        for width in sorted(widths):
+            height = round(source.height * width / source.width)
+            resized = source.resize((width, height), Image.LANCZOS)
+            for image_format in image_formats:
+                resized.save(
+                    output_io_stream := BytesIO(),
+                    format=image_format.upper(),
+                    quality=IMAGE_VARIANT_QUALITY.get(image_format, 80),
+                )
+                self.variants.create(
+                    width=width,
+                    height=height,
+                    format=image_format,
+                    image=ContentFile(
+                        output_io_stream.getvalue(),
+                        name=f"{base_name}_{width}w.{image_format}",
+                    ),
+                )
+        evict_page_groups(self.cached_page_groups())
+        bump_content_version()
 
     # pylint: disable=no-self-use
     def resize_image(
-        self, uploaded_image: ImageFieldFile, suffix: str = None
+        self, uploaded_image: ImageFieldFile, suffix: str = ""
     ) -> ImageFieldFile:
         """
         Performs the following operation on a given image:
@@ -1,21 +1,74 @@
 """This module defines the Django models Item and Category to manage blog posts"""
 from pathlib import Path
+from typing import Dict, List
 
 from django.conf import settings
-from django.db import models
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, router
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.fields.files import ImageFieldFile
 from django.utils import timezone
 from django.utils.text import slugify
 
 from app.helpers.constants import THUMBNAIL_SUFFIX
 
-from .mixins import BaseModelMixin
+from .content import render_content
+from .mixins import BaseModelMixin, ImageStatus
+from .page_cache import API_GROUP, CATEGORIES_GROUP, CATEGORY_GROUP, ITEM_GROUP
+from .search import item_search_vector
 
 HTML_TEMPLATE_PATH = Path(__file__).resolve().parent / "item_content_template.html"
 
 
+def default_item_content() -> str:
+    """Returns the HTML template of a new item content, read when it is needed"""
+    return HTML_TEMPLATE_PATH.read_text(encoding="utf-8")
+
+
+class ImageVariant(models.Model):
+    """
+    Django model to store the responsive versions of a Category or Item image,
+    resized to a given width and encoded in a given format (see main.mixins)
+    """
+
+    class Format(models.TextChoices):
+        """Image formats a variant can be encoded in"""
+
+        AVIF = "avif", "AVIF"
+        WEBP = "webp", "WebP"
+        JPEG = "jpeg", "JPEG"
+
+    id = models.AutoField(primary_key=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    source = GenericForeignKey("content_type", "object_id")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=4, choices=Format.choices)
+    image = models.ImageField(upload_to=settings.UPLOADS_FOLDER_PATH)
+
+    def __repr__(self):
+        """User-friendly string representation of the object"""
+        return (
+            f"ImageVariant=(id={self.id},source={self.content_type_id}:"
+            f"{self.object_id},width={self.width},format={self.format})"
+        )
+
+    class Meta:
+        verbose_name = "Variante de photo"
+        verbose_name_plural = "Variantes de photo"
+        app_label = "main"
+        unique_together = ("content_type", "object_id", "width", "format")
+
+
 class Category(models.Model, BaseModelMixin):
     """Django model to manage blog post categories"""
 
+    tracked_fields = ("category_slug",)
+
     id = models.AutoField(primary_key=True)
     category_name = models.CharField(
         max_length=200, unique=True, verbose_name="Nom de la catégorie"
@@ -25,6 +78,14 @@ class Category(models.Model, BaseModelMixin):
         upload_to=settings.UPLOADS_FOLDER_PATH, verbose_name="Photo"
     )
     category_slug = models.SlugField(max_length=50, unique=True)
+    image_status = models.CharField(
+        max_length=10,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+        verbose_name="Traitement de la photo",
+    )
+    variants = GenericRelation(ImageVariant)
 
     @classmethod
     def create(cls, kwargs) -> "Category":
@@ -37,9 +98,23 @@ class Category(models.Model, BaseModelMixin):
     # pylint: disable=signature-differs
     def save(self, *args, **kwargs):
         """Any modification on the item attributes before saving the object."""
-        self.image = self.resize_image(self.image)
+        if images_changed := self.image_has_changed("image"):
+            self.process_images()
         self.category_slug = slugify(self.category_name)
         super().save(*args, **kwargs)
+        self.images_saved(images_changed)
+
+    def image_derivatives(self):
+        """The category image is replaced by its resized version"""
+        return {"image": self.resize_image(self.image)}
+
+    def cached_page_groups(self) -> List[str]:
+        """The category is displayed on the listing, its item pages and the api"""
+        return [
+            API_GROUP,
+            CATEGORIES_GROUP,
+            CATEGORY_GROUP.format(category_slug=self.category_slug),
+        ]
 
     def __str__(self):
         """User-friendly string representation of the object"""
@@ -58,9 +133,32 @@ class Category(models.Model, BaseModelMixin):
         app_label = "main"
 
 
+class ItemQuerySet(models.QuerySet):
+    """QuerySet of the Item objects, with projections for the list contexts"""
+
+    def cards(self) -> "ItemQuerySet":
+        """
+        Items without their HTML content, for the lists, links and admin pages
+        which only display the item names, slugs, summaries and images
+        """
+        return self.defer("content", "content_rendered")
+
+
+class ItemManager(models.Manager.from_queryset(ItemQuerySet)):
+    """
+    Manager of the Item objects. The search vector is only read by PostgreSQL
+    to match the searched items, hence never loaded.
+    """
+
+    def get_queryset(self) -> ItemQuerySet:
+        return super().get_queryset().defer("search_vector")
+
+
 class Item(models.Model, BaseModelMixin):
     """Django model to manage blog post items"""
 
+    tracked_fields = ("item_name", "item_slug", "category_name_id")
+
     id = models.AutoField(primary_key=True)
     item_name = models.CharField(
         max_length=200, unique=True, verbose_name="Nom de la recette"
@@ -73,14 +171,32 @@ class Item(models.Model, BaseModelMixin):
     image_thumbnail = models.ImageField(
         upload_to=settings.UPLOADS_FOLDER_PATH, default=""
     )
-    with open(HTML_TEMPLATE_PATH) as f:
-        content = models.TextField(default=f.read(), verbose_name="Contenu")
+    content = models.TextField(default=default_item_content, verbose_name="Contenu")
+    # Sanitised and minified content, served on the item page (see main.content)
+    content_rendered = models.TextField(blank=True, default="", editable=False)
     date_published = models.DateTimeField("date published", default=timezone.now)
     item_slug = models.SlugField(max_length=50, unique=True)
+    # Indexed by item_category_name_idx, whose first column is the category
     category_name = models.ForeignKey(
-        Category, default=1, verbose_name="Catégorie", on_delete=models.SET_DEFAULT,
+        Category,
+        default=1,
+        verbose_name="Catégorie",
+        on_delete=models.SET_DEFAULT,
+        db_index=False,
     )
     views = models.IntegerField(default=0)
+    image_status = models.CharField(
+        max_length=10,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+        verbose_name="Traitement de la photo",
+    )
+    variants = GenericRelation(ImageVariant)
+    # Full-text search document of the item, see main.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ItemManager()
 
     @classmethod
     def create(cls, kwargs: dict) -> "Item":
@@ -90,14 +206,70 @@ class Item(models.Model, BaseModelMixin):
     # pylint: disable=signature-differs
     def save(self, *args, **kwargs):
         """Any modification on the item attributes before saving the object."""
-        self.image_thumbnail = self.resize_image(self.image, suffix=THUMBNAIL_SUFFIX)
+        if images_changed := (
+            self.image_has_changed("image") or not self.image_thumbnail
+        ):
+            self.process_images()
         self.item_slug = slugify(self.item_name)
+        self.content_rendered = render_content(self.content)
+        self.search_vector = item_search_vector(
+            self.item_name, self.summary, self.content
+        )
         super().save(*args, **kwargs)
+        # The vector is computed by the database, and loaded again when accessed
+        del self.search_vector
+        self.images_saved(images_changed)
+
+    def image_derivatives(self):
+        """The item image is kept as is, and a thumbnail is generated"""
+        return {
+            "image_thumbnail": self.resize_image(self.image, suffix=THUMBNAIL_SUFFIX)
+        }
+
+    def cached_page_groups(self) -> List[str]:
+        """The item content and images are displayed on its own page and the api"""
+        return [
+            API_GROUP,
+            ITEM_GROUP.format(
+                category_slug=self.category_name.category_slug,
+                item_slug=self.item_slug,
+            ),
+        ]
+
+    @property
+    def thumbnail(self) -> ImageFieldFile:
+        """Returns the thumbnail once generated, or the original image otherwise"""
+        if self.image_status == ImageStatus.READY and self.image_thumbnail:
+            return self.image_thumbnail
+        return self.image
 
     def increment_views(self):
-        """Instance method to increment the views variable"""
-        self.views += 1
-        self.save()
+        """
+        Instance method to increment the views variable. The view is buffered
+        and later flushed to the database, see main.view_counter.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .view_counter import view_counter
+
+        view_counter.record(self.id)
+
+    @classmethod
+    def add_views(cls, views_by_item_id: Dict[int, int]) -> int:
+        """
+        Adds a number of views to the given items with a single
+        UPDATE ... SET views = views + n statement, bypassing save().
+        """
+        increments = Case(
+            *[
+                When(id=item_id, then=Value(views))
+                for item_id, views in views_by_item_id.items()
+            ],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        return cls.objects.filter(id__in=views_by_item_id).update(
+            views=F("views") + increments
+        )
 
     def __str__(self):
         """User-friendly string representation of the object"""
@@ -113,3 +285,150 @@ class Item(models.Model, BaseModelMixin):
         verbose_name = "Recettes"
         verbose_name_plural = "Recettes"
         app_label = "main"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="item_search_vector_idx"),
+            # Items of a category in sidebar order, read with index-only scans
+            models.Index(
+                fields=["category_name", "item_name"],
+                include=["item_slug"],
+                name="item_category_name_idx",
+            ),
+            models.Index(fields=["-date_published"], name="item_date_published_idx"),
+        ]
+
+
+class OutboxMessage(models.Model):
+    """
+    Django model to store the messages to publish to AWS SNS, so that they are
+    published by a background dispatcher rather than on the request path
+    (see main.outbox)
+    """
+
+    class Status(models.TextChoices):
+        """Delivery state of an outbox message"""
+
+        PENDING = "pending", "En attente"
+        SENT = "sent", "Envoyé"
+        FAILED = "failed", "Échec"
+
+    id = models.AutoField(primary_key=True)
+    topic_arn = models.CharField(max_length=256)
+    message = models.TextField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    def __repr__(self):
+        """User-friendly string representation of the object"""
+        return (
+            f"OutboxMessage=(id={self.id},status={self.status}"
+            f",attempts={self.attempts})"
+        )
+
+    class Meta:
+        verbose_name = "Message sortant"
+        verbose_name_plural = "Messages sortants"
+        app_label = "main"
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+
+class NotificationChunk(models.Model):
+    """
+    Django model to store a chunk of the users notified of a new item with a
+    single AWS SES request, and the result of the request, so that the users
+    who could not be notified are retried (see main.notifications)
+    """
+
+    class Status(models.TextChoices):
+        """Delivery state of a notification chunk"""
+
+        PENDING = "pending", "En attente"
+        SENT = "sent", "Envoyé"
+        FAILED = "failed", "Échec"
+
+    id = models.AutoField(primary_key=True)
+    item = models.ForeignKey(Item, on_delete=models.CASCADE)
+    # [username, email] of the users of the chunk, and of those not notified yet
+    recipients = models.JSONField(default=list)
+    pending_recipients = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    def __repr__(self):
+        """User-friendly string representation of the object"""
+        return (
+            f"NotificationChunk=(id={self.id},item={self.item_id}"
+            f",status={self.status},attempts={self.attempts})"
+        )
+
+    class Meta:
+        verbose_name = "Lot de notifications"
+        verbose_name_plural = "Lots de notifications"
+        app_label = "main"
+
+
+class CategoryStats(models.Model):
+    """
+    Django model reading the statistics of each category from a materialized
+    view, aggregated by PostgreSQL when the view is refreshed rather than on
+    each request (see migration 0009 and the refresh_category_stats command)
+    """
+
+    # Number of most viewed items of each category, set in the view definition
+    TOP_ITEMS_COUNT = 5
+
+    category = models.OneToOneField(
+        Category,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        related_name="stats",
+        verbose_name="Catégorie",
+    )
+    item_count = models.IntegerField(verbose_name="Recettes")
+    total_views = models.BigIntegerField(verbose_name="Vues")
+    newest_item = models.ForeignKey(
+        Item,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        verbose_name="Dernière recette",
+    )
+    # [{"id", "item_name", "item_slug", "views"}] of the most viewed items
+    top_items = models.JSONField(default=list)
+    refreshed_at = models.DateTimeField(verbose_name="Mis à jour le")
+
+    @classmethod
+    def refresh(cls) -> None:
+        """
+        Aggregates the statistics again. The view is refreshed concurrently,
+        so that it can still be read while the statistics are aggregated.
+        """
+        connection = connections[router.db_for_write(cls)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"REFRESH MATERIALIZED VIEW CONCURRENTLY {cls._meta.db_table}"
+            )
+
+    def __repr__(self):
+        """User-friendly string representation of the object"""
+        return (
+            f"CategoryStats=(category={self.category_id},item_count={self.item_count}"
+            f",total_views={self.total_views})"
+        )
+
+    class Meta:
+        verbose_name = "Statistiques de catégorie"
+        verbose_name_plural = "Statistiques des catégories"
+        app_label = "main"
+        managed = False
+        db_table = "main_categorystats"
@@ -0,0 +1,245 @@
+"""
+This module defines the fan-out of the AWS SES emails notifying the registered
+users of a new item. Users are streamed from the database into chunks of at
+most SES_MAX_DESTINATIONS recipients, which are saved and then sent from a
+bounded thread pool in batches of CHUNKS_BATCH_SIZE as they are saved, without
+exceeding the SES maximum send rate.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils import timezone
+
+from app.config import AWS_S3_CUSTOM_DOMAIN, SES_IDENTITY_ARN
+
+from .aws_clients import get_client
+from .models import Item, NotificationChunk
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of destinations of a SES SendBulkTemplatedEmail request
+SES_MAX_DESTINATIONS = 50
+# Number of chunks saved with a single INSERT statement, and sent before the
+# next ones are saved
+CHUNKS_BATCH_SIZE = 100
+
+
+class RateLimiter:
+    """
+    Spaces out the requests of all the threads, so that no more than `rate`
+    emails are sent per second on average.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, emails: int) -> None:
+        """Blocks until a given number of emails can be sent"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + emails / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yields lists of `size` elements of an iterable, and the remainder"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def create_chunks(item: Item) -> Iterator[List[NotificationChunk]]:
+    """
+    Saves the chunks of the users to notify of an item, and yields them in
+    batches of CHUNKS_BATCH_SIZE as they are saved. Users are read with a
+    server-side cursor, as [username, email] pairs rather than User objects.
+    """
+    users = (
+        User.objects.exclude(username="")
+        .exclude(email="")
+        .order_by("id")
+        .values_list("username", "email")
+        .iterator()
+    )
+    chunks = (
+        NotificationChunk(
+            item=item,
+            recipients=[list(user) for user in users_chunk],
+            pending_recipients=[list(user) for user in users_chunk],
+        )
+        for users_chunk in chunked(users, SES_MAX_DESTINATIONS)
+    )
+    for chunks_batch in chunked(chunks, CHUNKS_BATCH_SIZE):
+        yield NotificationChunk.objects.bulk_create(chunks_batch)
+
+
+def item_template_data(item: Item) -> Dict[str, str]:
+    """Returns the SES template data common to all the users"""
+    return {
+        "base_url": f"https://{AWS_S3_CUSTOM_DOMAIN}",
+        "item_name": item.item_name,
+        "item_page_url": f"https://{AWS_S3_CUSTOM_DOMAIN}/items/{item.category_name.category_slug}/{item.item_slug}",
+        "item_image_url": item.thumbnail.url,
+        "action": "ajoutée",
+        "subject": "🍚 Nouvelle Tari-Recette disponible!",
+    }
+
+
+def send_chunk(
+    recipients: List[List[str]], template_data: Dict[str, str], limiter: RateLimiter
+) -> Dict[str, str]:
+    """
+    Sends the notification to a chunk of users with a single SES request, and
+    returns the error of each email address which could not be notified.
+    """
+    limiter.acquire(len(recipients))
+    try:
+        response = get_client("ses").send_bulk_templated_email(
+            Source="tari-alerts@tari.kitchen",
+            SourceArn=SES_IDENTITY_ARN,
+            ReplyToAddresses=[],
+            DefaultTags=[],
+            Template="ItemCreatedOrModifiedNotification",  # TODO: remove hardcoded TemplateName. Could use TemplateArn from Cfn
+            DefaultTemplateData=json.dumps(
+                {"base_url": f"https://{AWS_S3_CUSTOM_DOMAIN}"}
+            ),
+            Destinations=[
+                {
+                    "Destination": {"ToAddresses": [email],},
+                    "ReplacementTemplateData": json.dumps(
+                        {**template_data, "username": username.title(), "email": email}
+                    ),
+                }
+                for username, email in recipients
+            ],
+        )
+    except (BotoCoreError, ClientError) as ses_err:
+        return {email: repr(ses_err) for _, email in recipients}
+    return {
+        email: f"{status['Status']}: {status.get('Error', '')}"
+        for (_, email), status in zip(recipients, response["Status"])
+        if status["Status"] != "Success"
+    }
+
+
+def record_result(chunk: NotificationChunk, future: Future) -> None:
+    """Saves the users of a chunk who still have to be notified"""
+    try:
+        errors = future.result()
+    except Exception as send_err:  # pylint: disable=broad-except
+        errors = {email: repr(send_err) for _, email in chunk.pending_recipients}
+    chunk.attempts += 1
+    chunk.pending_recipients = [
+        [username, email]
+        for username, email in chunk.pending_recipients
+        if email in errors
+    ]
+    if chunk.pending_recipients:
+        chunk.status = NotificationChunk.Status.FAILED
+        chunk.last_error = next(iter(errors.values()))
+        logger.warning(
+            f"Failed to notify {len(chunk.pending_recipients)} users of "
+            f"{repr(chunk)}: {chunk.last_error}"
+        )
+    else:
+        chunk.status = NotificationChunk.Status.SENT
+        chunk.sent_at = timezone.now()
+        chunk.last_error = ""
+    chunk.save(
+        update_fields=[
+            "pending_recipients",
+            "status",
+            "attempts",
+            "sent_at",
+            "last_error",
+        ]
+    )
+
+
+def send_chunks(item: Item, chunks_batches: Iterable[List[NotificationChunk]]) -> int:
+    """
+    Sends batches of chunks of an item concurrently, one batch at a time, and
+    returns the number of users notified. Results are saved from the calling
+    thread as chunks complete.
+    """
+    template_data = item_template_data(item)
+    limiter = RateLimiter(settings.SES_MAX_SEND_RATE)
+    notified_users = 0
+    with ThreadPoolExecutor(max_workers=settings.NOTIFICATION_WORKERS) as executor:
+        for chunks in chunks_batches:
+            futures = {
+                executor.submit(
+                    send_chunk, chunk.pending_recipients, template_data, limiter
+                ): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                pending_users = len(chunk.pending_recipients)
+                record_result(chunk, future)
+                notified_users += pending_users - len(chunk.pending_recipients)
+    logger.info(f"SES notification of {repr(item)} sent to {notified_users} users")
+    return notified_users
+
+
+def notify_registered_users(item: Item) -> int:
+    """
+    Notify users of a new item via AWS SES, and returns the number of users
+    notified. Registered emails must be manually added as SES verified
+    identifies from within the AWS Console, because of the limited / sandbox
+    environment. For a production use case, raise a ticket with AWS.
+    """
+    if not SES_IDENTITY_ARN:
+        logger.info("SES_IDENTITY_ARN not set. Skipping SES email.")
+        return 0
+    return send_chunks(item, create_chunks(item))
+
+
+def retryable_chunks():
+    """
+    Returns the chunks which have not reached NOTIFICATION_MAX_ATTEMPTS, and
+    which failed, or are still pending NOTIFICATION_PENDING_TIMEOUT seconds
+    after their creation, e.g. when the worker was stopped before sending them
+    """
+    created_before = timezone.now() - timedelta(
+        seconds=settings.NOTIFICATION_PENDING_TIMEOUT
+    )
+    return NotificationChunk.objects.filter(
+        Q(status=NotificationChunk.Status.FAILED)
+        | Q(status=NotificationChunk.Status.PENDING, created_at__lt=created_before),
+        attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS,
+    )
+
+
+def retry_failed_chunks(chunk_ids: List[int] = None) -> int:
+    """
+    Sends the retryable chunks again, or only the given ones, see
+    retryable_chunks. Returns the number of users notified.
+    """
+    chunks = retryable_chunks().select_related("item__category_name")
+    # Chunks share their item, whose content is not part of the notification
+    chunks = chunks.defer("item__content", "item__search_vector")
+    if chunk_ids is not None:
+        chunks = chunks.filter(id__in=chunk_ids)
+    chunks_by_item: Dict[int, List[NotificationChunk]] = {}
+    for chunk in chunks:
+        chunks_by_item.setdefault(chunk.item_id, []).append(chunk)
+    return sum(
+        send_chunks(item_chunks[0].item, chunked(item_chunks, CHUNKS_BATCH_SIZE))
+        for item_chunks in chunks_by_item.values()
+    )
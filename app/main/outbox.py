@@ -0,0 +1,172 @@
+"""
+This module defines an outbox for the messages published to AWS SNS, so that
+the contact form is not slowed down or failed by the SNS API. Messages are
+saved in the database, and published in batches by the dispatcher process
+(python manage.py dispatch_outbox --loop), which retries failed publications
+with an exponential backoff.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from helpers import strings
+
+from .aws_clients import get_client
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of entries of a SNS PublishBatch request
+SNS_BATCH_SIZE = 10
+# Upper bound of the delay between two attempts to publish a message
+MAX_RETRY_DELAY = 3600
+
+
+class SNSPublisher:
+    """Publishes messages to an AWS SNS topic"""
+
+    # pylint: disable=no-self-use
+    def publish_batch(
+        self, topic_arn: str, messages: List[OutboxMessage]
+    ) -> Dict[int, str]:
+        """
+        Publishes messages to a topic with a single request, and returns the
+        error of each message which could not be published, by message id.
+        """
+        response = get_client("sns").publish_batch(
+            TopicArn=topic_arn,
+            PublishBatchRequestEntries=[
+                {"Id": str(message.id), "Message": message.message}
+                for message in messages
+            ],
+        )
+        logger.info(strings.SNS_SERVICE_RESPONSE.format(response=response))
+        return {
+            int(failed["Id"]): f"{failed['Code']}: {failed.get('Message', '')}"
+            for failed in response.get("Failed", [])
+        }
+
+
+class LocalPublisher:
+    """
+    Stand-in for SNSPublisher, to run the contact form without an AWS account.
+    Messages are logged and kept in memory.
+    """
+
+    def __init__(self):
+        self.published: List[OutboxMessage] = []
+
+    def publish_batch(
+        self, topic_arn: str, messages: List[OutboxMessage]
+    ) -> Dict[int, str]:
+        """Logs the messages, which are never failed"""
+        for message in messages:
+            logger.info(f"Published to {topic_arn}: {message.message}")
+        self.published.extend(messages)
+        return {}
+
+
+class Outbox:
+    """
+    Saves the messages to publish, and publishes the due messages with up to
+    `max_attempts` attempts, waiting `retry_backoff` * 2^(attempts - 1) seconds
+    after each failed attempt.
+    """
+
+    publishers = {"sns": SNSPublisher, "local": LocalPublisher}
+
+    def __init__(self, publisher: str, max_attempts: int, retry_backoff: int):
+        self.publisher = self.publishers[publisher]()
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+    # pylint: disable=no-self-use
+    def send(self, topic_arn: str, message: str) -> OutboxMessage:
+        """
+        Saves a message, to be published by the dispatcher process, so that
+        the request sending it never waits for SNS
+        """
+        return OutboxMessage.objects.create(topic_arn=topic_arn, message=message)
+
+    def dispatch(self, batch_size: int = SNS_BATCH_SIZE) -> int:
+        """
+        Publishes the due messages in batches, and returns the number of
+        messages published. Messages are locked while being published, so that
+        concurrent dispatchers publish each message once.
+        """
+        published = 0
+        while True:
+            with transaction.atomic():
+                messages = list(
+                    OutboxMessage.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        status=OutboxMessage.Status.PENDING,
+                        next_attempt_at__lte=timezone.now(),
+                    )
+                    .order_by("next_attempt_at", "id")[:batch_size]
+                )
+                if not messages:
+                    return published
+                published += self.publish(messages)
+
+    def publish(self, messages: List[OutboxMessage]) -> int:
+        """
+        Publishes messages grouped by topic, records the outcome of each
+        message, and returns the number of messages published.
+        """
+        # Imported here, as the module is imported by the views on startup
+        # pylint: disable=import-outside-toplevel
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        by_topic = defaultdict(list)
+        for message in messages:
+            by_topic[message.topic_arn].append(message)
+
+        errors: Dict[int, str] = {}
+        for topic_arn, topic_messages in by_topic.items():
+            try:
+                errors.update(self.publisher.publish_batch(topic_arn, topic_messages))
+            except (BotoCoreError, ClientError) as sns_err:
+                logger.warning(f"Failed to publish to {topic_arn}: {repr(sns_err)}")
+                errors.update({message.id: repr(sns_err) for message in topic_messages})
+            except Exception as publish_err:  # pylint: disable=broad-except
+                logger.exception(f"Failed to publish to {topic_arn}")
+                errors.update(
+                    {message.id: repr(publish_err) for message in topic_messages}
+                )
+
+        now = timezone.now()
+        for message in messages:
+            message.attempts += 1
+            if message.id not in errors:
+                message.status = OutboxMessage.Status.SENT
+                message.sent_at = now
+                message.last_error = ""
+            elif message.attempts >= self.max_attempts:
+                logger.error(f"Gave up publishing {repr(message)}")
+                message.status = OutboxMessage.Status.FAILED
+                message.last_error = errors[message.id]
+            else:
+                delay = self.retry_backoff * 2 ** (message.attempts - 1)
+                message.next_attempt_at = now + timedelta(
+                    seconds=min(delay, MAX_RETRY_DELAY)
+                )
+                message.last_error = errors[message.id]
+        OutboxMessage.objects.bulk_update(
+            messages,
+            ["status", "attempts", "next_attempt_at", "sent_at", "last_error"],
+        )
+        return len(messages) - len(errors)
+
+
+outbox = Outbox(
+    publisher=settings.OUTBOX_PUBLISHER,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    retry_backoff=settings.OUTBOX_RETRY_BACKOFF,
+)
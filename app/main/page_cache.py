@@ -0,0 +1,116 @@
+"""
+This module defines a cache_page variant which stores pages under a key prefix
+built from the URL slugs, so that the pages affected by a Category or Item
+change can be evicted from Redis (see main.signals) instead of expiring.
+Only the pages of anonymous requests without messages are cached, as the pages
+of logged in users show their username, and messages are displayed once. These
+pages are the same whatever the cookies, so they are cached under their URL and
+group only, rather than once per Cookie header, e.g. per analytics cookie.
+With a read replica, pages are not cached for DB_REPLICA_LAG_WINDOW seconds
+after an eviction, as they may be rendered from rows the replica has not
+caught up with yet.
+"""
+
+from functools import wraps
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import cc_delim_re
+from django.views.decorators.cache import cache_page
+
+from .db_routers import REPLICA_DB
+
+PAGE_CACHE_PREFIX = "pages"
+
+# Page groups, formatted with the URL kwargs. An item page group is nested
+# under its category group, so that evicting a category evicts its items
+CATEGORIES_GROUP = "categories"
+CATEGORY_GROUP = "category:{category_slug}"
+ITEM_GROUP = CATEGORY_GROUP + ":item:{item_slug}"
+# Responses of the rest api, which list the categories and items together
+API_GROUP = "api"
+# Statistics of the rest api, which change when they are refreshed instead
+API_STATS_GROUP = API_GROUP + ":stats"
+# Set for the replication lag window after an eviction, see evict_page_groups
+REPLICA_LAG_KEY = f"{PAGE_CACHE_PREFIX}-replica-lag"
+
+
+def is_cacheable(request: HttpRequest) -> bool:
+    """
+    Returns whether the page of a request can be cached and served from the
+    cache, that is whether it is the same page for all the anonymous clients,
+    and the replica has caught up with the last eviction.
+    Pending messages are counted without being marked as displayed.
+    """
+    if request.user.is_authenticated or messages.get_messages(request):
+        return False
+    return REPLICA_DB not in settings.DATABASES or not cache.get(REPLICA_LAG_KEY)
+
+
+def ignore_cookie_vary(view: Callable) -> Callable:
+    """
+    Decorator removing Cookie from the Vary header of the responses of a view,
+    so that cache_page does not store a copy of the page per Cookie header.
+    The session and CSRF middlewares add it back to the sent response.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response: HttpResponse = view(request, *args, **kwargs)
+        if response.has_header("Vary"):
+            vary_headers = [
+                header
+                for header in cc_delim_re.split(response["Vary"])
+                if header and header.lower() != "cookie"
+            ]
+            if vary_headers:
+                response["Vary"] = ", ".join(vary_headers)
+            else:
+                del response["Vary"]
+        return response
+
+    return wrapper
+
+
+def cache_page_group(group: str) -> Callable:
+    """
+    Decorator caching a view for CACHE_TTL seconds, like cache_page, under
+    the given page group. Requests which are not cacheable, see is_cacheable,
+    are neither served from nor stored in the cache, and cacheable requests
+    are keyed on their URL and group, regardless of their cookies.
+    Usage: cache_page_group(CATEGORY_GROUP)(view)
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable(request):
+                return view(request, *args, **kwargs)
+            key_prefix = f"{PAGE_CACHE_PREFIX}:{group.format(**kwargs)}"
+            cached_view = cache_page(settings.CACHE_TTL, key_prefix=key_prefix)(
+                ignore_cookie_vary(view)
+            )
+            return cached_view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def evict_page_groups(groups: Iterable[str]) -> int:
+    """
+    Deletes the cached pages of the given groups, including the groups nested
+    under them, and returns the number of keys deleted. Groups may contain
+    Redis glob patterns, e.g. "category:*" for all the category pages.
+    """
+    if REPLICA_DB in settings.DATABASES:
+        cache.set(REPLICA_LAG_KEY, True, timeout=settings.DB_REPLICA_LAG_WINDOW)
+    return sum(
+        cache.delete_pattern(
+            f"views.decorators.cache.cache_*.{PAGE_CACHE_PREFIX}:{group}[.:]*"
+        )
+        for group in groups
+    )
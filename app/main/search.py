@@ -0,0 +1,62 @@
+"""
+This module defines the full-text search of the items. Each item stores a
+tsvector of its name, summary and HTML-stripped content, weighted in that order
+and kept up to date on save, which is looked up through a GIN index.
+"""
+
+from html import unescape
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchVector
+from django.db.models import F, Value
+from django.db.models.functions import Replace
+from django.utils.html import strip_tags
+
+# Text search configuration of the items, written in French (see LANGUAGE_CODE)
+SEARCH_CONFIG = "french"
+# Options of the highlighted snippets of the search results, see ts_headline
+HEADLINE_OPTIONS = {
+    "start_sel": "<mark>",
+    "stop_sel": "</mark>",
+    "max_words": 30,
+    "min_words": 15,
+    "max_fragments": 2,
+}
+# Characters of the text escaped before highlighting, see search_headline
+HTML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+
+
+def html_to_text(html: str) -> str:
+    """Returns the text of some HTML content, without its tags and entities"""
+    return unescape(strip_tags(html))
+
+
+def item_search_vector(item_name: str, summary: str, content: str) -> SearchVector:
+    """
+    Returns the expression computing the search vector of an item, to be saved
+    in Item.search_vector. The content is stripped of its HTML beforehand, so
+    that tags, styles and entities are not indexed.
+    """
+    return (
+        SearchVector(Value(item_name), config=SEARCH_CONFIG, weight="A")
+        + SearchVector(Value(summary), config=SEARCH_CONFIG, weight="B")
+        + SearchVector(Value(html_to_text(content)), config=SEARCH_CONFIG, weight="C")
+    )
+
+
+def search_query(text: str) -> SearchQuery:
+    """
+    Returns the query of the text typed in the search box, which supports the
+    web search syntax: "quoted phrases", OR, and -excluded words
+    """
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def search_headline(field: str, query: SearchQuery) -> SearchHeadline:
+    """
+    Returns the expression of the highlighted snippet of a text field, as HTML.
+    The text is escaped beforehand, so that only the <mark> tags are rendered.
+    """
+    text = F(field)
+    for character, entity in HTML_ESCAPES.items():
+        text = Replace(text, Value(character), Value(entity))
+    return SearchHeadline(text, query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS)
@@ -0,0 +1,91 @@
+"""
+This module defines the signal receivers evicting the cached pages affected
+by a Category or Item change, see main.page_cache, the cached template
+fragments, see main.fragment_cache, and the cached users, see main.auth_backends.
+Pages, fragments and users are evicted once the transaction is committed, as
+a request in between would cache them again from the rows before the transaction.
+"""
+
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth_backends import evict_user
+from .fragment_cache import bump_content_version
+from .models import Category, Item
+from .page_cache import (
+    API_GROUP,
+    CATEGORIES_GROUP,
+    CATEGORY_GROUP,
+    evict_page_groups,
+)
+
+
+def _category_groups(category_ids) -> list:
+    """Returns the page groups of the given categories"""
+    return [
+        CATEGORY_GROUP.format(category_slug=category_slug)
+        for category_slug in Category.objects.filter(id__in=category_ids)
+        .values_list("category_slug", flat=True)
+        .distinct()
+    ]
+
+
+# pylint: disable=unused-argument
+@receiver([post_save, post_delete], sender=Category)
+def evict_category_pages(sender, instance: Category, signal, **kwargs) -> None:
+    """
+    A category is displayed on the categories listing and on all its pages,
+    under its current and previous slugs. Deleting a category moves its items
+    to the default category, hence all the category pages are evicted.
+    """
+    if signal is post_delete:
+        groups = [API_GROUP, CATEGORIES_GROUP, CATEGORY_GROUP.format(category_slug="*")]
+    else:
+        previous_slug = instance.loaded_values.get(
+            "category_slug", instance.category_slug
+        )
+        groups = instance.cached_page_groups() + [
+            CATEGORY_GROUP.format(category_slug=previous_slug)
+        ]
+    transaction.on_commit(partial(evict_page_groups, groups))
+
+
+# pylint: disable=unused-argument
+@receiver([post_save, post_delete], sender=Item)
+def evict_item_pages(sender, instance: Item, signal, created=False, **kwargs) -> None:
+    """
+    Editing the content of an item only affects its own page. Adding, renaming,
+    moving or deleting an item also affects the sidebar of the other items of
+    its category, the category redirect to its first item, and the listing.
+    """
+    if not (
+        created
+        or signal is post_delete
+        or instance.has_changed("item_name", "item_slug", "category_name_id")
+    ):
+        groups = instance.cached_page_groups()
+    else:
+        category_ids = {
+            instance.category_name_id,
+            instance.loaded_values.get("category_name_id", instance.category_name_id),
+        }
+        groups = [API_GROUP, CATEGORIES_GROUP] + _category_groups(category_ids)
+    transaction.on_commit(partial(evict_page_groups, groups))
+
+
+# pylint: disable=unused-argument
+@receiver([post_save, post_delete], sender=Category)
+def bump_fragments_version(sender, **kwargs) -> None:
+    """Categories are displayed by the cached category cards fragment"""
+    transaction.on_commit(bump_content_version)
+
+
+# pylint: disable=unused-argument
+@receiver([post_save, post_delete], sender=User)
+def evict_cached_user(sender, instance: User, **kwargs) -> None:
+    """Users are read from the cache by the authenticated requests"""
+    transaction.on_commit(partial(evict_user, instance.pk))
@@ -0,0 +1,171 @@
+"""
+This module defines the static files pipeline run by collectstatic, so that
+static files can be cached by browsers for a year:
+- the stylesheets and scripts of the pages are minified and concatenated into
+  a bundle of each type, see BUNDLES
+- static files are saved under content-hashed names, listed in a manifest
+  which is read to render their URLs (see ManifestFilesMixin)
+- text files collected on the filesystem are precompressed with gzip and
+  brotli, for the web servers serving precompressed files
+"""
+
+import gzip
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestFilesMixin, StaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from jsmin import jsmin
+
+# Files of each bundle, in the order they are included in the pages
+BUNDLES: Dict[str, List[str]] = {
+    "css/site.css": [
+        "tinymce/css/prism.css",
+        "css/materialize.min.css",
+        "css/googleapis.css",
+        "css/style.css",
+    ],
+    "js/site.js": [
+        "js/jquery-2.1.1.min.js",
+        "js/materialize.min.js",
+        "js/init.js",
+        "tinymce/js/prism.js",
+    ],
+}
+# Extensions of the text files which are precompressed
+COMPRESSED_EXTENSIONS = (".css", ".js", ".json", ".svg", ".txt", ".xml")
+# Names of the files saved by ManifestFilesMixin, e.g. css/site.0123456789ab.css
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}(\.[^./]+)?$")
+
+# Comments of the stylesheets, except /*! licence */ comments
+CSS_COMMENT = re.compile(r"/\*(?!!).*?\*/", re.DOTALL)
+CSS_STRING = re.compile(r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'""")
+CSS_WHITESPACES = re.compile(r"\s+")
+CSS_SPACES_AROUND = re.compile(r" ?([{};,>]) ?")
+CSS_SPACES_AFTER = re.compile(r": ")
+
+
+def minify_css(css: str) -> str:
+    """
+    Returns a stylesheet without its comments, and without the whitespaces
+    which are not needed to parse it. Quoted strings are left as is.
+    """
+    css = CSS_COMMENT.sub("", css)
+    minified, position = [], 0
+    for string in [*CSS_STRING.finditer(css), None]:
+        end = string.start() if string else len(css)
+        code = CSS_WHITESPACES.sub(" ", css[position:end])
+        code = CSS_SPACES_AFTER.sub(":", CSS_SPACES_AROUND.sub(r"\1", code))
+        minified.append(code.replace(";}", "}"))
+        if string:
+            minified.append(string.group())
+            position = string.end()
+    return "".join(minified).strip()
+
+
+def minify_js(js: str, name: str) -> str:
+    """Returns a minified script, unless it is minified already"""
+    return js.strip() if name.endswith(".min.js") else jsmin(js).strip()
+
+
+def bundle_content(bundle: str, sources: Iterable[Tuple[str, str]]) -> str:
+    """Returns the minified content of a bundle, from its (name, content) sources"""
+    if bundle.endswith(".css"):
+        return "\n".join(minify_css(content) for _, content in sources)
+    # Sources are separated by ; so that each statement ends within its source
+    return "\n;\n".join(minify_js(content, name) for name, content in sources)
+
+
+class StaticBundlesMixin(ManifestFilesMixin):
+    """
+    Manifest storage mixin saving the bundles before the static files are
+    hashed by collectstatic, so that the bundles are hashed along with them
+    """
+
+    def __init__(self, *args, **kwargs):
+        # The manifest is read on first use rather than on creation, so that
+        # commands which do not render static URLs do not read it from S3
+        # pylint: disable=bad-super-call
+        super(ManifestFilesMixin, self).__init__(*args, **kwargs)
+        self._hashed_files = None
+
+    @property
+    def hashed_files(self) -> Dict[str, str]:
+        """Hashed names of the static files, by name"""
+        if self._hashed_files is None:
+            self._hashed_files = self.load_manifest()
+        return self._hashed_files
+
+    @hashed_files.setter
+    def hashed_files(self, hashed_files: Dict[str, str]) -> None:
+        self._hashed_files = hashed_files
+
+    def stored_name(self, name):
+        # Names are not hashed until the first collectstatic, which needs the
+        # URLs computed by django-tinymce when the apps are loaded
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = {**paths, **self.save_bundles(paths)}
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def save_bundles(
+        self, paths: Dict[str, Tuple[Storage, str]]
+    ) -> Dict[str, Tuple[Storage, str]]:
+        """
+        Saves the bundles from the sources found by collectstatic, and returns
+        the bundles to post process, in the format of the collected paths
+        """
+        bundles = {}
+        for bundle, source_names in BUNDLES.items():
+            sources = []
+            for name in source_names:
+                storage, path = paths[name]
+                with storage.open(path) as source_file:
+                    sources.append((name, source_file.read().decode()))
+            if self.exists(bundle):
+                self.delete(bundle)
+            content = bundle_content(bundle, sources)
+            self._save(bundle, ContentFile(content.encode()))
+            bundles[bundle] = (self, bundle)
+        return bundles
+
+
+class PrecompressedMixin:
+    """
+    Manifest storage mixin saving compressed copies of the hashed text files
+    next to them, e.g. css/site.0123456789ab.css.gz and .br, so that web
+    servers do not compress them on each request (see gzip_static in nginx)
+    """
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if not kwargs.get("dry_run"):
+            for name in set(self.hashed_files.values()):
+                if name.endswith(COMPRESSED_EXTENSIONS):
+                    self.save_compressed(name)
+
+    def save_compressed(self, name: str) -> None:
+        """Saves the gzip and brotli copies of a file, if smaller than the file"""
+        with self.open(name) as original_file:
+            content = original_file.read()
+        compressors = {
+            ".gz": lambda data: gzip.compress(data, mtime=0),
+            ".br": brotli.compress,
+        }
+        for extension, compress in compressors.items():
+            compressed = compress(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(compressed))
+
+
+class ManifestStaticStorage(PrecompressedMixin, StaticBundlesMixin, StaticFilesStorage):
+    """Storage of the static files collected on the filesystem, in production"""
@@ -7,17 +7,51 @@ from storages.backends.s3boto3 import S3Boto3Storage
 
 from app.config import MEDIA_FILES_PATH, STATIC_FILES_PATH
 
+from .aws_clients import get_resource
+from .staticfiles import HASHED_NAME, StaticBundlesMixin
+
+# Hashed static files never change, hence are cached by browsers for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# pylint: disable=abstract-method
+class SharedConnectionS3Storage(S3Boto3Storage):
+    """
+    S3 storage reusing the S3 resource of the current thread, see
+    main.aws_clients, rather than creating a session per storage and thread
+    """
+
+    @property
+    def connection(self):
+        return get_resource(
+            "s3",
+            region_name=self.region_name,
+            endpoint_url=self.endpoint_url,
+            use_ssl=self.use_ssl,
+            config=self.config,
+            verify=self.verify,
+        )
+
 
 # pylint: disable=abstract-method
-class StaticStorage(S3Boto3Storage):
-    """Class used in settings.py to specify the S3 folder storing static files"""
+class StaticStorage(StaticBundlesMixin, SharedConnectionS3Storage):
+    """
+    Class used in settings.py to specify the S3 folder storing static files,
+    which are bundled and saved under hashed names by collectstatic
+    """
 
     location = STATIC_FILES_PATH
     default_acl = "public-read"
 
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        if HASHED_NAME.search(name):
+            params["CacheControl"] = IMMUTABLE_CACHE_CONTROL
+        return params
+
 
 # pylint: disable=abstract-method
-class PublicMediaStorage(S3Boto3Storage):
+class PublicMediaStorage(SharedConnectionS3Storage):
     """Class used in settings.py to specify the S3 folder storing media files"""
 
     location = MEDIA_FILES_PATH
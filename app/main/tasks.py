@@ -0,0 +1,143 @@
+"""
+This module defines a minimal background task queue backed by a Redis list,
+to run slow work outside of the request/response cycle, and the tasks
+executed by the worker (python manage.py run_task_worker).
+When TASK_QUEUE_ENABLED is False, tasks run inline once the transaction commits,
+except the tasks registered with inline=False, which are always queued.
+"""
+
+import json
+import logging
+from typing import Callable, Dict, List, Set
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+TASK_QUEUE_KEY = "main:tasks"
+# Tasks being executed by a worker, see run_worker
+PROCESSING_KEY = "main:tasks:processing:{worker}"
+
+_registry: Dict[str, Callable] = {}
+# Tasks which are only executed by the worker, see task()
+_worker_only: Set[str] = set()
+
+
+def task(func: Callable = None, *, inline: bool = True) -> Callable:
+    """
+    Decorator registering a function as a task the worker can execute. Tasks
+    registered with inline=False are queued even when TASK_QUEUE_ENABLED is
+    False, so that they never run within a request.
+    Usage: @task or @task(inline=False)
+    """
+
+    def register(func: Callable) -> Callable:
+        _registry[func.__name__] = func
+        if not inline:
+            _worker_only.add(func.__name__)
+        return func
+
+    return register(func) if func else register
+
+
+def enqueue(task_name: str, **kwargs) -> None:
+    """
+    Queues a task with JSON serializable keyword arguments. The task is only
+    pushed once the current transaction is committed, so that the worker
+    always sees the saved objects.
+    """
+
+    def push():
+        if not settings.TASK_QUEUE_ENABLED and task_name not in _worker_only:
+            run_task(task_name, kwargs)
+            return
+        get_redis_connection("default").rpush(
+            TASK_QUEUE_KEY, json.dumps({"task": task_name, "kwargs": kwargs})
+        )
+
+    transaction.on_commit(push)
+
+
+def run_task(task_name: str, kwargs: Dict) -> None:
+    """Executes a registered task, logging any failure"""
+    try:
+        _registry[task_name](**kwargs)
+    except Exception as task_err:  # pylint: disable=broad-except
+        logger.exception(f"Task {task_name}({kwargs}) failed: {repr(task_err)}")
+
+
+def run_worker(burst: bool = False, timeout: int = 5) -> int:
+    """
+    Executes tasks from the queue, forever or until the queue is empty when
+    `burst` is True. Returns the number of tasks executed. Tasks are moved to
+    the processing list of the worker while they run, so that the tasks
+    interrupted by a crash or a restart are queued again when it starts.
+    """
+    connection = get_redis_connection("default")
+    processing_key = PROCESSING_KEY.format(worker=settings.TASK_WORKER_NAME)
+    while connection.lmove(processing_key, TASK_QUEUE_KEY, "RIGHT", "LEFT"):
+        logger.warning(f"Queued a task interrupted in {processing_key} again")
+    executed_tasks = 0
+    while True:
+        if not (
+            message := connection.blmove(
+                TASK_QUEUE_KEY, processing_key, timeout, "LEFT", "RIGHT"
+            )
+        ):
+            if burst:
+                return executed_tasks
+            continue
+        task_message = json.loads(message)
+        run_task(task_message["task"], task_message["kwargs"])
+        connection.lrem(processing_key, 1, message)
+        # Connections broken during the task are reopened by the next one
+        close_old_connections()
+        executed_tasks += 1
+
+
+def _get_instance(model: str, pk: int):
+    """Returns a Category or Item object, or None if it was deleted since"""
+    model_class = apps.get_model(model)
+    try:
+        return model_class.objects.get(pk=pk)
+    except model_class.DoesNotExist:
+        logger.warning(f"{model} {pk} was deleted before the task was executed")
+        return None
+
+
+@task
+def generate_image_derivatives(model: str, pk: int) -> None:
+    """Generates the resized images of a Category or Item object"""
+    if instance := _get_instance(model, pk):
+        instance.apply_image_derivatives()
+        instance.refresh_from_db()
+        instance.generate_image_variants()
+
+
+@task
+def generate_image_variants(model: str, pk: int) -> None:
+    """Generates the responsive image variants of a Category or Item object"""
+    if instance := _get_instance(model, pk):
+        instance.generate_image_variants()
+
+
+@task(inline=False)
+def notify_registered_users(pk: int) -> None:
+    """Notifies the registered users of a new Item object via AWS SES"""
+    # pylint: disable=import-outside-toplevel
+    from .notifications import notify_registered_users as notify_users
+
+    if item := _get_instance("main.item", pk):
+        notify_users(item)
+
+
+@task(inline=False)
+def retry_notifications(chunk_ids: List[int] = None) -> None:
+    """Sends the notification chunks which failed or were left pending again"""
+    # pylint: disable=import-outside-toplevel
+    from .notifications import retry_failed_chunks
+
+    retry_failed_chunks(chunk_ids)
@@ -0,0 +1,55 @@
+"""This module defines template tags to render responsive images"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from django import template
+from django.db.models import Model
+
+from helpers.constants import IMAGE_VARIANT_QUALITY
+
+register = template.Library()
+
+
+def _srcset(variants: List) -> str:
+    """Returns the srcset attribute value of a list of variants"""
+    return ", ".join(f"{variant.image.url} {variant.width}w" for variant in variants)
+
+
+@register.inclusion_tag("main/includes/picture.html")
+def picture(
+    obj: Model, sizes: str = "100vw", css_class: str = "", loading: str = "lazy"
+) -> Dict:
+    """
+    Renders the image of a Category or Item object as a <picture> element,
+    so that browsers download the smallest variant in the best supported format.
+    Falls back to the original image while the variants are being generated.
+    Usage: {% picture item sizes="(min-width: 993px) 75vw, 100vw" %}
+    """
+    variants_by_format = defaultdict(list)
+    for variant in sorted(obj.variants.all(), key=lambda variant: variant.width):
+        variants_by_format[variant.format].append(variant)
+
+    fallback_variants = variants_by_format.pop("jpeg", [])
+    sources = [
+        {"type": f"image/{image_format}", "srcset": _srcset(variants)}
+        for image_format in IMAGE_VARIANT_QUALITY
+        if (variants := variants_by_format.get(image_format))
+    ]
+    context = {
+        "alt": str(obj),
+        "css_class": css_class,
+        "loading": loading,
+        "sizes": sizes,
+        "sources": sources,
+        "src": obj.image.url,
+    }
+    if fallback_variants:
+        largest = fallback_variants[-1]
+        context.update(
+            src=largest.image.url,
+            srcset=_srcset(fallback_variants),
+            width=largest.width,
+            height=largest.height,
+        )
+    return context
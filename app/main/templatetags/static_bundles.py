@@ -0,0 +1,33 @@
+"""This module defines template tags to include the bundled static files"""
+
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+from django.utils.safestring import SafeString
+
+from main.staticfiles import BUNDLES, StaticBundlesMixin
+
+register = template.Library()
+
+TAG_FORMATS = {
+    ".css": '<link href="{}" rel="stylesheet">',
+    # Deferred scripts run in order once the page is parsed, without blocking it
+    ".js": '<script src="{}" defer></script>',
+}
+
+
+@register.simple_tag
+def static_bundle(bundle: str) -> SafeString:
+    """
+    Renders the tags including a bundle of stylesheets or scripts, see BUNDLES.
+    Bundles are built by collectstatic, hence the files of a bundle are
+    included one by one when served from their source folders, in development.
+    Usage: {% static_bundle "js/site.js" %}
+    """
+    if isinstance(staticfiles_storage, StaticBundlesMixin):
+        names = [bundle]
+    else:
+        names = BUNDLES[bundle]
+    tag_format = TAG_FORMATS[bundle[bundle.rindex(".") :]]
+    return format_html_join("\n", tag_format, ((static(name),) for name in names))
@@ -0,0 +1,144 @@
+"""
+This module defines a buffered counter for item page views, so that page hits
+are recorded without any image processing or row write on the request path.
+Pending increments are periodically flushed to the database in bulk, by the
+flush_item_views command for the "redis" backend, or by a thread of each worker
+process for the "memory" backend.
+"""
+
+import logging
+import uuid
+from collections import Counter
+from threading import Event, Lock, Thread
+from typing import Dict
+
+from django.conf import settings
+from django.db import DatabaseError
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from .models import Item
+
+logger = logging.getLogger(__name__)
+
+
+class RedisViewBuffer:
+    """Buffers view increments in a Redis hash shared by all the workers"""
+
+    key = "main:item_views:pending"
+    flush_lock_key = "main:item_views:flush_lock"
+
+    def incr(self, item_id: int, amount: int = 1) -> None:
+        """Adds views to the pending count of a given item"""
+        get_redis_connection("default").hincrby(self.key, item_id, amount)
+
+    def drain(self) -> Dict[int, int]:
+        """Atomically pops and returns all the pending view counts"""
+        connection = get_redis_connection("default")
+        draining_key = f"{self.key}:{uuid.uuid4().hex}"
+        try:
+            connection.rename(self.key, draining_key)
+        except ResponseError:
+            # Nothing to drain, the pending views hash does not exist
+            return {}
+        pipeline = connection.pipeline()
+        pipeline.hgetall(draining_key)
+        pipeline.delete(draining_key)
+        pending, _ = pipeline.execute()
+        return {int(item_id): int(views) for item_id, views in pending.items()}
+
+    def acquire_flush(self, interval: int) -> bool:
+        """Elects a single worker to flush the buffer over a given interval"""
+        return bool(
+            get_redis_connection("default").set(
+                self.flush_lock_key, 1, nx=True, ex=max(interval, 1)
+            )
+        )
+
+
+class InMemoryViewBuffer:
+    """Buffers view increments in the memory of the current process"""
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = Lock()
+
+    def incr(self, item_id: int, amount: int = 1) -> None:
+        """Adds views to the pending count of a given item"""
+        with self._lock:
+            self._pending[item_id] += amount
+
+    def drain(self) -> Dict[int, int]:
+        """Pops and returns all the pending view counts"""
+        with self._lock:
+            pending, self._pending = dict(self._pending), Counter()
+        return pending
+
+    # pylint: disable=no-self-use,unused-argument
+    def acquire_flush(self, interval: int) -> bool:
+        """Each process owns its buffer, so it is always allowed to flush it"""
+        return True
+
+
+class ViewCounter:
+    """
+    Records item views into a buffer, which is written to the database with
+    a single bulk UPDATE statement every `flush_interval` seconds, outside of
+    the request path.
+    """
+
+    backends = {"redis": RedisViewBuffer, "memory": InMemoryViewBuffer}
+
+    def __init__(self, backend: str, flush_interval: int):
+        self.buffer = self.backends[backend]()
+        self.flush_interval = flush_interval
+        self._stop_flusher = Event()
+
+    def record(self, item_id: int, amount: int = 1) -> None:
+        """Records views for a given item, without writing to the database"""
+        self.buffer.incr(item_id, amount)
+
+    def start_flusher(self) -> Thread:
+        """
+        Starts a daemon thread flushing the buffer every flush interval, for
+        the buffers held in the memory of the current process.
+        """
+        self._stop_flusher.clear()
+        flusher = Thread(target=self._run_flusher, name="view-flusher", daemon=True)
+        flusher.start()
+        return flusher
+
+    def stop_flusher(self) -> None:
+        """Stops the flusher thread, and flushes the views left in the buffer"""
+        self._stop_flusher.set()
+        self.flush()
+
+    def _run_flusher(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval):
+            try:
+                self.flush()
+            except DatabaseError as db_err:
+                logger.error(f"Failed to flush item views: {repr(db_err)}")
+
+    def flush(self) -> int:
+        """
+        Writes all the buffered views to the database and returns the number of
+        views flushed. Views are put back in the buffer if the update fails.
+        """
+        if not (pending := self.buffer.drain()):
+            return 0
+        try:
+            Item.add_views(pending)
+        except DatabaseError:
+            for item_id, views in pending.items():
+                self.buffer.incr(item_id, views)
+            raise
+        flushed_views = sum(pending.values())
+        logger.info(f"Flushed {flushed_views} views for {len(pending)} items")
+        return flushed_views
+
+
+view_counter = ViewCounter(
+    backend=settings.VIEW_COUNT_BACKEND,
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL,
+)
@@ -4,25 +4,30 @@ import json
 import logging
 from typing import Union
 
-import boto3
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.forms import AuthenticationForm
+from django.contrib.postgres.search import SearchRank
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views import View, generic
 
-from app.config import AWS_REGION, SES_IDENTITY_ARN
+from app.config import SES_IDENTITY_ARN
 from helpers import strings
-from helpers.constants import TemplateNames
+from helpers.constants import ITEM_ID_HEADER, TemplateNames
 
+from .aws_clients import call_client
 from .forms import ContactForm, NewUserForm
-from .mixins import RequireLoginMixin
+from .mixins import AsyncViewMixin, ReplicaReadMixin, RequireLoginMixin
 from .models import Category, Item
+from .outbox import outbox
+from .search import search_headline, search_query
 
 logger = logging.getLogger(__name__)
-ses_client = boto3.client("ses", region_name=AWS_REGION)
 
 
 class IndexView(generic.base.TemplateView):
@@ -34,7 +39,7 @@ class IndexView(generic.base.TemplateView):
         return render(request, self.template_name)
 
 
-class SignUpFormView(View):
+class SignUpFormView(AsyncViewMixin, View):
     """View for users to sign up an account, /register"""
 
     form_class = NewUserForm
@@ -42,37 +47,48 @@ class SignUpFormView(View):
     template_name = TemplateNames.REGISTER.value
 
     # pylint: disable=unused-argument
-    def get(self, request, *args, **kwargs) -> render:
+    async def get(self, request, *args, **kwargs) -> render:
         """Logic for GET method. Renders the signup form template"""
         form = self.form_class(initial=self.initial)
-        return render(request, self.template_name, {"form": form})
+        return await sync_to_async(render)(request, self.template_name, {"form": form})
 
     # pylint: disable=unused-argument
-    def post(self, request, *args, **kwargs) -> Union[render, redirect]:
+    async def post(self, request, *args, **kwargs) -> Union[render, redirect]:
         """Logic for POST method. Attempts to register and log in user"""
         form = self.form_class(request.POST)
-        if form.is_valid():
-            user = form.save()
-            username = form.cleaned_data.get("username")
-            signup_message = strings.SIGNUP_MSG.format(account_name=username)
-            messages.success(request, signup_message)
-            logger.info(signup_message)
-            login(request, user)
-            if SES_IDENTITY_ARN:
-                # Send email to verify the new SES identity
-                try:
-                    response = ses_client.verify_email_identity(
-                        EmailAddress=form.cleaned_data.get("email")
-                    )
-                    logger.info(f"SES verify_email_identity call response: {response}")
-                except Exception as ses_err:
-                    logger.error(
-                        f"Failed to run SES verify_email_identity: {repr(ses_err)}"
-                    )
-            return redirect("/")
-        for msg in form.error_messages:
-            messages.error(request, f"{msg}: {form.error_messages[msg]}")
-        return render(request, self.template_name, {"form": form})
+        if not await sync_to_async(self.register_user)(request, form):
+            for msg in form.error_messages:
+                messages.error(request, f"{msg}: {form.error_messages[msg]}")
+            return await sync_to_async(render)(
+                request, self.template_name, {"form": form}
+            )
+        if SES_IDENTITY_ARN:
+            # Send email to verify the new SES identity
+            try:
+                response = await call_client(
+                    "ses",
+                    "verify_email_identity",
+                    EmailAddress=form.cleaned_data.get("email"),
+                )
+                logger.info(f"SES verify_email_identity call response: {response}")
+            except Exception as ses_err:
+                logger.error(
+                    f"Failed to run SES verify_email_identity: {repr(ses_err)}"
+                )
+        return redirect("/")
+
+    # pylint: disable=no-self-use
+    def register_user(self, request, form: NewUserForm) -> bool:
+        """Saves and logs in the new user, returns False if the form is invalid"""
+        if not form.is_valid():
+            return False
+        user = form.save()
+        username = form.cleaned_data.get("username")
+        signup_message = strings.SIGNUP_MSG.format(account_name=username)
+        messages.success(request, signup_message)
+        logger.info(signup_message)
+        login(request, user)
+        return True
 
 
 def logout_request(request) -> redirect:
@@ -121,7 +137,7 @@ class LoginFormView(View):
 
 
 # pylint: disable=too-many-ancestors
-class CategoriesView(generic.ListView):
+class CategoriesView(ReplicaReadMixin, generic.ListView):
     """View to display category cards"""
 
     template_name = TemplateNames.CATEGORIES.value
@@ -129,12 +145,12 @@ class CategoriesView(generic.ListView):
     model = Category
 
     def get_queryset(self):
-        if categories := self.model.objects.all():
+        if categories := self.model.objects.prefetch_related("variants"):
             return categories.order_by("category_name")
         raise Http404(strings.MSG_404)
 
 
-class RedirectToItemView(generic.base.RedirectView):
+class RedirectToItemView(ReplicaReadMixin, generic.base.RedirectView):
     """
     View to redirect the user to the first item of a category when the
     category card is clicked on <category_slug>/ -> <category_slug>/<first-item-slug>
@@ -147,35 +163,54 @@ class RedirectToItemView(generic.base.RedirectView):
         category = get_object_or_404(
             Category, category_slug=self.kwargs["category_slug"]
         )
-        first_item = (
-            Item.objects.filter(category_name=category).order_by("item_name").first()
-        )
+        first_item = self.get_items_queryset(category).first()
         return f"/items/{category.category_slug}/{first_item.item_slug}/"
 
+    # pylint: disable=no-self-use
+    def get_items_queryset(self, category: Category):
+        """Returns the items of a category, in the order of the sidebar"""
+        return Item.objects.cards().filter(category_name=category).order_by("item_name")
+
 
-class ItemsView(generic.ListView):
+class ItemsView(ReplicaReadMixin, generic.DetailView):
     """View for items, /<category_slug>/<item_slug>/"""
 
     template_name = TemplateNames.ITEMS.value
-    category = None
-    item = None
-    ordered_items_in_category = None
+    context_object_name = "item"
+    slug_field = "item_slug"
+    slug_url_kwarg = "item_slug"
 
     def get_queryset(self):
         """
-        Validates and retrieves the category and item objects
-        according to the given <category_slug> and <item_slug>
+        Returns the items of the given <category_slug>, fetched along with their
+        category and their position in the category sidebar, so that the item
+        page is retrieved with a single query. Only the rendered version of the
+        content is displayed, hence loaded.
         """
-        self.category = get_object_or_404(
-            Category, category_slug=self.kwargs["category_slug"]
+        items_before = (
+            Item.objects.filter(
+                category_name=OuterRef("category_name"),
+                item_name__lt=OuterRef("item_name"),
+            )
+            .order_by()
+            .values("category_name")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return (
+            Item.objects.select_related("category_name")
+            .defer("content")
+            .filter(category_name__category_slug=self.kwargs["category_slug"])
+            .annotate(sidebar_idx=Coalesce(Subquery(items_before), 0))
         )
-        self.item = get_object_or_404(Item, item_slug=self.kwargs["item_slug"])
-
-        self.ordered_items_in_category = Item.objects.filter(
-            category_name=self.category
-        ).order_by("item_name")
 
-        return Item.objects.get(pk=self.item.id)
+    def get_sidebar_queryset(self):
+        """Returns the names and slugs of the items of the current category"""
+        return (
+            Item.objects.filter(category_name_id=self.object.category_name_id)
+            .order_by("item_name")
+            .values("item_name", "item_slug")
+        )
 
     def get_context_data(self, **kwargs):
         """
@@ -183,22 +218,63 @@ class ItemsView(generic.ListView):
         and loads additional values to be rendered
         """
         context = super().get_context_data(**kwargs)
-        context["item"] = self.item
-        context["category"] = self.category
-        context["sidebar"] = self.ordered_items_in_category
-        context["this_item_idx"] = list(self.ordered_items_in_category).index(self.item)
+        context["category"] = self.object.category_name
+        context["sidebar"] = self.get_sidebar_queryset()
+        context["this_item_idx"] = self.object.sidebar_idx
         return context
 
-    def dispatch(self, *args, **kwargs):
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Tags the response with the item id, so that the ItemViewCountMiddleware
+        counts the page view, including when the page is served from cache.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+        response[ITEM_ID_HEADER] = self.object.id
+        return response
+
+
+# pylint: disable=too-many-ancestors
+class SearchView(ReplicaReadMixin, generic.ListView):
+    """View for the full-text search of the items, /search/?q=<text>"""
+
+    template_name = TemplateNames.SEARCH.value
+    context_object_name = "results"
+    paginate_by = 10
+
+    def get_queryset(self):
         """
-        Overrides the dispatch method, to increment the views field
-        before returning the HTTP response.
+        Returns the items matching the searched text, best matches first, along
+        with a highlighted snippet of their summary. Items are matched through
+        the GIN index of their search vector, and snippets are only computed
+        for the items of the requested page.
         """
-        self.get_queryset().increment_views()
-        return super().dispatch(*args, **kwargs)
+        if not (text := self.request.GET.get("q", "").strip()):
+            return Item.objects.none()
+        query = search_query(text)
+        return (
+            Item.objects.select_related("category_name")
+            .only(
+                "item_name",
+                "item_slug",
+                "category_name__category_name",
+                "category_name__category_slug",
+            )
+            .filter(search_vector=query)
+            .annotate(
+                rank=SearchRank(F("search_vector"), query),
+                headline=search_headline("summary", query),
+            )
+            .order_by("-rank", "item_name")
+        )
+
+    def get_context_data(self, **kwargs):
+        """Adds the searched text, to be displayed in the search box"""
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.request.GET.get("q", "").strip()
+        return context
 
 
-class ContactUsFormView(RequireLoginMixin, View):
+class ContactUsFormView(AsyncViewMixin, RequireLoginMixin, View):
     """View for users to send messages via the Contact Us form"""
 
     form_class = ContactForm
@@ -206,35 +282,38 @@ class ContactUsFormView(RequireLoginMixin, View):
     template_name = TemplateNames.CONTACT_US.value
 
     # pylint: disable=unused-argument
-    def get(self, request, *args, **kwargs) -> render:
+    async def get(self, request, *args, **kwargs) -> render:
         """Logic for GET method"""
         form = self.form_class(initial=self.initial)
-        return render(request, self.template_name, {"form": form})
+        return await sync_to_async(render)(request, self.template_name, {"form": form})
 
     # pylint: disable=unused-argument
-    def post(self, request, *args, **kwargs) -> Union[render, redirect]:
+    async def post(self, request, *args, **kwargs) -> Union[render, redirect]:
         """HTTP POST method to send an email if the form is valid."""
         form = self.form_class(request.POST)
 
         if not form.is_valid():
             logger.warning(strings.INVALID_FORM)
             messages.error(request, strings.INVALID_FORM)
-            return render(request, self.template_name, {"form": form})
+            return await sync_to_async(render)(
+                request, self.template_name, {"form": form}
+            )
 
         if not settings.SNS_TOPIC_ARN:
             logger.warning(strings.SNS_TOPIC_NOT_CONFIGURED)
             messages.warning(request, strings.SNS_TOPIC_NOT_CONFIGURED_USER_FRIENDLY)
-            return render(request, self.template_name, {"form": form})
-
-        sns_client = boto3.client("sns", region_name=AWS_REGION)
-        response = sns_client.publish(
-            TargetArn=settings.SNS_TOPIC_ARN,
-            Message=json.dumps({"default": form.cleaned_data}),
+            return await sync_to_async(render)(
+                request, self.template_name, {"form": form}
+            )
+
+        # Published to SNS by the outbox dispatcher, off the request path
+        message = await sync_to_async(outbox.send)(
+            topic_arn=settings.SNS_TOPIC_ARN,
+            message=json.dumps({"default": form.cleaned_data}),
         )
-        sns_response = strings.SNS_SERVICE_RESPONSE.format(response=response)
-        logger.info(sns_response)
+        logger.info(strings.SNS_MESSAGE_QUEUED.format(message=repr(message)))
 
-        return render(
+        return await sync_to_async(render)(
             request,
             TemplateNames.GO_BACK_HOME.value,
             {"message": strings.CONTACTUS_FORM},
@@ -0,0 +1,18 @@
+"""
+ASGI config for portfolio project which is used when starting a production
+server with gunicorn and uvicorn workers (GUNICORN_WORKER_CLASS=uvicorn).
+Async views then await their external calls without holding a worker thread.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings")
+
+application = get_asgi_application()
@@ -0,0 +1,92 @@
+"""
+Gunicorn configuration, driven by the GUNICORN_* environment variables
+(see app/config.py).
+Usage: gunicorn -c portfolio/gunicorn_conf.py portfolio.wsgi:application
+or, with GUNICORN_WORKER_CLASS=uvicorn:
+gunicorn -c portfolio/gunicorn_conf.py portfolio.asgi:application
+"""
+
+import multiprocessing
+
+from app import config
+
+
+def default_workers(worker_class: str) -> int:
+    """
+    Returns the number of workers for the CPUs of the server. Sync workers
+    serve a request at a time, so more of them are needed to cover the time
+    spent waiting on the database and AWS, than threaded or async workers.
+    """
+    cpus = multiprocessing.cpu_count()
+    return 2 * cpus + 1 if worker_class == "sync" else cpus + 1
+
+
+# Worker classes selectable with GUNICORN_WORKER_CLASS
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+bind = "0.0.0.0:8080"
+worker_class = WORKER_CLASSES[config.GUNICORN_WORKER_CLASS]
+workers = config.GUNICORN_WORKERS or default_workers(config.GUNICORN_WORKER_CLASS)
+threads = config.GUNICORN_THREADS if worker_class == "gthread" else 1
+keepalive = config.GUNICORN_KEEPALIVE
+timeout = config.GUNICORN_TIMEOUT
+
+# Load the application once in the master process, so that workers share its
+# memory pages and start faster
+preload_app = config.GUNICORN_PRELOAD
+
+# Restart workers after a number of requests, jittered so that they do not
+# all restart at once
+max_requests = config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = config.GUNICORN_MAX_REQUESTS_JITTER
+
+
+# pylint: disable=unused-argument
+def pre_fork(server, worker) -> None:
+    """
+    Closes the database connections opened by the master process when the
+    application is preloaded, so that no socket is shared with the workers.
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.db import connections
+
+    from main.db_backends.postgresql.base import close_pools
+
+    connections.close_all()
+    close_pools()
+
+
+# pylint: disable=unused-argument
+def post_fork(server, worker) -> None:
+    """
+    Each worker creates its own AWS clients, rather than the master's ones, and
+    flushes the item views buffered in its memory from a background thread.
+    """
+    # pylint: disable=import-outside-toplevel
+    from main.aws_clients import reset_clients
+
+    reset_clients()
+    if config.VIEW_COUNT_BACKEND == "memory":
+        from main.view_counter import view_counter
+
+        view_counter.start_flusher()
+
+
+# pylint: disable=unused-argument
+def worker_exit(server, worker) -> None:
+    """Flushes the item views left in the memory of the exiting worker"""
+    if config.VIEW_COUNT_BACKEND != "memory":
+        return
+    # pylint: disable=import-outside-toplevel
+    from django.db import DatabaseError
+
+    from main.view_counter import view_counter
+
+    try:
+        view_counter.stop_flusher()
+    except DatabaseError as db_err:
+        worker.log.error(f"Failed to flush item views: {repr(db_err)}")
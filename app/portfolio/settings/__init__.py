@@ -7,53 +7,121 @@ from .base import *
 
 
 DEBUG = config.DEBUG
-print(f"Loading Django settings (DEBUG={DEBUG})")
+
+
+def print_config(message: str) -> None:
+    """Prints the configuration in development, to keep workers boot quiet"""
+    if DEBUG:
+        print(message)
+
+
+print_config(f"Loading Django settings (DEBUG={DEBUG})")
+
+# The debug toolbar is only loaded in development
+if DEBUG:
+    INSTALLED_APPS += ["debug_toolbar"]
+    MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
 
 ENABLE_LOGIN_REQUIRED_MIXIN = False
 
 # Forward ContactForm emails to AWS SNS Topic
 SNS_TOPIC_ARN = config.SNS_TOPIC_ARN
+OUTBOX_PUBLISHER = config.OUTBOX_PUBLISHER
+OUTBOX_MAX_ATTEMPTS = config.OUTBOX_MAX_ATTEMPTS
+OUTBOX_RETRY_BACKOFF = config.OUTBOX_RETRY_BACKOFF
 
 # DATABASE
-print(f"DB backend config: Host={config.POSTGRES_HOST}")
+print_config(f"DB backend config: Host={config.POSTGRES_HOST}")
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "main.db_backends.postgresql",
         "NAME": config.POSTGRES_DB,
         "USER": config.POSTGRES_USER,
         "PASSWORD": config.POSTGRES_PASSWORD,
         "HOST": config.POSTGRES_HOST,
         "PORT": config.POSTGRES_PORT,
+        "CONN_MAX_AGE": 0 if config.DB_POOL_SIZE else config.DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": config.DB_CONN_HEALTH_CHECKS,
+        "POOL_SIZE": config.DB_POOL_SIZE,
+        "POOL_TIMEOUT": config.DB_POOL_TIMEOUT,
     }
 }
+if config.POSTGRES_REPLICA_HOST:
+    print_config(f"DB replica config: Host={config.POSTGRES_REPLICA_HOST}")
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": config.POSTGRES_REPLICA_HOST,
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["main.db_routers.ReplicaRouter"]
+DB_REPLICA_LAG_WINDOW = config.DB_REPLICA_LAG_WINDOW
 
 # CACHE
 # https://testdriven.io/blog/django-caching/
 CACHE_TTL = config.CACHE_TTL
-print(f"Redis Cache config: Endpoint={config.REDIS_ENDPOINT}, TTL={CACHE_TTL}s")
+print_config(f"Redis Cache config: Endpoint={config.REDIS_ENDPOINT}, TTL={CACHE_TTL}s")
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": f"redis://{config.REDIS_ENDPOINT}",
         "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
-    }
+    },
+    # Rendered template fragments, see main.fragment_cache
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "fragments",
+    },
 }
+FRAGMENT_CACHE_TTL = config.FRAGMENT_CACHE_TTL
+
+# SESSIONS AND AUTHENTICATION
+SESSION_ENGINE = f"django.contrib.sessions.backends.{config.SESSION_BACKEND}"
+SESSION_CACHE_ALIAS = "default"
+AUTHENTICATION_BACKENDS = ["main.auth_backends.CachedModelBackend"]
+USER_CACHE_TTL = config.USER_CACHE_TTL
+
+# ITEM VIEWS COUNTER
+VIEW_COUNT_BACKEND = config.VIEW_COUNT_BACKEND
+VIEW_COUNT_FLUSH_INTERVAL = config.VIEW_COUNT_FLUSH_INTERVAL
+
+# BACKGROUND TASKS
+TASK_QUEUE_ENABLED = config.TASK_QUEUE_ENABLED
+TASK_WORKER_NAME = config.TASK_WORKER_NAME
+
+# ITEM NOTIFICATIONS
+NOTIFICATION_WORKERS = config.NOTIFICATION_WORKERS
+SES_MAX_SEND_RATE = config.SES_MAX_SEND_RATE
+NOTIFICATION_MAX_ATTEMPTS = config.NOTIFICATION_MAX_ATTEMPTS
+NOTIFICATION_RETRY_INTERVAL = config.NOTIFICATION_RETRY_INTERVAL
+NOTIFICATION_PENDING_TIMEOUT = config.NOTIFICATION_PENDING_TIMEOUT
+
+# CATEGORY STATISTICS
+CATEGORY_STATS_REFRESH_INTERVAL = config.CATEGORY_STATS_REFRESH_INTERVAL
+
+# RESPONSIVE IMAGES
+IMAGE_VARIANT_WIDTHS = config.IMAGE_VARIANT_WIDTHS
+IMAGE_VARIANT_FORMATS = config.IMAGE_VARIANT_FORMATS
 
 # FILE STORAGE - s3 static settings & s3 public media settings
 if not config.STATICFILES_BUCKET:
-    print("Using local filesystem to serve static files")
+    print_config("Using local filesystem to serve static files")
     STATIC_URL = config.STATIC_FILES_PATH
     STATIC_ROOT = os.path.join(BASE_DIR, STATIC_URL)
     MEDIA_URL = config.MEDIA_FILES_PATH
     MEDIA_ROOT = os.path.join(BASE_DIR, MEDIA_URL)
     STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
+    # Static files are served from their source folders in development, and
+    # bundled and hashed by collectstatic otherwise
+    if not DEBUG:
+        STATICFILES_STORAGE = "main.staticfiles.ManifestStaticStorage"
 else:
-    print(f"Using S3 Bucket {config.STATICFILES_BUCKET} to serve static files")
+    print_config(f"Using S3 Bucket {config.STATICFILES_BUCKET} to serve static files")
     # Extra variables for AWS
     AWS_STORAGE_BUCKET_NAME = config.STATICFILES_BUCKET
     AWS_S3_CUSTOM_DOMAIN = config.AWS_S3_CUSTOM_DOMAIN
     AWS_DEFAULT_REGION = config.AWS_REGION
     AWS_DEFAULT_ACL = None
+    # Hashed static files are cached for a year instead, see StaticStorage
     AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "max-age=86400"}
     # Django variables
     STATIC_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/{config.STATIC_FILES_PATH}/"
@@ -70,10 +70,10 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "main",
     "tinymce",
     "materializecssform",
-    "debug_toolbar",
     "rest_framework",
     "django_filters",
 ]
@@ -87,7 +87,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "main.middleware.ItemViewCountMiddleware",
+    "main.middleware.ReplicaPinningMiddleware",
 ]
 
 ROOT_URLCONF = "portfolio.urls"
@@ -104,6 +105,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "main.context_processors.fragment_cache",
             ],
         },
     },
@@ -150,14 +152,12 @@ MEDIA_ROOT = None
 STATICFILES_DIRS = None
 
 
-# Write logging from the django logger to a local file
+# Write logging from the django logger to a local file, which is created by the
+# logging handler with the first record
 APP_DIR = Path(__file__).resolve().parent.parent.parent
 LOG_DIR_PATH = APP_DIR / "logs"
 LOG_DIR_PATH.mkdir(parents=True, exist_ok=True)
 LOG_INFO_FILE_PATH = LOG_DIR_PATH / "info.log"
-if not LOG_INFO_FILE_PATH.is_file():
-    with open(LOG_INFO_FILE_PATH, "w", encoding="utf-8") as f:
-        f.write("\n")
 
 LOGGING = {
     "version": 1,
@@ -171,6 +171,7 @@ LOGGING = {
             "class": "logging.FileHandler",
             "filename": LOG_INFO_FILE_PATH,
             "formatter": "standard",
+            "delay": True,
         },
     },
     "loggers": {"": {"handlers": ["file"], "level": "INFO", "propagate": True},},
@@ -0,0 +1,41 @@
+"""
+Production settings, selected with
+DJANGO_SETTINGS_MODULE=portfolio.settings.production.
+Debug apps and middlewares are never loaded, whatever the DEBUG environment
+variable.
+"""
+
+import copy
+
+from . import *
+
+DEBUG = False
+
+# Apps and middlewares only used in development
+DEBUG_APPS = ["debug_toolbar"]
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEBUG_APPS]
+
+DEBUG_MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+MIDDLEWARE = [m for m in MIDDLEWARE if m not in DEBUG_MIDDLEWARE]
+
+# Templates are compiled once per worker, and kept in memory
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    )
+]
+TEMPLATES[0]["OPTIONS"]["context_processors"].remove(
+    "django.template.context_processors.debug"
+)
+
+# The browsable API is a debugging tool
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
@@ -1,24 +1,29 @@
 """portfolio URL Configuration"""
 
-import debug_toolbar
 from django.conf import settings
 from django.conf.urls.i18n import i18n_patterns
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.urls import include, path, re_path
-from django.views.decorators.cache import cache_page
+from django.views.decorators.http import conditional_page
 
-# from main.api_views import (
-#     CategoryCreate,
-#     CategoryList,
-#     CategoryRetrieveUpdateDestroyAPIView,
-#     CategoryStats,
-#     ItemCreate,
-#     ItemList,
-#     ItemRetrieveUpdateDestroyAPIView,
-# )
+from main.api_views import (
+    CategoryList,
+    CategoryRetrieve,
+    CategoryStatsList,
+    CategoryStatsRetrieve,
+    ItemList,
+    ItemRetrieve,
+)
 from main.errors import url_error
+from main.page_cache import (
+    API_GROUP,
+    API_STATS_GROUP,
+    CATEGORIES_GROUP,
+    CATEGORY_GROUP,
+    ITEM_GROUP,
+    cache_page_group,
+)
 from main.views import (
     CategoriesView,
     ContactUsFormView,
@@ -26,12 +31,12 @@ from main.views import (
     ItemsView,
     LoginFormView,
     RedirectToItemView,
+    SearchView,
     SignUpFormView,
     logout_request,
 )
 
 app_name = "main"  # here for namespacing of urls.
-CACHE_TTL = getattr(settings, "CACHE_TTL", DEFAULT_TIMEOUT)
 CAT_PREFIX = "api/v1/categories"
 ITEMS_PREFIX = "api/v1/items"
 
@@ -43,39 +48,63 @@ urlpatterns = i18n_patterns(
 )
 
 urlpatterns += [
-    # Django rest framework
-    # path(f"{CAT_PREFIX}/", CategoryList.as_view()),
-    # path(f"{CAT_PREFIX}/new", CategoryCreate.as_view()),
-    # path(f"{CAT_PREFIX}/<int:id>/", CategoryRetrieveUpdateDestroyAPIView.as_view(),),
-    # path(f"{CAT_PREFIX}/<int:id>/stats/", CategoryStats.as_view(),),
-    # path(f"{ITEMS_PREFIX}/", ItemList.as_view()),
-    # path(f"{ITEMS_PREFIX}/new", ItemCreate.as_view()),
-    # path(f"{ITEMS_PREFIX}/<int:id>/", ItemRetrieveUpdateDestroyAPIView.as_view()),
+    # Django rest framework, cached and served with ETags
+    path(
+        f"{CAT_PREFIX}/",
+        conditional_page(cache_page_group(API_GROUP)(CategoryList.as_view())),
+        name="api_categories",
+    ),
+    path(
+        f"{CAT_PREFIX}/<int:id>/",
+        conditional_page(cache_page_group(API_GROUP)(CategoryRetrieve.as_view())),
+        name="api_category",
+    ),
+    path(
+        f"{CAT_PREFIX}/stats/",
+        conditional_page(
+            cache_page_group(API_STATS_GROUP)(CategoryStatsList.as_view())
+        ),
+        name="api_categories_stats",
+    ),
+    path(
+        f"{CAT_PREFIX}/<int:id>/stats/",
+        conditional_page(
+            cache_page_group(API_STATS_GROUP)(CategoryStatsRetrieve.as_view())
+        ),
+        name="api_category_stats",
+    ),
+    path(
+        f"{ITEMS_PREFIX}/",
+        conditional_page(cache_page_group(API_GROUP)(ItemList.as_view())),
+        name="api_items",
+    ),
+    path(
+        f"{ITEMS_PREFIX}/<int:id>/",
+        conditional_page(cache_page_group(API_GROUP)(ItemRetrieve.as_view())),
+        name="api_item",
+    ),
     # User management
-    path("__debug__/", include(debug_toolbar.urls)),
     path("register/", SignUpFormView.as_view(), name="register"),
     path("login/", LoginFormView.as_view(), name="login"),
     path("logout/", logout_request, name="logout"),
     # Views
     path("", IndexView.as_view(), name="home"),
-    path(
-        "contact/",
-        (cache_page(CACHE_TTL))(ContactUsFormView.as_view()),
-        name="contact_us",
-    ),
+    # Not cached: the form page carries a CSRF token, and the view is async
+    path("contact/", ContactUsFormView.as_view(), name="contact_us"),
+    path("search/", SearchView.as_view(), name="search"),
     path(
         "items/",
-        (cache_page(CACHE_TTL))(CategoriesView.as_view()),
+        cache_page_group(CATEGORIES_GROUP)(CategoriesView.as_view()),
         name="categories_view",
     ),
     path(
         "items/<category_slug>/<item_slug>/",
-        (cache_page(CACHE_TTL))(ItemsView.as_view()),
+        cache_page_group(ITEM_GROUP)(ItemsView.as_view()),
         name="item_view",
     ),
     path(
         "items/<category_slug>/",
-        (cache_page(CACHE_TTL))(RedirectToItemView.as_view()),
+        cache_page_group(CATEGORY_GROUP)(RedirectToItemView.as_view()),
         name="items_view",
     ),
     # Extra apps
@@ -90,6 +119,12 @@ urlpatterns = (
     + urlpatterns
 )
 
+if settings.DEBUG:
+    # pylint: disable=import-outside-toplevel
+    import debug_toolbar
+
+    urlpatterns = [path("__debug__/", include(debug_toolbar.urls))] + urlpatterns
+
 # Custom views for errors
 handler404 = "main.errors.handler404"
 
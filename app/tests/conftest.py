@@ -7,6 +7,7 @@ import pytest
 from django.contrib.auth.models import User
 
 from app.helpers.constants import THUMBNAIL_SUFFIX
+from main.aws_clients import reset_clients
 from main.forms import ContactForm
 from main.models import Category, Item
 from tests.mocks import MockCategory, MockItem, MockUser
@@ -34,6 +35,22 @@ def save_mock_item(monkeypatch, item: Item) -> None:
     mock_resize_image.assert_called_once_with(item.image, suffix=THUMBNAIL_SUFFIX)
 
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path) -> None:
+    """
+    Stores the media files written by each test in its own temporary directory.
+    Assigning the setting through pytest-django also resets the cached location
+    of the file storage, which tests may then monkeypatch.
+    """
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture(autouse=True)
+def aws_clients() -> None:
+    """Drops the AWS clients cached by previous tests, which may be mocks"""
+    reset_clients()
+
+
 ##########################
 #
 #   Category Fixtures
@@ -0,0 +1,67 @@
+"""This module defines tests for the AWS clients registry"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from app.main.storage_backends import PublicMediaStorage, StaticStorage
+from main.aws_clients import get_client
+
+
+def test_client_created_once(monkeypatch):
+    """Clients are created on first use, then reused"""
+    # Given: a mock boto3 client constructor
+    monkeypatch.setattr("boto3.client", mock_client := Mock(side_effect=Mock))
+
+    # When: clients are requested several times
+    ses_client = get_client("ses")
+    assert get_client("ses") is ses_client
+    assert get_client("sns") is not ses_client
+
+    # Then: a single client is created per service
+    assert mock_client.call_count == 2
+
+
+def test_client_created_once_across_threads(monkeypatch):
+    """Concurrent first calls from several threads create a single client"""
+
+    # Given: a slow mock boto3 client constructor
+    def slow_client(*args, **kwargs):
+        time.sleep(0.05)
+        return Mock()
+
+    monkeypatch.setattr("boto3.client", mock_client := Mock(side_effect=slow_client))
+
+    # When: a client is requested from several threads at once
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(get_client("sns")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then: all threads share the same client
+    assert mock_client.call_count == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_storages_share_resource(monkeypatch):
+    """S3 storages share one resource per thread"""
+    # Given: a mock boto3 session
+    monkeypatch.setattr("boto3.session.Session", mock_session := Mock())
+
+    # When: the connection of both storages is used
+    # Then: the same resource is used, and created once
+    assert StaticStorage().connection is PublicMediaStorage().connection
+    assert mock_session.call_count == 1
+
+    # When: a storage connection is used from another thread
+    thread = threading.Thread(target=lambda: StaticStorage().connection)
+    thread.start()
+    thread.join()
+
+    # Then: a new session is created for that thread
+    assert mock_session.call_count == 2
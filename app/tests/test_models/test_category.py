@@ -9,7 +9,9 @@ from django.db.models.fields.files import ImageFieldFile
 from PIL import UnidentifiedImageError
 
 from helpers.constants import CROP_SIZE, IMG_EXT
+from main.mixins import ImageStatus
 from main.models import Category
+from main.tasks import run_worker
 from tests.mocks import MockCategory
 from tests.utils import (
     check_image_attributes,
@@ -99,6 +101,33 @@ class TestCategory:
         # Then: The resize_image function is called
         mock_resize_image.assert_called_once_with(mock_default_category.image)
 
+    # pylint: disable=no-self-use
+    # pylint: disable=unused-argument
+    def test_image_resize_skipped(self, monkeypatch, load_default_category: Category):
+        """Ensures resize_image is only called on save when the image has changed"""
+        # Given: a category loaded from the database and a mock resize_image
+        category = Category.objects.get(id=MockCategory.DEFAULT_ID)
+        monkeypatch.setattr(
+            Category,
+            "resize_image",
+            mock_resize_image := Mock(side_effect=lambda image: image),
+        )
+
+        # When: only text fields are modified and saved, twice
+        category.summary = "new summary"
+        category.save()
+        category.save()
+
+        # Then: The resize_image function is not called
+        mock_resize_image.assert_not_called()
+
+        # When: a new image is assigned and saved
+        category.image = "new-image.png"
+        category.save()
+
+        # Then: The resize_image function is called once
+        mock_resize_image.assert_called_once_with(category.image)
+
     @pytest.mark.parametrize(
         "initial_size", [(800, 1280), (2000, 200), (200, 2000), (100, 100)]
     )
@@ -137,6 +166,43 @@ class TestCategory:
             mock_default_category.image, size=CROP_SIZE, ext=IMG_EXT,
         )
 
+    # pylint: disable=no-self-use
+    def test_image_resize_deferred(
+        self, monkeypatch, tmp_path, mock_default_category: Category
+    ):
+        """Ensure images are resized by the worker when the task queue is enabled"""
+
+        # Set Django to store media files to the tmp_path directory
+        monkeypatch.setattr(settings, "MEDIA_ROOT", tmp_path)
+        monkeypatch.setattr(settings, "TASK_QUEUE_ENABLED", True)
+        run_worker(burst=True, timeout=1)
+
+        # Given: a category with a large mock image
+        mock_default_category.image = "dummy_image_base_name.png"
+        create_dummy_png_image(
+            tmp_path, mock_default_category.image.name, image_size=(800, 1280)
+        )
+
+        # When: the category is saved
+        mock_default_category.save()
+
+        # Then: the original image is kept, and its processing is pending
+        category = Category.objects.get(id=mock_default_category.id)
+        assert category.image_status == ImageStatus.PENDING
+        check_image_attributes(category.image, size=(800, 1280), ext=".png")
+
+        # When: the background worker runs
+        assert run_worker(burst=True, timeout=1) == 1
+
+        # Then: the image is replaced by its resized version, and its
+        # responsive variants are generated from the resized image
+        category.refresh_from_db()
+        assert category.image_status == ImageStatus.READY
+        check_image_attributes(category.image, size=CROP_SIZE, ext=IMG_EXT)
+        assert {variant.width for variant in category.variants.all()} == {
+            CROP_SIZE.width
+        }
+
     @pytest.mark.parametrize(
         "file_ext, exception",
         [
@@ -0,0 +1,100 @@
+"""This module defines tests for the category statistics materialized view"""
+
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError
+from django.urls import reverse
+
+from main.models import Category, CategoryStats, Item
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCategoryStats:
+    """Tests for the CategoryStats model and api views"""
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_refresh(self, load_default_items: List[Item]):
+        """The statistics are aggregated when the view is refreshed"""
+        # Given: items with views
+        for views, item in enumerate(Item.objects.order_by("id")):
+            Item.objects.filter(id=item.id).update(views=views * 10)
+
+        # When: the statistics are refreshed
+        call_command("refresh_category_stats")
+
+        # Then: the statistics of the category are aggregated
+        stats = CategoryStats.objects.get()
+        items = Item.objects.order_by("-views")
+        assert stats.category_id == Category.objects.get().id
+        assert stats.item_count == 5
+        assert stats.total_views == 100
+        assert stats.newest_item_id == Item.objects.latest("date_published", "id").id
+        assert [top_item["id"] for top_item in stats.top_items] == [
+            item.id for item in items[: CategoryStats.TOP_ITEMS_COUNT]
+        ]
+        assert stats.top_items[0]["views"] == 40
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_stale_until_refreshed(self, load_default_items: List[Item]):
+        """The statistics are read from the view, not from the items"""
+        # Given: refreshed statistics
+        CategoryStats.refresh()
+
+        # When: an item gets views
+        Item.add_views({Item.objects.first().id: 3})
+
+        # Then: the statistics change once refreshed only
+        assert CategoryStats.objects.get().total_views == 0
+        CategoryStats.refresh()
+        assert CategoryStats.objects.get().total_views == 3
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_stats_api(
+        self, client, django_assert_num_queries, load_default_items_and_cats
+    ):
+        """The statistics of all the categories are listed with a single query"""
+        # Given: refreshed statistics
+        CategoryStats.refresh()
+
+        # When: listing the statistics
+        with django_assert_num_queries(1):
+            response = client.get(reverse("api_categories_stats"))
+
+        # Then: the statistics of each category are listed
+        assert response.status_code == 200
+        stats = response.json()["results"]
+        assert len(stats) == 5
+        assert all(category_stats["item_count"] == 5 for category_stats in stats)
+        category = Category.objects.first()
+        response = client.get(reverse("api_category_stats", kwargs={"id": category.id}))
+        assert response.json()["category_name"] == category.category_name
+
+
+class StopLoop(Exception):
+    """Raised to stop a command running in a loop"""
+
+
+def test_refresher_loop_survives_errors(monkeypatch):
+    """The statistics refresher keeps running after a failed run"""
+    # Given: a first refresh failing, e.g. during a database failover
+    mock_refresh = Mock(side_effect=[OperationalError("failover"), None])
+    monkeypatch.setattr(CategoryStats, "refresh", mock_refresh)
+    monkeypatch.setattr(
+        "main.management.commands.refresh_category_stats.evict_page_groups", Mock()
+    )
+    mock_sleep = Mock(side_effect=[None, StopLoop])
+    monkeypatch.setattr("main.management.loop_command.time.sleep", mock_sleep)
+
+    # When: the refresher runs in a loop
+    with pytest.raises(StopLoop):
+        call_command("refresh_category_stats", loop=True)
+
+    # Then: the statistics were refreshed again after the failed run
+    assert mock_refresh.call_count == 2
@@ -0,0 +1,89 @@
+"""This module defines tests for the rendering of the item content"""
+
+import pytest
+from django.urls import reverse
+
+from main.content import render_content
+from main.models import Item
+
+
+class TestRenderContent:
+    """Tests for the main.content rendering pipeline"""
+
+    # pylint: disable=no-self-use
+    def test_sanitised(self):
+        """Scripts, event handlers and javascript: URLs are removed"""
+        rendered = render_content(
+            '<p onclick="steal()">Miam<script>steal()</script></p>'
+            '<a href="java\tscript:steal()">lien</a><a href="/items/">recettes</a>'
+        )
+        assert rendered == '<p>Miam</p><a>lien</a><a href="/items/">recettes</a>'
+
+    # pylint: disable=no-self-use
+    def test_styles_collapsed(self):
+        """Inherited and editor-only declarations are removed, and empty spans"""
+        rendered = render_content(
+            '<p style="font-size: 12px; line-height: normal; margin: 0px;">'
+            '<span style="box-sizing: inherit;"><span lang="FR">'
+            '<strong style="font-size: 12px; caret-color: red; color: red">'
+            "Ingr&eacute;dients</strong></span></span></p>"
+            '<p style="font-size: 80%"><span style="font-size: 80%">Note</span></p>'
+        )
+        assert rendered == (
+            '<p style="font-size:12px;margin:0">'
+            '<strong style="font-size:12px;color:red">Ingrédients</strong></p>'
+            '<p style="font-size:80%"><span style="font-size:80%">Note</span></p>'
+        )
+
+    # pylint: disable=no-self-use
+    def test_default_styles_kept(self):
+        """Declarations overriding the default style of an element are kept"""
+        rendered = render_content(
+            '<p style="color:#000"><a style="color:#000">lien</a></p>'
+            '<div style="font-size:14px"><h2 style="font-size:14px">Titre</h2>'
+            '<p style="font-size:14px">Texte</p></div>'
+            '<p style="font-weight:400"><span style="font-weight:400">'
+            '<strong style="font-weight:400">Note</strong></span></p>'
+        )
+        assert rendered == (
+            '<p style="color:#000"><a style="color:#000">lien</a></p>'
+            '<div style="font-size:14px"><h2 style="font-size:14px">Titre</h2>'
+            '<p style="font-size:14px">Texte</p></div>'
+            '<p style="font-weight:400"><strong style="font-weight:400">Note</strong></p>'
+        )
+
+    # pylint: disable=no-self-use
+    def test_minified_and_lazy(self):
+        """Whitespaces and comments are removed, and images loaded lazily"""
+        rendered = render_content(
+            '<ol>\n  <li>Un  \n œuf</li>\n</ol><!-- note -->\n<img src="/oeuf.jpg">'
+            "<pre>a\n  b</pre>"
+        )
+        assert rendered == (
+            '<ol><li>Un œuf</li></ol><img src="/oeuf.jpg" loading="lazy" '
+            'decoding="async"><pre>a\n  b</pre>'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_item_page_rendered(self, client, load_default_items):
+        """The item page displays the content rendered on save"""
+        # Given: an item whose content is edited
+        item = Item.objects.first()
+        item.content = '<p style="caret-color: red">Nouveau <b>contenu</b></p>'
+        item.save()
+
+        # When: the item page is requested
+        response = client.get(
+            reverse(
+                "item_view",
+                kwargs={
+                    "category_slug": item.category_name.category_slug,
+                    "item_slug": item.item_slug,
+                },
+            )
+        )
+
+        # Then: the rendered content is displayed
+        assert b"<p>Nouveau <b>contenu</b></p>" in response.content
@@ -0,0 +1,92 @@
+"""This module defines tests for the PostgreSQL backend health checks and pool"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from psycopg2.pool import PoolError
+
+from main.db_backends.postgresql.base import BlockingConnectionPool, close_pools
+
+
+@pytest.fixture
+def connection_settings():
+    """Restores the connection settings modified by a test"""
+    initial_settings = connection.settings_dict.copy()
+    yield connection.settings_dict
+    connection.close()
+    close_pools()
+    connection.settings_dict.update(initial_settings)
+
+
+def backend_pid_of_request() -> int:
+    """Simulates a request, and returns the database backend process id used"""
+    request_started.send(sender=None)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        backend_pid = cursor.fetchone()[0]
+    request_finished.send(sender=None)
+    return backend_pid
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDatabaseWrapper:
+    """Tests for the main.db_backends.postgresql backend"""
+
+    # pylint: disable=no-self-use
+    def test_health_check(self, monkeypatch, connection_settings):
+        """A persistent connection is replaced when its health check fails"""
+        # Given: a persistent connection, with health checks
+        connection_settings.update(
+            CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True, POOL_SIZE=0
+        )
+        connection.close()
+        first_pid = backend_pid_of_request()
+
+        # Then: the connection is reused by the next request
+        assert backend_pid_of_request() == first_pid
+
+        # When: the connection is no longer usable
+        monkeypatch.setattr(connection, "is_usable", Mock(return_value=False))
+
+        # Then: the next request opens a new connection
+        assert backend_pid_of_request() != first_pid
+
+    # pylint: disable=no-self-use
+    def test_pool(self, connection_settings):
+        """Connections closed at the end of a request are reused from the pool"""
+        # Given: connections closed at the end of each request, and pooled
+        connection_settings.update(CONN_MAX_AGE=0, POOL_SIZE=1)
+        connection.close()
+
+        # When: two requests are made
+        first_pid = backend_pid_of_request()
+
+        # Then: the connection was returned to the pool, and reused
+        assert connection.connection is None
+        assert backend_pid_of_request() == first_pid
+
+    # pylint: disable=no-self-use
+    def test_pool_exhausted(self):
+        """Connections are waited for once all the pooled connections are in use"""
+        # Given: a pool whose connections are all in use
+        pool = BlockingConnectionPool(
+            1, 2, timeout=0.1, **connection.get_connection_params()
+        )
+        connections = [pool.getconn(), pool.getconn()]
+
+        # Then: no connection is returned within the timeout
+        with pytest.raises(PoolError):
+            pool.getconn()
+
+        # When: a connection is returned while another thread waits for one
+        pool.timeout = 5
+        threading.Timer(0.1, pool.putconn, args=[connections.pop()]).start()
+
+        # Then: the returned connection is taken by the waiting thread
+        connections.append(pool.getconn())
+        for pooled_connection in connections:
+            pool.putconn(pooled_connection)
+        pool.closeall()
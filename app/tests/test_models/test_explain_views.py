@@ -0,0 +1,30 @@
+"""This module defines tests for the explain_views management command"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from main.models import Category, Item
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExplainViews:
+    """Tests for the query plans printed by explain_views"""
+
+    # pylint: disable=no-self-use
+    def test_explain_views(self):
+        """The plan of each view is printed, and the seeded data rolled back"""
+        # When: the plans are printed against a small dataset
+        stdout = StringIO()
+        call_command("explain_views", categories=2, items=20, stdout=stdout)
+
+        # Then: each view query is explained with its actual execution
+        output = stdout.getvalue()
+        for view_name in ("CategoriesView", "ItemsView sidebar", "SearchView"):
+            assert view_name in output
+        assert "actual time=" in output
+
+        # Then: the seeded categories and items are not kept
+        assert not Category.objects.exists()
+        assert not Item.objects.exists()
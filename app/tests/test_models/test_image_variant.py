@@ -0,0 +1,123 @@
+"""This module defines tests for the ImageVariant django model and picture tag"""
+
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.template import Context, Template
+from PIL import Image
+
+from main.models import ImageVariant, Item
+from tests.utils import create_dummy_png_image
+
+PICTURE_TEMPLATE = Template("{% load responsive_images %}{% picture item %}")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImageVariant:
+    """Tests for the responsive image variants"""
+
+    # pylint: disable=no-self-use
+    def test_variants_generated(self, monkeypatch, tmp_path, mock_default_item: Item):
+        """A variant is stored for each width and format, without upscaling"""
+
+        # Set Django to store media files to the tmp_path directory
+        monkeypatch.setattr(settings, "MEDIA_ROOT", tmp_path)
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_WIDTHS", [320, 640, 1024])
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_FORMATS", ["webp", "jpeg"])
+
+        # Given: an item with a 800x1280 image
+        mock_default_item.image = "dummy_image_base_name.png"
+        create_dummy_png_image(
+            tmp_path, mock_default_item.image.name, image_size=(800, 1280)
+        )
+
+        # When: the item is saved
+        mock_default_item.save()
+
+        # Then: variants are generated, capped to the image width
+        variants = mock_default_item.variants.order_by("width", "format")
+        assert [(v.width, v.height, v.format) for v in variants] == [
+            (320, 512, "jpeg"),
+            (320, 512, "webp"),
+            (640, 1024, "jpeg"),
+            (640, 1024, "webp"),
+            (800, 1280, "jpeg"),
+            (800, 1280, "webp"),
+        ]
+        for variant in variants:
+            with Image.open(variant.image) as img:
+                assert img.size == (variant.width, variant.height)
+                assert img.format == variant.format.upper()
+
+    # pylint: disable=no-self-use
+    def test_variants_replaced(self, monkeypatch, tmp_path, mock_default_item: Item):
+        """Variants of a previous image are deleted when a new image is saved"""
+
+        # Set Django to store media files to the tmp_path directory
+        monkeypatch.setattr(settings, "MEDIA_ROOT", tmp_path)
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_WIDTHS", [320])
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_FORMATS", ["webp", "avi"])
+
+        # Given: a saved item with variants of a first image
+        for image_name in ("first_image.png", "second_image.png"):
+            create_dummy_png_image(tmp_path, image_name, image_size=(400, 400))
+        mock_default_item.image = "first_image.png"
+        mock_default_item.save()
+        first_variant = mock_default_item.variants.get()
+
+        # When: a second image is saved
+        mock_default_item.image = "second_image.png"
+        mock_default_item.save()
+
+        # Then: only the variants of the second image are kept, and
+        # unsupported formats are skipped
+        second_variant = mock_default_item.variants.get()
+        assert second_variant.format == ImageVariant.Format.WEBP
+        assert Path(second_variant.image.name).stem == "second_image_320w"
+        assert not (tmp_path / first_variant.image.name).exists()
+
+    # pylint: disable=no-self-use
+    def test_picture_tag(self, monkeypatch, tmp_path, mock_default_item: Item):
+        """The picture tag renders a srcset per format"""
+
+        # Set Django to store media files to the tmp_path directory
+        monkeypatch.setattr(settings, "MEDIA_ROOT", tmp_path)
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_WIDTHS", [320, 640])
+        monkeypatch.setattr(settings, "IMAGE_VARIANT_FORMATS", ["webp", "jpeg"])
+
+        # Given: an item with variants
+        mock_default_item.image = "dummy_image_base_name.png"
+        create_dummy_png_image(
+            tmp_path, mock_default_item.image.name, image_size=(800, 800)
+        )
+        mock_default_item.save()
+
+        # When: the picture tag is rendered
+        html = PICTURE_TEMPLATE.render(Context({"item": mock_default_item}))
+
+        # Then: WebP variants are offered first, with a JPEG fallback
+        media_url = f"{settings.MEDIA_URL}images/dummy_image_base_name"
+        assert (
+            f'<source type="image/webp" srcset="{media_url}_320w.webp 320w, '
+            f'{media_url}_640w.webp 640w"'
+        ) in html
+        assert f'src="{media_url}_640w.jpeg"' in html
+        assert (
+            f'srcset="{media_url}_320w.jpeg 320w, {media_url}_640w.jpeg 640w"' in html
+        )
+
+    # pylint: disable=no-self-use
+    # pylint: disable=unused-argument
+    def test_picture_tag_fallback(self, load_default_item: Item):
+        """The original image is rendered while the variants are not generated"""
+        # Given: an item without variants
+        item = Item.objects.get()
+        assert not item.variants.exists()
+
+        # When: the picture tag is rendered
+        html = PICTURE_TEMPLATE.render(Context({"item": item}))
+
+        # Then: the original image is used
+        assert "<source" not in html
+        assert f'src="{item.image.url}"' in html
@@ -1,11 +1,14 @@
 """This module defines tests for the Category django model"""
 
 from typing import List
+from unittest.mock import Mock
 
 import pytest
 
+from app.helpers.constants import THUMBNAIL_SUFFIX
 from app.tests.mocks import MockItem
 from main.models import Category, Item
+from main.search import search_query
 
 
 @pytest.mark.django_db(transaction=True)
@@ -79,3 +82,51 @@ class TestItems:
         """
         assert Item.objects.all().count() == 0
         assert all(isinstance(obj, Item) for obj in mock_default_items)
+
+    # pylint: disable=no-self-use
+    # pylint: disable=unused-argument
+    def test_image_resize_skipped(self, monkeypatch, load_default_items: List[Item]):
+        """Ensures the thumbnail is only generated when the image has changed"""
+        # Given: an item loaded from the database and a mock resize_image
+        item = Item.objects.first()
+        monkeypatch.setattr(
+            Item, "resize_image", mock_resize_image := Mock(return_value=item.image),
+        )
+
+        # When: only text fields are modified and saved
+        item.summary = "new summary"
+        item.save()
+
+        # Then: The resize_image function is not called
+        mock_resize_image.assert_not_called()
+
+        # When: a new image is assigned and saved
+        item.image = "new-image.png"
+        item.save()
+
+        # Then: The thumbnail is generated from the new image
+        mock_resize_image.assert_called_once_with(item.image, suffix=THUMBNAIL_SUFFIX)
+
+    # pylint: disable=no-self-use
+    # pylint: disable=unused-argument
+    def test_cards_deferred_content(self, load_default_items: List[Item]):
+        """Ensures the item cards are loaded without their content"""
+        # When: items are loaded, as cards or as whole items
+        card = Item.objects.cards().first()
+        item = Item.objects.first()
+
+        # Then: the search vector is never loaded, and cards have no content
+        assert card.get_deferred_fields() == {
+            "content",
+            "content_rendered",
+            "search_vector",
+        }
+        assert item.get_deferred_fields() == {"search_vector"}
+
+        # When: a card is saved
+        card.summary = "new summary"
+        card.save()
+
+        # Then: the content is kept, and the item is found by its new summary
+        saved_item = Item.objects.get(search_vector=search_query("new summary"))
+        assert saved_item.content == item.content
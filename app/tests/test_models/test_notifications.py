@@ -0,0 +1,185 @@
+"""This module defines tests for the SES notifications of new items"""
+
+from datetime import timedelta
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from main import notifications
+from main.admin import ItemAdmin
+from main.models import Item, NotificationChunk
+from main.notifications import notify_registered_users, retry_failed_chunks
+from main.tasks import run_worker
+
+
+def ses_response(destinations: List, failed_emails: List[str]):
+    """Returns a SES response, with the given email addresses failed"""
+    return {
+        "Status": [
+            {"Status": "Failed", "Error": "Throttled"}
+            if destination["Destination"]["ToAddresses"][0] in failed_emails
+            else {"Status": "Success", "MessageId": "mock_message_id"}
+            for destination in destinations
+        ]
+    }
+
+
+@pytest.fixture
+def mock_ses_client(monkeypatch, settings) -> Mock:
+    """Returns a mock SES client, and configures the SES identity"""
+    settings.SES_MAX_SEND_RATE = 1000
+    monkeypatch.setattr(notifications, "SES_IDENTITY_ARN", "mock_ses_identity_arn")
+    monkeypatch.setattr("boto3.client", mock_client := Mock())
+    return mock_client("ses")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNotifications:
+    """Tests for the main.notifications module"""
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_notify_in_chunks(self, mock_ses_client: Mock, load_default_items):
+        """Users are notified in chunks of at most 50 destinations"""
+        # Given: 120 registered users, and 1 without email address
+        User.objects.bulk_create(
+            User(username=f"user_{idx}", email=f"user_{idx}@mail.com")
+            for idx in range(120)
+        )
+        User.objects.create(username="no_email")
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=[])
+        )
+
+        # When: the users are notified of an item
+        notified_users = notify_registered_users(Item.objects.first())
+
+        # Then: the users with an email address are notified, with 3 SES requests
+        assert notified_users == 120
+        destinations_count = sorted(
+            len(call.kwargs["Destinations"])
+            for call in mock_ses_client.send_bulk_templated_email.mock_calls
+        )
+        assert destinations_count == [20, 50, 50]
+        # Then: the 3 chunks are recorded as sent
+        assert list(
+            NotificationChunk.objects.values_list("status", flat=True).distinct()
+        ) == [NotificationChunk.Status.SENT]
+        assert NotificationChunk.objects.count() == 3
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_retry_failed_chunk(self, mock_ses_client: Mock, load_default_items):
+        """Only the users who could not be notified are retried"""
+        # Given: 3 registered users, and SES failing to notify the second one
+        User.objects.bulk_create(
+            User(username=f"user_{idx}", email=f"user_{idx}@mail.com")
+            for idx in range(3)
+        )
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=["user_1@mail.com"])
+        )
+
+        # When: the users are notified of an item
+        assert notify_registered_users(Item.objects.first()) == 2
+
+        # Then: the chunk is recorded as failed, for the second user only
+        chunk = NotificationChunk.objects.get()
+        assert chunk.status == NotificationChunk.Status.FAILED
+        assert chunk.pending_recipients == [["user_1", "user_1@mail.com"]]
+        assert chunk.last_error == "Failed: Throttled"
+
+        # When: the failed chunks are retried, and SES succeeds
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=[])
+        )
+        assert retry_failed_chunks() == 1
+
+        # Then: the second user only is notified, and the chunk is sent
+        retried_destinations = mock_ses_client.send_bulk_templated_email.call_args
+        assert [
+            destination["Destination"]["ToAddresses"]
+            for destination in retried_destinations.kwargs["Destinations"]
+        ] == [["user_1@mail.com"]]
+        chunk.refresh_from_db()
+        assert chunk.status == NotificationChunk.Status.SENT
+        assert chunk.attempts == 2
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_notified_by_worker(
+        self, settings, mock_ses_client: Mock, load_default_items
+    ):
+        """Notifications are sent and retried by the worker only"""
+        # Given: the task queue disabled, and SES failing to notify a user
+        settings.TASK_QUEUE_ENABLED = False
+        run_worker(burst=True, timeout=1)
+        User.objects.create(username="user_0", email="user_0@mail.com")
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=["user_0@mail.com"])
+        )
+
+        # When: an item is created from the admin page
+        ItemAdmin.notify_registered_users(Item.objects.first(), is_modified=False)
+
+        # Then: the users are notified by the worker, not within the request
+        mock_ses_client.send_bulk_templated_email.assert_not_called()
+        assert run_worker(burst=True, timeout=1) == 1
+        chunk = NotificationChunk.objects.get()
+        assert chunk.status == NotificationChunk.Status.FAILED
+
+        # When: the retries are scheduled, and SES succeeds
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=[])
+        )
+        call_command("retry_notifications")
+
+        # Then: the failed chunk is sent again by the worker
+        assert chunk.attempts == 1
+        assert run_worker(burst=True, timeout=1) == 1
+        chunk.refresh_from_db()
+        assert chunk.status == NotificationChunk.Status.SENT
+        assert chunk.attempts == 2
+
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_retry_stale_pending_chunk(
+        self, monkeypatch, settings, mock_ses_client: Mock, load_default_items
+    ):
+        """Chunks left pending by a stopped worker are retried after a timeout"""
+        # Given: 3 users notified in chunks of 2 users, sent by batches of 1
+        # chunk, and a worker stopped after the first batch
+        monkeypatch.setattr(notifications, "SES_MAX_DESTINATIONS", 2)
+        monkeypatch.setattr(notifications, "CHUNKS_BATCH_SIZE", 1)
+        User.objects.bulk_create(
+            User(username=f"user_{idx}", email=f"user_{idx}@mail.com")
+            for idx in range(3)
+        )
+        mock_ses_client.send_bulk_templated_email.side_effect = lambda **kwargs: (
+            ses_response(kwargs["Destinations"], failed_emails=[])
+        )
+        item = Item.objects.first()
+        chunks_batches = notifications.create_chunks(item)
+        assert notifications.send_chunks(item, [next(chunks_batches)]) == 2
+
+        # Then: the second chunk was not saved before the first one was sent
+        assert NotificationChunk.objects.count() == 1
+        # When: the remaining chunk is saved, but left pending
+        next(chunks_batches)
+        pending_chunk = NotificationChunk.objects.get(
+            status=NotificationChunk.Status.PENDING
+        )
+
+        # Then: it is only retried once NOTIFICATION_PENDING_TIMEOUT has elapsed
+        assert retry_failed_chunks() == 0
+        NotificationChunk.objects.filter(id=pending_chunk.id).update(
+            created_at=timezone.now()
+            - timedelta(seconds=settings.NOTIFICATION_PENDING_TIMEOUT + 1)
+        )
+        assert retry_failed_chunks() == 1
+        pending_chunk.refresh_from_db()
+        assert pending_chunk.status == NotificationChunk.Status.SENT
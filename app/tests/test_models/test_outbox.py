@@ -0,0 +1,162 @@
+"""This module defines tests for the outbox of the messages published to SNS"""
+
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from botocore.exceptions import EndpointConnectionError
+from django.core.management import call_command
+from django.db import OperationalError
+from django.utils import timezone
+
+from main.models import OutboxMessage
+from main.outbox import LocalPublisher, Outbox, SNSPublisher, outbox
+
+
+@pytest.fixture
+def local_outbox() -> Outbox:
+    """Returns an outbox publishing to the local stand-in publisher"""
+    return Outbox(publisher="local", max_attempts=3, retry_backoff=30)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOutbox:
+    """Tests for the Outbox class"""
+
+    # pylint: disable=no-self-use
+    def test_send_only_saves(self, monkeypatch):
+        """Sent messages are saved, then published by the dispatcher"""
+        # Given: the outbox publishing to the local stand-in publisher
+        monkeypatch.setattr(outbox, "publisher", local_publisher := LocalPublisher())
+
+        # When: a message is sent
+        message = outbox.send(topic_arn="topic", message="hello")
+
+        # Then: the message is pending, until the outbox is dispatched
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.Status.PENDING
+        assert not local_publisher.published
+        assert outbox.dispatch() == 1
+        message.refresh_from_db()
+        assert [published.id for published in local_publisher.published] == [message.id]
+        assert message.status == OutboxMessage.Status.SENT
+        assert message.sent_at is not None
+
+    # pylint: disable=no-self-use
+    def test_dispatch_in_batches(self, local_outbox: Outbox):
+        """Due messages are published in batches, grouped by topic"""
+        # Given: pending messages for two topics
+        OutboxMessage.objects.bulk_create(
+            OutboxMessage(topic_arn=f"topic-{idx % 2}", message=str(idx))
+            for idx in range(25)
+        )
+        local_outbox.publisher = Mock(wraps=LocalPublisher())
+
+        # When: the outbox is dispatched
+        published = local_outbox.dispatch(batch_size=10)
+
+        # Then: all the messages are published, with at most 10 per request
+        assert published == 25
+        batch_sizes = [
+            len(call.args[1])
+            for call in local_outbox.publisher.publish_batch.mock_calls
+        ]
+        assert sum(batch_sizes) == 25 and max(batch_sizes) <= 10
+        assert all(
+            len({message.topic_arn for message in call.args[1]}) == 1
+            for call in local_outbox.publisher.publish_batch.mock_calls
+        )
+        assert not OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT)
+
+    # pylint: disable=no-self-use
+    def test_retry_with_backoff(self, monkeypatch, local_outbox: Outbox):
+        """Failed messages are retried with an exponential backoff, then given up"""
+        # Given: a pending message, and SNS failing to publish it
+        message = OutboxMessage.objects.create(topic_arn="topic", message="hello")
+        local_outbox.publisher = SNSPublisher()
+        monkeypatch.setattr(
+            "boto3.client",
+            Mock(side_effect=EndpointConnectionError(endpoint_url="sns")),
+        )
+
+        for attempt in range(1, local_outbox.max_attempts + 1):
+            # When: the outbox is dispatched
+            before_dispatch = timezone.now()
+            assert local_outbox.dispatch() == 0
+
+            # Then: the message is not due until its backoff has elapsed
+            message.refresh_from_db()
+            assert message.attempts == attempt
+            assert "EndpointConnectionError" in message.last_error
+            if attempt < local_outbox.max_attempts:
+                assert message.status == OutboxMessage.Status.PENDING
+                backoff = timedelta(seconds=30 * 2 ** (attempt - 1))
+                assert message.next_attempt_at >= before_dispatch + backoff
+                assert local_outbox.dispatch() == 0
+                message.next_attempt_at = timezone.now()
+                message.save()
+
+        # Then: the message is marked failed after the last attempt
+        assert message.status == OutboxMessage.Status.FAILED
+
+    # pylint: disable=no-self-use
+    def test_partial_batch_failure(self, monkeypatch, local_outbox: Outbox):
+        """Only the messages failed by SNS are retried"""
+        # Given: two pending messages, and SNS failing the second one
+        first, second = [
+            OutboxMessage.objects.create(topic_arn="topic", message=str(idx))
+            for idx in range(2)
+        ]
+        local_outbox.publisher = SNSPublisher()
+        monkeypatch.setattr("boto3.client", mock_sns_client := Mock())
+        mock_sns_client("sns").publish_batch.return_value = {
+            "Successful": [{"Id": str(first.id)}],
+            "Failed": [{"Id": str(second.id), "Code": "InternalError"}],
+        }
+
+        # When: the outbox is dispatched
+        assert local_outbox.dispatch() == 1
+
+        # Then: the first message is sent, and the second one will be retried
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.status == OutboxMessage.Status.SENT
+        assert second.status == OutboxMessage.Status.PENDING
+        assert second.last_error.startswith("InternalError")
+
+    # pylint: disable=no-self-use
+    def test_unexpected_error(self, local_outbox: Outbox):
+        """Unexpected publication errors are counted as failed attempts"""
+        # Given: a pending message, and a publisher failing unexpectedly
+        message = OutboxMessage.objects.create(topic_arn="topic", message="hello")
+        local_outbox.publisher = Mock()
+        local_outbox.publisher.publish_batch.side_effect = ValueError("unexpected")
+
+        # When: the outbox is dispatched
+        assert local_outbox.dispatch() == 0
+
+        # Then: the message will be retried
+        message.refresh_from_db()
+        assert message.attempts == 1
+        assert message.status == OutboxMessage.Status.PENDING
+        assert "unexpected" in message.last_error
+
+
+class StopLoop(Exception):
+    """Raised to stop a command running in a loop"""
+
+
+def test_dispatcher_loop_survives_errors(monkeypatch):
+    """The dispatcher keeps running after a failed run"""
+    # Given: a first dispatch failing, e.g. during a database failover
+    mock_dispatch = Mock(side_effect=[OperationalError("failover"), 1])
+    monkeypatch.setattr(outbox, "dispatch", mock_dispatch)
+    mock_sleep = Mock(side_effect=[None, StopLoop])
+    monkeypatch.setattr("main.management.loop_command.time.sleep", mock_sleep)
+
+    # When: the dispatcher runs in a loop
+    with pytest.raises(StopLoop):
+        call_command("dispatch_outbox", loop=True)
+
+    # Then: the outbox was dispatched again after the failed run
+    assert mock_dispatch.call_count == 2
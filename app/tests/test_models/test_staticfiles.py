@@ -0,0 +1,117 @@
+"""This module defines tests for the static files pipeline"""
+
+import gzip
+import json
+
+import brotli
+import pytest
+from django.core.management import call_command
+from django.template import Context, Template
+
+from main.staticfiles import BUNDLES, minify_css
+
+STYLESHEETS_TEMPLATE = Template(
+    '{% load static_bundles %}{% static_bundle "css/site.css" %}'
+)
+SCRIPTS_TEMPLATE = Template('{% load static_bundles %}{% static_bundle "js/site.js" %}')
+
+
+@pytest.fixture
+def collected_static_root(settings, tmp_path):
+    """Collects the static files with the manifest storage, and returns STATIC_ROOT"""
+    settings.STATIC_ROOT = tmp_path / "static"
+    settings.STATICFILES_STORAGE = "main.staticfiles.ManifestStaticStorage"
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+class TestMinifyCSS:
+    """Tests for the minification of the stylesheets"""
+
+    # pylint: disable=no-self-use
+    def test_minified(self):
+        """Comments and whitespaces are removed, but not licence comments"""
+        minified = minify_css(
+            "/*! Licence */\n/* Layout */\nnav ul a,\nnav .brand-logo {\n"
+            "  color: #444;\n}\n\n@media (max-width: 600px) {\n  p { top: 0; }\n}\n"
+        )
+        assert minified == (
+            "/*! Licence */ nav ul a,nav .brand-logo{color:#444}"
+            "@media (max-width:600px){p{top:0}}"
+        )
+
+    # pylint: disable=no-self-use
+    def test_strings_unchanged(self):
+        """Quoted strings are left as is"""
+        minified = minify_css("a::after { content: ' ; { } '; font: 'A  B', serif; }")
+        assert minified == "a::after{content:' ; { } ';font:'A  B',serif}"
+
+
+class TestStaticBundles:
+    """Tests for the bundles saved by collectstatic"""
+
+    # pylint: disable=no-self-use
+    def test_bundles_hashed(self, collected_static_root):
+        """Bundles are listed in the manifest, and contain their minified sources"""
+        # Given: static files collected with the manifest storage
+        manifest = json.loads((collected_static_root / "staticfiles.json").read_text())
+
+        # When: the hashed bundles are read
+        stylesheets = (
+            collected_static_root / manifest["paths"]["css/site.css"]
+        ).read_text()
+        scripts = (collected_static_root / manifest["paths"]["js/site.js"]).read_text()
+
+        # Then: bundles contain the sources, minified
+        assert manifest["paths"]["css/site.css"].startswith("css/site.")
+        assert "/* Custom Stylesheet */" not in stylesheets
+        assert "main{flex:1 0 auto}" in stylesheets
+        assert stylesheets.index(".materialize-red{") < stylesheets.index("main{")
+        assert "$('.sidenav').sidenav();" in scripts
+        assert scripts.index("jQuery v2.1.1") < scripts.index("$('.sidenav')")
+
+    @pytest.mark.parametrize(
+        "extension,decompress", [(".gz", gzip.decompress), (".br", brotli.decompress)]
+    )
+    # pylint: disable=no-self-use
+    def test_bundles_precompressed(self, collected_static_root, extension, decompress):
+        """Hashed text files are saved with gzip and brotli compressed copies"""
+        # Given: static files collected with the manifest storage
+        manifest = json.loads((collected_static_root / "staticfiles.json").read_text())
+        hashed_bundle = collected_static_root / manifest["paths"]["js/site.js"]
+
+        # When: the compressed copy of a bundle is read
+        compressed = hashed_bundle.with_name(
+            hashed_bundle.name + extension
+        ).read_bytes()
+
+        # Then: it is smaller than the bundle, which it decompresses to
+        assert len(compressed) < hashed_bundle.stat().st_size
+        assert decompress(compressed) == hashed_bundle.read_bytes()
+
+
+class TestStaticBundleTag:
+    """Tests for the static_bundle template tag"""
+
+    # pylint: disable=no-self-use
+    def test_source_files(self):
+        """Files of a bundle are included one by one without the manifest storage"""
+        stylesheets = STYLESHEETS_TEMPLATE.render(Context())
+        scripts = SCRIPTS_TEMPLATE.render(Context())
+
+        assert stylesheets.count('rel="stylesheet"') == len(BUNDLES["css/site.css"])
+        assert (
+            '<link href="/staticfiles/css/style.css" rel="stylesheet">' in stylesheets
+        )
+        assert scripts.count(" defer></script>") == len(BUNDLES["js/site.js"])
+        assert '<script src="/staticfiles/js/init.js" defer></script>' in scripts
+
+    # pylint: disable=no-self-use
+    def test_hashed_bundle(self, collected_static_root):
+        """The hashed bundle is included with the manifest storage"""
+        manifest = json.loads((collected_static_root / "staticfiles.json").read_text())
+        hashed_bundle = manifest["paths"]["js/site.js"]
+
+        scripts = SCRIPTS_TEMPLATE.render(Context())
+
+        assert scripts == f'<script src="/staticfiles/{hashed_bundle}" defer></script>'
@@ -16,3 +16,13 @@ def test_public_media_storage_instance():
     assert public_media_storage.location == "mediafiles/"
     assert public_media_storage.default_acl == "public-read"
     assert not public_media_storage.file_overwrite
+
+
+def test_static_storage_cache_control():
+    """Hashed static files are cached for a year, other files for a day"""
+    static_storage = StaticStorage()
+    assert static_storage.get_object_parameters("css/site.0c6aa213058e.css") == {
+        "CacheControl": "public, max-age=31536000, immutable"
+    }
+    assert static_storage.get_object_parameters("css/site.css") == {}
+    assert static_storage.get_object_parameters("staticfiles.json") == {}
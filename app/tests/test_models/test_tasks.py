@@ -0,0 +1,70 @@
+"""This module defines tests for the background task queue"""
+
+import json
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django_redis import get_redis_connection
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from main.tasks import PROCESSING_KEY, enqueue, run_worker, task
+
+executed_values: List[int] = []
+
+
+@task(inline=False)
+def record_value(value: int) -> None:
+    """Task recording the values it is executed with"""
+    executed_values.append(value)
+
+
+class StopLoop(Exception):
+    """Raised to stop a command running in a loop"""
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTaskWorker:
+    """Tests for the main.tasks worker"""
+
+    # pylint: disable=no-self-use
+    def test_interrupted_task_executed_again(self):
+        """Tasks interrupted by a worker crash are executed when it restarts"""
+        # Given: a task being executed when the worker was stopped, and a
+        # queued task
+        run_worker(burst=True, timeout=1)
+        executed_values.clear()
+        connection = get_redis_connection("default")
+        processing_key = PROCESSING_KEY.format(worker=settings.TASK_WORKER_NAME)
+        connection.rpush(
+            processing_key, json.dumps({"task": "record_value", "kwargs": {"value": 1}})
+        )
+        enqueue("record_value", value=2)
+
+        # When: the worker starts
+        assert run_worker(burst=True, timeout=1) == 2
+
+        # Then: the interrupted task is executed first, and no task is left
+        assert executed_values == [1, 2]
+        assert connection.llen(processing_key) == 0
+
+
+def test_worker_loop_survives_errors(monkeypatch):
+    """The worker is restarted after a failure, e.g. when Redis is unavailable"""
+    # Given: a worker failing on its first run
+    mock_run_worker = Mock(side_effect=[RedisConnectionError("failover"), 0])
+    monkeypatch.setattr(
+        "main.management.commands.run_task_worker.run_worker", mock_run_worker
+    )
+    mock_sleep = Mock(side_effect=[None, StopLoop])
+    monkeypatch.setattr("main.management.loop_command.time.sleep", mock_sleep)
+
+    # When: the worker runs in a loop
+    with pytest.raises(StopLoop):
+        call_command("run_task_worker", loop=True)
+
+    # Then: the worker was restarted after the failed run
+    assert mock_run_worker.call_count == 2
+    mock_run_worker.assert_called_with(burst=False)
@@ -0,0 +1,115 @@
+"""This module defines tests for the buffered item views counter"""
+
+from typing import List
+
+import pytest
+from django.core.management import call_command
+from django_redis import get_redis_connection
+
+from main.models import Item
+from main.view_counter import RedisViewBuffer, ViewCounter, view_counter
+
+
+@pytest.mark.django_db(transaction=True)
+class TestViewCounter:
+    """Tests for the ViewCounter class"""
+
+    @pytest.mark.parametrize("backend", ["redis", "memory"])
+    # pylint: disable=no-self-use
+    def test_views_buffered_until_flush(
+        self, backend: str, load_default_items: List[Item]
+    ):
+        """Views are not written to the database until the buffer is flushed"""
+        # Given: a view counter which is never due for flushing
+        counter = ViewCounter(backend=backend, flush_interval=3600)
+        counter.buffer.drain()
+        first_item, second_item = Item.objects.order_by("item_name")[:2]
+
+        # When: views are recorded for two items
+        for _ in range(3):
+            counter.record(first_item.id)
+        counter.record(second_item.id, amount=5)
+
+        # Then: the database is left untouched
+        assert not Item.objects.filter(views__gt=0).exists()
+
+        # When: the buffer is flushed
+        assert counter.flush() == 8
+
+        # Then: each item views are incremented, and the buffer is emptied
+        first_item.refresh_from_db()
+        second_item.refresh_from_db()
+        assert (first_item.views, second_item.views) == (3, 5)
+        assert counter.flush() == 0
+
+    # pylint: disable=no-self-use
+    def test_record_never_flushes(self, load_default_items: List[Item]):
+        """Recording views never writes to the database, even once due"""
+        # Given: a view counter which is always due for flushing
+        counter = ViewCounter(backend="memory", flush_interval=0)
+        item = Item.objects.first()
+
+        # When: a view is recorded
+        counter.record(item.id)
+
+        # Then: the view is only written to the database by a flush
+        item.refresh_from_db()
+        assert item.views == 0
+        assert counter.flush() == 1
+
+    # pylint: disable=no-self-use
+    def test_flusher_thread(self, load_default_items: List[Item]):
+        """The flusher thread flushes the buffer, and the rest when stopped"""
+        # Given: a view counter flushed by a background thread
+        counter = ViewCounter(backend="memory", flush_interval=3600)
+        item = Item.objects.first()
+        flusher = counter.start_flusher()
+
+        # When: a view is recorded, and the flusher is stopped
+        counter.record(item.id)
+        counter.stop_flusher()
+        flusher.join(timeout=5)
+
+        # Then: the view is written to the database, and the thread exits
+        item.refresh_from_db()
+        assert item.views == 1
+        assert not flusher.is_alive()
+
+    # pylint: disable=no-self-use
+    def test_flush_command_elects_a_server(self, load_default_items: List[Item]):
+        """A single server flushes the shared buffer per flush interval"""
+        # Given: buffered views, and no flush during the current interval
+        get_redis_connection("default").delete(RedisViewBuffer.flush_lock_key)
+        view_counter.buffer.drain()
+        item = Item.objects.first()
+        view_counter.record(item.id)
+
+        # When: the flush command runs on a first server
+        call_command("flush_item_views")
+
+        # Then: the buffered views are written to the database
+        item.refresh_from_db()
+        assert item.views == 1
+
+        # When: the flush command runs on another server within the interval
+        view_counter.record(item.id)
+        call_command("flush_item_views")
+
+        # Then: the views are left in the buffer until the next interval
+        item.refresh_from_db()
+        assert item.views == 1
+        assert view_counter.flush() == 1
+
+    # pylint: disable=no-self-use
+    def test_add_views_does_not_save(self, monkeypatch, load_default_items: List[Item]):
+        """Item.add_views() runs a bulk update without calling Item.save()"""
+        # Given: Item.save() would fail if called
+        items = list(Item.objects.all())
+        monkeypatch.setattr(Item, "save", None)
+
+        # When: views are added to every item
+        updated_rows = Item.add_views({item.id: item.id for item in items})
+
+        # Then: every item views field is updated
+        assert updated_rows == len(items)
+        assert all(item.views == item.id for item in Item.objects.all())
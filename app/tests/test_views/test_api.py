@@ -0,0 +1,117 @@
+"""This module defines tests for the django rest framework api, /api/v1/"""
+
+from typing import List
+
+import pytest
+from django.urls import reverse
+
+from main.models import Item
+
+
+@pytest.fixture
+def cached_pages(settings) -> None:
+    """Enables the page cache"""
+    settings.CACHE_TTL = 60
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAPI:
+    """Tests for the category and item api views"""
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_categories_constant_queries(
+        self, client, django_assert_num_queries, load_default_items_and_cats
+    ):
+        """Categories are listed along with their items with two queries"""
+        # When: listing the categories
+        with django_assert_num_queries(2):
+            response = client.get(reverse("api_categories"), {"page_size": 100})
+
+        # Then: each category lists its items
+        assert response.status_code == 200
+        categories = response.json()["results"]
+        assert len(categories) == 5
+        assert all(len(category["child_items"]) == 5 for category in categories)
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_items_cursor_pagination(self, client, load_default_items_and_cats):
+        """Items are paginated with a cursor, and filtered by category"""
+        # When: following the pages of the items, 10 per page
+        item_ids = []
+        url = reverse("api_items")
+        while url:
+            page = client.get(url).json()
+            item_ids += [item["id"] for item in page["results"]]
+            url = page["next"]
+
+        # Then: all the items are listed once, in order
+        assert item_ids == list(
+            Item.objects.order_by("id").values_list("id", flat=True)
+        )
+
+        # When: filtering the items of a category
+        category_id = Item.objects.first().category_name_id
+        response = client.get(reverse("api_items"), {"category_name": category_id})
+
+        # Then: only its items are listed
+        assert {item["category_name"] for item in response.json()["results"]} == {
+            category_id
+        }
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_conditional_get(self, client, load_default_items: List[Item]):
+        """Responses have an ETag, and are not sent again if unchanged"""
+        # Given: a response and its ETag
+        item = Item.objects.first()
+        url = reverse("api_item", kwargs={"id": item.id})
+        etag = client.get(url)["ETag"]
+
+        # When: the response is requested again with its ETag
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Then: the response is not modified
+        assert response.status_code == 304
+
+        # When: the item is modified
+        item.summary = "Updated summary"
+        item.save()
+
+        # Then: the response is sent again
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["summary"] == "Updated summary"
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_cached_responses_evicted(
+        self, client, django_assert_num_queries, cached_pages, load_default_items
+    ):
+        """Responses are cached until a category or item is saved"""
+        # Given: a cached response
+        client.get(reverse("api_categories"))
+
+        # Then: the response is served from the cache
+        with django_assert_num_queries(0):
+            response = client.get(reverse("api_categories"))
+        assert response.status_code == 200
+
+        # When: an item is renamed
+        item = Item.objects.first()
+        item.item_name = "Renamed item"
+        item.save()
+
+        # Then: the response lists the renamed item
+        response = client.get(reverse("api_categories"))
+        item_names = [
+            child_item["item_name"]
+            for category in response.json()["results"]
+            for child_item in category["child_items"]
+        ]
+        assert "Renamed item" in item_names
@@ -2,14 +2,20 @@
 
 import json
 from http import HTTPStatus
+from urllib.parse import urlencode
 from unittest.mock import Mock
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.conf import settings
+from django.test import AsyncClient
 from django.urls import reverse
 
+from helpers import strings
 from helpers.constants import TemplateNames
 from main.forms import ContactForm
+from main.models import OutboxMessage
+from main.outbox import outbox
 
 
 @pytest.mark.django_db(transaction=True)
@@ -54,6 +60,10 @@ class TestViewContactUs:
         )
         # Given: mock sns service client
         monkeypatch.setattr("boto3.client", mock_sns_client := Mock())
+        mock_sns_client("sns").publish_batch.return_value = {
+            "Successful": [],
+            "Failed": [],
+        }
         # When: POST request on the contact-us page
         response = client.post(reverse("contact_us"), data=mock_contact_form.json())
         if sns_topic_arn:
@@ -63,10 +73,21 @@ class TestViewContactUs:
                 t.name for t in response.templates
             ]
             assert response.status_code == HTTPStatus.OK.value
+            # Then: the message is saved in the outbox, and not published yet
+            message = OutboxMessage.objects.get()
+            assert message.status == OutboxMessage.Status.PENDING
+            mock_sns_client("sns").publish_batch.assert_not_called()
+            # When: the outbox is dispatched
+            assert outbox.dispatch() == 1
             # Then: SNS client called with expected parameters
-            mock_sns_client("sns").publish.assert_called_once_with(
-                TargetArn="mock_sns_topic_arn",
-                Message=json.dumps({"default": mock_contact_form.json()}),
+            mock_sns_client("sns").publish_batch.assert_called_once_with(
+                TopicArn="mock_sns_topic_arn",
+                PublishBatchRequestEntries=[
+                    {
+                        "Id": str(message.id),
+                        "Message": json.dumps({"default": mock_contact_form.json()}),
+                    }
+                ],
             )
         else:
             # Given: SNS_TOPIC_ARN is NOT set
@@ -75,6 +96,29 @@ class TestViewContactUs:
                 t.name for t in response.templates
             ]
             assert response.status_code == HTTPStatus.OK.value
+            assert not OutboxMessage.objects.exists()
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_post_valid_form_asgi(self, monkeypatch, mock_contact_form: ContactForm):
+        """The form is served by the async view under ASGI"""
+        # Given: SNS_TOPIC_ARN is set
+        monkeypatch.setattr(settings, "SNS_TOPIC_ARN", "mock_sns_topic_arn")
+        # When: POST request on the contact-us page, through the ASGI handler
+        async def post_contact_form():
+            return await AsyncClient().post(
+                reverse("contact_us"),
+                data=urlencode(mock_contact_form.json()),
+                content_type="application/x-www-form-urlencoded",
+            )
+
+        response = async_to_sync(post_contact_form)()
+        # Then: `go-back-home` template is rendered, and the message is saved
+        assert response.status_code == HTTPStatus.OK.value
+        assert strings.CONTACTUS_FORM in response.content.decode()
+        assert OutboxMessage.objects.get().message == json.dumps(
+            {"default": mock_contact_form.json()}
+        )
 
     @pytest.mark.integration
     # pylint: disable=no-self-use
@@ -0,0 +1,81 @@
+"""This module defines tests for the cached template fragments"""
+from typing import List
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.urls import reverse
+
+from main.fragment_cache import FRAGMENT_CACHE
+from main.models import Category
+
+
+@pytest.fixture
+def cached_fragments(settings) -> None:
+    """Enables the fragment cache, starting from an empty cache"""
+    settings.FRAGMENT_CACHE_TTL = 60
+    caches[FRAGMENT_CACHE].clear()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("cached_fragments")
+class TestFragmentCache:
+    """Tests for the template fragments cached with a content version"""
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_category_saved(self, client, load_default_categories: List[Category]):
+        """Saving a category renders the category cards again"""
+        # Given: cached category cards
+        client.get(reverse("categories_view"))
+
+        # When: a category is renamed without signals, then another one is saved
+        category, other_category = Category.objects.order_by("id")[:2]
+        Category.objects.filter(id=category.id).update(category_name="Updated category")
+        content = client.get(reverse("categories_view")).content
+        assert b"Updated category" not in content
+        other_category.category_name = "Saved category"
+        other_category.save()
+
+        # Then: the category cards are rendered again
+        content = client.get(reverse("categories_view")).content
+        assert b"Saved category" in content
+        assert b"Updated category" in content
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_category_saved_in_transaction(
+        self, client, load_default_categories: List[Category]
+    ):
+        """Fragments are invalidated once the transaction is committed"""
+        # Given: cached category cards
+        client.get(reverse("categories_view"))
+
+        # When: a category is saved in a transaction
+        with transaction.atomic():
+            category = Category.objects.order_by("id").first()
+            category.category_name = "Saved category"
+            category.save()
+            # Then: the cards are only rendered again once it is committed
+            assert (
+                b"Saved category" not in client.get(reverse("categories_view")).content
+            )
+        assert b"Saved category" in client.get(reverse("categories_view")).content
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_navbar_per_user(self, client, mock_user: User):
+        """The navbar is cached for each user"""
+        # Given: the navbar cached for anonymous users
+        assert b"Sign up" in client.get(reverse("home")).content
+
+        # When: a user logs in
+        client.force_login(mock_user)
+
+        # Then: the navbar shows the user name
+        content = client.get(reverse("home")).content
+        assert mock_user.username.title().encode() in content
+        assert b"Sign up" not in content
@@ -1,15 +1,22 @@
 """This module defines tests for the items page"""
+import uuid
 from http import HTTPStatus
 from typing import List
 from unittest.mock import Mock
 
 import pytest
+from django.contrib.contenttypes.models import ContentType
 from django.db.models.query import QuerySet
+from django.test import RequestFactory
 from django.urls import reverse
+from django.views.decorators.cache import cache_page
 
 from app.helpers.constants import THUMBNAIL_SUFFIX
-from helpers.constants import TemplateNames
+from helpers.constants import ITEM_ID_HEADER, TemplateNames
+from main.middleware import ItemViewCountMiddleware
 from main.models import Category, Item
+from main.view_counter import view_counter
+from main.views import ItemsView
 
 
 @pytest.mark.django_db(transaction=True)
@@ -130,11 +137,75 @@ class TestViewItem:
                 kwargs={"category_slug": "category-1", "item_slug": "item-1-1",},
             )
         )
-        # Then: item view is incremented
         assert response.request["PATH_INFO"] == "/items/category-1/item-1-1/"
         assert response.status_code == HTTPStatus.OK.value
         assert TemplateNames.ITEMS.value in [t.name for t in response.templates]
-        assert response.context["item"].views == initial_view_count + 1
+
+        # Then: item view is incremented once the buffered views are flushed
+        view_counter.flush()
+        mock_default_item.refresh_from_db()
+        assert mock_default_item.views == initial_view_count + 1
+        assert ITEM_ID_HEADER not in response
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_views_counted_from_cache(
+        # pylint: disable=unused-argument
+        self,
+        django_assert_num_queries,
+        load_default_item: Item,
+    ):
+        """Test views are counted when the item page is served from cache"""
+        # Given: An item page cached with cache_page, behind the views middleware
+        item = Item.objects.get(item_slug="item-1-1")
+        cached_view = cache_page(60, key_prefix=uuid.uuid4().hex)(ItemsView.as_view())
+        middleware = ItemViewCountMiddleware(
+            lambda request: cached_view(
+                request, category_slug="category-1", item_slug="item-1-1"
+            ).render()
+        )
+        request = RequestFactory().get("/items/category-1/item-1-1/")
+        view_counter.flush()
+
+        # When: the page is requested once, then twice from cache
+        assert ITEM_ID_HEADER not in middleware(request)
+        with django_assert_num_queries(0):
+            for _ in range(2):
+                assert ITEM_ID_HEADER not in middleware(request)
+
+        # Then: all three views are counted
+        view_counter.flush()
+        item.refresh_from_db()
+        assert item.views == 3
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_view_item_num_queries(
+        # pylint: disable=unused-argument
+        self,
+        django_assert_num_queries,
+        load_default_items: List[Item],
+    ):
+        """Test the item page is rendered with a fixed number of queries"""
+        # Given: a category with several items, and the content types cached
+        # as they are after the first request
+        items = Item.objects.order_by("item_name")
+        request = RequestFactory().get("/items/category-1/")
+        ContentType.objects.get_for_model(Item)
+
+        for expected_idx, item in enumerate(items):
+            # When: the item page is rendered
+            # Then: the item, the sidebar and the image variants are each
+            # fetched with a single query, whatever the number of items
+            with django_assert_num_queries(3):
+                response = ItemsView.as_view()(
+                    request, category_slug="category-1", item_slug=item.item_slug
+                ).render()
+            assert response.context_data["this_item_idx"] == expected_idx
+            assert list(response.context_data["sidebar"]) == [
+                {"item_name": itm.item_name, "item_slug": itm.item_slug}
+                for itm in items
+            ]
 
     @pytest.mark.integration
     @pytest.mark.parametrize(
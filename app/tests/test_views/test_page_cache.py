@@ -0,0 +1,218 @@
+"""This module defines tests for the eviction of cached item and category pages"""
+from typing import List
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.views.decorators.vary import vary_on_cookie
+
+from main.models import Category, Item
+from main.page_cache import REPLICA_LAG_KEY, ignore_cookie_vary
+
+
+@pytest.fixture
+def cached_pages(monkeypatch) -> None:
+    """Enables the page cache, starting from an empty cache"""
+    monkeypatch.setattr(settings, "CACHE_TTL", 60)
+    cache.clear()
+
+
+@pytest.fixture
+def replica(monkeypatch) -> None:
+    """Declares a replica database, whose connection is closed after the test"""
+    monkeypatch.setitem(settings.DATABASES, "replica", settings.DATABASES["default"])
+    yield
+    connections["replica"].close()
+
+
+def item_url(item: Item) -> str:
+    """Returns the url of an item page"""
+    return reverse(
+        "item_view",
+        kwargs={"category_slug": "category-1", "item_slug": item.item_slug},
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("cached_pages")
+class TestPageCache:
+    """Tests for the targeted eviction of cached pages"""
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_item_content_saved(self, client, load_default_items: List[Item]):
+        """Saving an item content only evicts its own page"""
+        # Given: two cached item pages
+        item, other_item = Item.objects.order_by("item_name")[:2]
+        for cached_item in (item, other_item):
+            client.get(item_url(cached_item))
+
+        # When: both items are updated without signals, then one is saved
+        Item.objects.update(content_rendered="<p>updated content</p>")
+        assert b"updated content" not in client.get(item_url(item)).content
+        item.content = "<p>saved content</p>"
+        item.save()
+
+        # Then: only the saved item page is evicted
+        assert b"saved content" in client.get(item_url(item)).content
+        assert b"updated content" not in client.get(item_url(other_item)).content
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_item_renamed(self, client, load_default_items: List[Item]):
+        """Renaming an item evicts the sidebar of the other items of its category"""
+        # Given: a cached item page
+        item, other_item = Item.objects.order_by("item_name")[:2]
+        client.get(item_url(other_item))
+
+        # When: another item of the category is renamed
+        item.item_name = "renamed item"
+        item.save()
+
+        # Then: the sidebar of the cached page lists the new item name
+        assert b"renamed item" in client.get(item_url(other_item)).content
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_category_renamed(self, client, load_default_items: List[Item]):
+        """Renaming a category evicts the listing and its previous pages"""
+        # Given: the cached categories listing and category redirect page
+        client.get(reverse("categories_view"))
+        redirect_url = reverse("items_view", kwargs={"category_slug": "category-1"})
+        assert client.get(redirect_url).status_code == 302
+
+        # When: the category is renamed
+        category = Category.objects.get()
+        category.category_name = "renamed category"
+        category.save()
+
+        # Then: the listing shows the new name, and the previous slug is not found
+        assert b"renamed category" in client.get(reverse("categories_view")).content
+        assert client.get(redirect_url).context["code_handled"] == 404
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_item_saved_in_transaction(self, client, load_default_items: List[Item]):
+        """Pages are evicted once the transaction saving an item is committed"""
+        # Given: a cached item page
+        item = Item.objects.order_by("item_name").first()
+        client.get(item_url(item))
+
+        # When: the item is saved in a transaction
+        with transaction.atomic():
+            item.content = "<p>saved content</p>"
+            item.save()
+            # Then: the page is only evicted once the transaction is committed
+            assert b"saved content" not in client.get(item_url(item)).content
+        assert b"saved content" in client.get(item_url(item)).content
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_page_cached_regardless_of_cookies(self, load_default_items: List[Item]):
+        """Anonymous clients with different cookies share the same cached page"""
+        # Given: an item page cached for an anonymous client with cookies
+        item = Item.objects.order_by("item_name").first()
+        first_client, second_client = Client(), Client()
+        first_client.cookies.load({"_ga": "GA1.1.111", "csrftoken": "a" * 64})
+        second_client.cookies.load({"_ga": "GA1.1.222", "csrftoken": "b" * 64})
+        first_client.get(item_url(item))
+
+        # When: another anonymous client with other cookies loads the page
+        Item.objects.update(content_rendered="<p>updated content</p>")
+        response = second_client.get(item_url(item))
+
+        # Then: the page is served from the single cached copy
+        assert b"updated content" not in response.content
+        assert len(cache.keys("views.decorators.cache.cache_page.*")) == 1
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_logged_in_page_not_cached(
+        self, client, mock_user: User, load_default_items: List[Item]
+    ):
+        """Pages of logged in users are neither cached nor served from the cache"""
+        # Given: an anonymous client, and a logged in client which loaded an item
+        item = Item.objects.order_by("item_name").first()
+        client.force_login(mock_user)
+        assert b"Log out" in client.get(item_url(item)).content
+
+        # When: the anonymous client then loads the item page, and the logged
+        # in client loads the item page again
+        anonymous_content = Client().get(item_url(item)).content
+        logged_in_content = client.get(item_url(item)).content
+
+        # Then: each client gets its own navbar
+        assert b"Log out" not in anonymous_content
+        assert b"Log in" in anonymous_content
+        assert b"Log out" in logged_in_content
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_page_with_messages_not_cached(
+        self, client, mock_user: User, load_default_items: List[Item]
+    ):
+        """Pages displaying messages are not cached, and display them once"""
+        # Given: a client with a pending message, from logging out
+        client.force_login(mock_user)
+        client.get(reverse("logout"))
+
+        # When: the client loads the categories listing twice
+        first_content = client.get(reverse("categories_view")).content
+        second_content = client.get(reverse("categories_view")).content
+
+        # Then: only the first page displays the message
+        assert b"M.toast(" in first_content
+        assert b"M.toast(" not in second_content
+
+    @pytest.mark.integration
+    @pytest.mark.usefixtures("replica")
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_replica_lag_window(self, client, load_default_items: List[Item]):
+        """Pages are not cached during the replication lag window after a save"""
+        # Given: a replica database, and a saved item
+        item = Item.objects.order_by("item_name").first()
+        item.save()
+
+        # When: the page is loaded during the replication lag window
+        client.get(item_url(item))
+        Item.objects.update(content_rendered="<p>updated content</p>")
+
+        # Then: it was not cached
+        assert b"updated content" in client.get(item_url(item)).content
+
+        # When: the page is loaded once the window has passed
+        cache.delete(REPLICA_LAG_KEY)
+        client.get(item_url(item))
+        Item.objects.update(content_rendered="<p>replicated content</p>")
+
+        # Then: it was cached
+        assert b"replicated content" not in client.get(item_url(item)).content
+
+
+def test_ignore_cookie_vary():
+    """Cookie is removed from the Vary header, and the other headers are kept"""
+    # Given: a view varying on the cookies and the language
+    @vary_on_cookie
+    def view(request):
+        response = HttpResponse()
+        response["Vary"] = "Accept-Language"
+        return response
+
+    # When: the view ignores the Cookie header
+    response = ignore_cookie_vary(view)(RequestFactory().get("/"))
+
+    # Then: the response only varies on the language
+    assert response["Vary"] == "Accept-Language"
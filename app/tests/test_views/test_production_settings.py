@@ -0,0 +1,60 @@
+"""This module defines tests for the production settings"""
+
+import importlib
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from helpers.constants import TemplateNames
+
+
+@pytest.fixture
+def production_settings():
+    """
+    Returns the production settings module, loaded on top of the test settings
+    which have DEBUG set
+    """
+    return importlib.import_module("portfolio.settings.production")
+
+
+class TestProductionSettings:
+    """Tests for the portfolio.settings.production module"""
+
+    # pylint: disable=no-self-use
+    def test_middleware(self, production_settings):
+        """Production requests do not go through the debug middlewares"""
+        assert production_settings.MIDDLEWARE == [
+            "django.middleware.security.SecurityMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.locale.LocaleMiddleware",
+            "django.middleware.common.CommonMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+            "django.middleware.clickjacking.XFrameOptionsMiddleware",
+            "main.middleware.ItemViewCountMiddleware",
+            "main.middleware.ReplicaPinningMiddleware",
+        ]
+
+    # pylint: disable=no-self-use
+    def test_no_debug_apps(self, production_settings):
+        """Debug apps are not loaded, and templates are cached"""
+        assert production_settings.DEBUG is False
+        assert "debug_toolbar" not in production_settings.INSTALLED_APPS
+        loaders = production_settings.TEMPLATES[0]["OPTIONS"]["loaders"]
+        assert loaders[0][0] == "django.template.loaders.cached.Loader"
+
+    @pytest.mark.integration
+    @pytest.mark.django_db(transaction=True)
+    # pylint: disable=no-self-use
+    def test_view_homepage(self, settings, client, production_settings):
+        """Pages are served with the production middlewares and templates"""
+        # Given: the production middlewares and template loaders
+        settings.MIDDLEWARE = production_settings.MIDDLEWARE
+        settings.TEMPLATES = production_settings.TEMPLATES
+        # When: the home page is requested
+        response = client.get(reverse("home"))
+        # Then: the home page is rendered
+        assert TemplateNames.HOME.value in [t.name for t in response.templates]
+        assert response.status_code == HTTPStatus.OK.value
@@ -0,0 +1,115 @@
+"""This module defines tests for the read replica database router"""
+from typing import List
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from main import db_routers
+from main.db_routers import PIN_COOKIE, ReplicaRouter, replica_reads
+from main.middleware import ReplicaPinningMiddleware
+from main.models import Item
+from main.views import ItemsView
+
+
+@pytest.fixture
+def replica(monkeypatch) -> None:
+    """Declares a replica database, for the router to route reads to"""
+    monkeypatch.setitem(settings.DATABASES, "replica", settings.DATABASES["default"])
+
+
+@pytest.mark.usefixtures("replica")
+class TestReplicaRouter:
+    """Tests for the ReplicaRouter class and ReplicaPinningMiddleware"""
+
+    # pylint: disable=no-self-use
+    def test_reads_routed_to_replica(self):
+        """Reads go to the replica within replica_reads, until a write"""
+        router = ReplicaRouter()
+        # Given: reads outside of a replica_reads block go to the primary
+        assert router.db_for_read(Item) == "default"
+
+        with replica_reads():
+            # When: reading within a replica_reads block
+            # Then: reads go to the replica
+            assert router.db_for_read(Item) == "replica"
+
+            # When: a write is routed
+            assert router.db_for_write(Item) == "default"
+
+            # Then: the following reads go to the primary
+            assert router.db_for_read(Item) == "default"
+
+    @pytest.mark.parametrize("write", [True, False])
+    # pylint: disable=no-self-use
+    def test_pin_cookie(self, write: bool):
+        """Requests writing to the database pin the client to the primary"""
+        # Given: a view writing to the database, or not
+        def view(request):
+            if write:
+                ReplicaRouter().db_for_write(Item)
+            return HttpResponse()
+
+        # When: the view is requested
+        response = ReplicaPinningMiddleware(view)(RequestFactory().get("/"))
+
+        # Then: the pin cookie is set for the replication lag window after a write
+        assert (PIN_COOKIE in response.cookies) is write
+        if write:
+            assert (
+                response.cookies[PIN_COOKIE]["max-age"]
+                == settings.DB_REPLICA_LAG_WINDOW
+            )
+
+    # pylint: disable=no-self-use
+    def test_pinned_client_reads_primary(self):
+        """Requests with the pin cookie read from the primary"""
+        # Given: a request from a client which recently wrote to the database
+        request = RequestFactory().get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        routed_dbs = []
+
+        def view(request):
+            with replica_reads():
+                routed_dbs.append(ReplicaRouter().db_for_read(Item))
+            return HttpResponse()
+
+        # When: the request reads within a replica_reads block
+        ReplicaPinningMiddleware(view)(request)
+
+        # Then: reads go to the primary
+        assert routed_dbs == ["default"]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaReadMixin:
+    """Tests for the views reading from the replica"""
+
+    @pytest.mark.integration
+    # pylint: disable=unused-argument
+    # pylint: disable=no-self-use
+    def test_item_page_reads(self, monkeypatch, load_default_items: List[Item]):
+        """All the item page reads, including from its template, use the replica"""
+        # Given: a router recording whether reads are routed to the replica
+        replica_reads_flags = []
+
+        def db_for_read(router, model, **hints):
+            # pylint: disable=protected-access
+            state = db_routers._routing_state.get()
+            replica_reads_flags.append(state is not None and state.replica_reads)
+            return "default"
+
+        monkeypatch.setattr(ReplicaRouter, "db_for_read", db_for_read)
+        item = Item.objects.first()
+
+        # When: the item page is requested and rendered
+        replica_reads_flags.clear()
+        ItemsView.as_view()(
+            RequestFactory().get("/"),
+            category_slug="category-1",
+            item_slug=item.item_slug,
+        )
+
+        # Then: the item, sidebar and image variants are all read from the replica
+        assert replica_reads_flags and all(replica_reads_flags)
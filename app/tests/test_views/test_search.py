@@ -0,0 +1,132 @@
+"""This module defines tests for the full-text search of the items"""
+
+import pytest
+from django.urls import reverse
+
+from main.models import Category, Item
+from main.views import SearchView
+from tests.conftest import save_mock_item
+from tests.mocks import MockItem
+
+
+@pytest.fixture
+def load_recipes(monkeypatch, load_default_category: Category) -> None:
+    """Saves recipes whose name, summary or HTML content match some words"""
+    recipes = [
+        {"item_name": "Tarte aux pommes", "summary": "Un dessert d'automne"},
+        {"item_name": "Gratin dauphinois", "summary": "Des pommes de terre au four",},
+        {
+            "item_name": "Poulet rôti",
+            "summary": "Le plat du dimanche",
+            "content": "<p>Servir avec des <b>pommes</b> de terre saut&eacute;es</p>",
+        },
+        {"item_name": "Soupe de légumes", "summary": "Un plat réconfortant"},
+    ]
+    for item_id, recipe in enumerate(recipes):
+        item = MockItem.default_item(load_default_category, item_id, **recipe)
+        save_mock_item(monkeypatch, item)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("load_recipes")
+class TestSearch:
+    """Tests for the SearchView"""
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_search_ranked(self, client):
+        """Items are matched by stem, best matches first, with highlights"""
+        # When: searching for a word of the name, summary and content of items
+        response = client.get(reverse("search"), {"q": "pomme"})
+
+        # Then: the matching items are listed, name matches first
+        assert response.status_code == 200
+        results = list(response.context["results"])
+        assert [item.item_name for item in results] == [
+            "Tarte aux pommes",
+            "Gratin dauphinois",
+            "Poulet rôti",
+        ]
+        assert "<mark>pommes</mark>" in results[1].headline
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_search_html_stripped(self, client):
+        """The HTML tags and entities of the content are not indexed"""
+        # When: searching for HTML markup, or for a word written as an entity
+        assert not client.get(reverse("search"), {"q": "eacute"}).context["results"]
+        response = client.get(reverse("search"), {"q": "sautées"})
+
+        # Then: only the text of the content is matched
+        assert [item.item_name for item in response.context["results"]] == [
+            "Poulet rôti"
+        ]
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_search_headline_escaped(self, client):
+        """The HTML of the summaries is escaped, except the highlights"""
+        # Given: an item whose summary has some HTML markup
+        item = Item.objects.get(item_name="Soupe de légumes")
+        item.summary = "Un plat <script>alert('soupe')</script> & chaud"
+        item.save()
+
+        # When: searching for a word of the summary
+        response = client.get(reverse("search"), {"q": "chaud"})
+
+        # Then: the markup is displayed as text, and the word highlighted
+        assert (
+            "plat &lt;script&gt;alert('soupe')&lt;/script&gt; &amp; <mark>chaud</mark>"
+            in response.content.decode()
+        )
+        assert b"<script>alert" not in response.content
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_search_vector_updated(self, client):
+        """The search vector of an item is updated when the item is saved"""
+        # When: an item is renamed
+        item = Item.objects.get(item_name="Soupe de légumes")
+        item.item_name = "Velouté de potiron"
+        item.save()
+
+        # Then: the item is found by its new name only
+        assert not client.get(reverse("search"), {"q": "soupe"}).context["results"]
+        response = client.get(reverse("search"), {"q": "potiron"})
+        assert [item.item_name for item in response.context["results"]] == [
+            "Velouté de potiron"
+        ]
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_search_paginated(self, client, monkeypatch, django_assert_max_num_queries):
+        """Results are paginated, and the empty search lists no item"""
+        # Given: a single result per page
+        monkeypatch.setattr(SearchView, "paginate_by", 1)
+
+        # When: searching without text
+        response = client.get(reverse("search"))
+
+        # Then: no item is listed
+        assert response.status_code == 200
+        assert not response.context["results"]
+
+        # When: requesting the first page of results
+        with django_assert_max_num_queries(2):
+            response = client.get(reverse("search"), {"q": "plat", "page": 1})
+
+        # Then: the page is rendered with a count query and a page query, and
+        # links to the next page of the same search
+        assert response.context["paginator"].count == 2
+        first_page = [item.item_name for item in response.context["results"]]
+        assert 'href="?q=plat&page=2"' in response.content.decode()
+        assert "page=0" not in response.content.decode()
+
+        # When: requesting the second page of results
+        response = client.get(reverse("search"), {"q": "plat", "page": 2})
+
+        # Then: it lists the other result, and links to the previous page
+        second_page = [item.item_name for item in response.context["results"]]
+        assert sorted(first_page + second_page) == ["Poulet rôti", "Soupe de légumes"]
+        assert 'href="?q=plat&page=1"' in response.content.decode()
+        assert "page=3" not in response.content.decode()
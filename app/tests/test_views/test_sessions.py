@@ -0,0 +1,61 @@
+"""This module defines tests for the sessions and the cached user lookup"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.urls import reverse
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSessions:
+    """Tests for the Redis sessions and the CachedModelBackend"""
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_authenticated_request_queries(
+        self, client, django_assert_num_queries, mock_user: User
+    ):
+        """Authenticated requests read the session and the user from Redis"""
+        # Given: a logged in user, whose user was cached by a first request
+        client.force_login(mock_user)
+        client.get(reverse("home"))
+
+        # When: the user requests a page
+        # Then: no query is made for the session or the user
+        with django_assert_num_queries(0):
+            response = client.get(reverse("home"))
+        assert response.context["user"] == mock_user
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_user_saved(self, client, mock_user: User):
+        """A saved user is read again from the database"""
+        # Given: a logged in user, whose user was cached by a first request
+        client.force_login(mock_user)
+        client.get(reverse("home"))
+
+        # When: the user is renamed
+        mock_user.username = "renamed_user"
+        mock_user.save()
+
+        # Then: the next request has the renamed user
+        response = client.get(reverse("home"))
+        assert response.context["user"].username == "renamed_user"
+
+    @pytest.mark.integration
+    # pylint: disable=no-self-use
+    def test_user_saved_in_transaction(self, client, mock_user: User):
+        """A user saved in a transaction is evicted once it is committed"""
+        # Given: a logged in user, whose user was cached by a first request
+        client.force_login(mock_user)
+        client.get(reverse("home"))
+
+        # When: the user is renamed in a transaction
+        with transaction.atomic():
+            mock_user.username = "renamed_user"
+            mock_user.save()
+            # Then: the cached user is only evicted once it is committed
+            response = client.get(reverse("home"))
+            assert response.context["user"].username != "renamed_user"
+        response = client.get(reverse("home"))
+        assert response.context["user"].username == "renamed_user"
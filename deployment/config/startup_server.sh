@@ -16,5 +16,12 @@ echo "Create log file if doesn't exist"
 mkdir /home/portfoliouser/app/logs/
 touch /home/portfoliouser/app/logs/info.log
 
+echo "Starting the background processes under supervisord"
+supervisord -c /home/portfoliouser/config/supervisord.conf
+
 echo "Starting webserver"
-gunicorn portfolio.wsgi:application --bind 0.0.0.0:8080 
+if [[ "${GUNICORN_WORKER_CLASS}" == "uvicorn" ]]; then
+    gunicorn -c portfolio/gunicorn_conf.py portfolio.asgi:application
+else
+    gunicorn -c portfolio/gunicorn_conf.py portfolio.wsgi:application
+fi
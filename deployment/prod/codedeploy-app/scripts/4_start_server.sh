@@ -41,6 +41,7 @@ docker run -d \
     --mount type=bind,source=/home/ec2-user/mounts/startup_server.sh,target=/home/portfoliouser/mounts/ \
     --mount type=volume,source=app-logs,target=/home/portfoliouser/app/logs/ \
     --env POSTGRES_HOST=${RDS_POSTGRES_HOST} \
+    --env POSTGRES_REPLICA_HOST=${RDS_POSTGRES_REPLICA_HOST} \
     --env POSTGRES_PASSWORD=${RDS_POSTGRES_PASSWORD} \
     --env REDIS_ENDPOINT=${ELASTICACHE_REDIS_HOST}:${ELASTICACHE_REDIS_PORT} \
     --env STATICFILES_BUCKET=${STATICFILES_BUCKET} \
@@ -48,6 +49,10 @@ docker run -d \
     --env SNS_TOPIC_ARN=${DJANGO_APP_SNS_TOPIC_ARN} \
     --env SES_IDENTITY_ARN=${DJANGO_APP_SES_IDENTITY_ARN} \
     --env DEBUG=${DEBUG} \
+    --env DJANGO_SETTINGS_MODULE=portfolio.settings.production \
+    --env TASK_QUEUE_ENABLED=True \
+    --env TASK_WORKER_NAME=$(hostname) \
+    --env GUNICORN_WORKER_CLASS=${GUNICORN_WORKER_CLASS:-gthread} \
     ${IMAGE_NAME}
 
 echo "Write instance details to the footer.html file"